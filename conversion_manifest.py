@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+MANIFEST_NAME = '.manifest.json'
+JOURNAL_NAME = '.manifest.journal'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """Dosyanın SHA-256 özetini parça parça okuyarak hesapla"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionManifest:
+    """Çıktı klasörü için kalıcı dönüşüm kaydı
+
+    Her çıktı için kaynak dosyanın özeti, boyutu, mtime değeri ve çıktıyı
+    üreten dönüştürücü sürümü saklanır. Başarılı her dönüşüm önce günlük
+    dosyasına (journal) eklenir; yarıda kalan bir çalışma bir sonraki
+    açılışta günlükten kaldığı yerden devam eder. ``save`` günlüğü ana
+    kayıt dosyasına işler ve siler.
+    """
+
+    def __init__(self, output_dir, renderer_version):
+        self.output_dir = Path(output_dir)
+        self.renderer_version = renderer_version
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+        self.journal_path = self.output_dir / JOURNAL_NAME
+        self.entries = {}
+        self._digests = {}
+        self._journal = None
+        self._load()
+
+    def _load(self):
+        """Kayıt dosyasını ve varsa yarım kalmış günlüğü yükle"""
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('entries', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Dönüşüm kaydı okunamadı, yeniden oluşturulacak: {e}")
+                self.entries = {}
+
+        if self.journal_path.exists():
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Kesilmiş son satır: o dönüşüm tekrar yapılır
+                        continue
+                    if record.get('deleted'):
+                        self.entries.pop(record['output'], None)
+                    else:
+                        self.entries[record['output']] = record
+
+    def is_up_to_date(self, source, output_path):
+        """Çıktı, kaynağın güncel hali ve aynı dönüştürücü sürümüyle mi üretilmiş?"""
+        entry = self.entries.get(Path(output_path).name)
+        if entry is None or entry.get('renderer') != self.renderer_version:
+            return False
+        if not Path(output_path).exists():
+            return False
+
+        st = os.stat(source)
+        if entry['size'] != st.st_size:
+            return False
+        if entry['mtime_ns'] == st.st_mtime_ns:
+            return True
+
+        # Yalnızca mtime değişmiş; içerik gerçekten değişmiş mi diye özete bak
+        if self._digest(source, st) == entry['sha256']:
+            self.record(source, output_path)
+            return True
+        return False
+
+    def _digest(self, source, st):
+        """Kaynak özetini dosyanın her hali (boyut, mtime) için bir kez hesapla
+
+        İzleme modunda kayıt süreç boyunca yaşar; aynı boyutta kalan bir
+        düzenleme eski özetle karşılaştırılmasın diye anahtar yol değil
+        dosyanın o anki halidir.
+        """
+        state = (st.st_size, st.st_mtime_ns)
+        cached = self._digests.get(str(source))
+        if cached is None or cached[0] != state:
+            cached = self._digests[str(source)] = (state, file_sha256(source))
+        return cached[1]
+
+    def record(self, source, output_path):
+        """Başarılı dönüşümü kayda ve günlüğe ekle"""
+        st = os.stat(source)
+        record = {
+            'output': Path(output_path).name,
+            'source': Path(source).name,
+            'sha256': self._digest(source, st),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'renderer': self.renderer_version,
+        }
+        self.entries[record['output']] = record
+        self._append(record)
+
+    def remove_orphans(self, source_names):
+        """Kaynağı silinmiş kayıtların çıktılarını kaldır, kaldırılanları döndür"""
+        removed = []
+        for output, entry in list(self.entries.items()):
+            if entry['source'] in source_names:
+                continue
+            orphan = self.output_dir / output
+            if orphan.exists():
+                orphan.unlink()
+            del self.entries[output]
+            self._append({'output': output, 'deleted': True})
+            removed.append(output)
+        return removed
+
+    def remove_source(self, source_name):
+        """Tek bir kaynağın kaydını ve çıktısını kaldır, kaldırılanları döndür"""
+        removed = []
+        for output, entry in list(self.entries.items()):
+            if entry['source'] != source_name:
+                continue
+            orphan = self.output_dir / output
+            if orphan.exists():
+                orphan.unlink()
+            del self.entries[output]
+            self._append({'output': output, 'deleted': True})
+            removed.append(output)
+        return removed
+
+    def _append(self, record):
+        """Günlüğe tek satır ekle ve diske yaz"""
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._journal.flush()
+
+    def save(self):
+        """Kaydı atomik olarak yaz ve günlüğü temizle"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self.entries}, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+        if self.journal_path.exists():
+            self.journal_path.unlink()
@@ -1,15 +1,52 @@
-import zipfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.units import cm
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
 import re
+import shutil
+import tempfile
+import time
+
+import metrics
+from conversion_manifest import ConversionManifest
+from evrak_budget import BudgetExceeded, Quarantine, document_budget, open_archive
+from evrak_dispatch import detach_output, engine_for, publish_file, sniff_type
+from fast_canvas import FastTextRenderer, label_segments
+from image_pdf import render_image_pdf
+from pdf_linearize import LinearizeError, linearize_file
+from pdf_stream import StreamingCanvas
+from render_profile import get_render_profile
+from evrak_fields import FIELDS_DB_NAME, FieldStore
+from evrak_watcher import Debouncer, InotifyWatcher, RescanNeeded, open_watcher
+from search_index import INDEX_DIR_NAME, IndexWriter, sync_documents
+from udf_document import UDFDocument
+from udf_reader import detect_container, paragraph_lines, read_paragraphs, stream_lines
+from xlsx_reader import SheetReader
+
+# Dönüştürücü çıktısı değiştiğinde artırılır; kayıtlı tüm PDF'ler yeniden üretilir
+RENDERER_VERSION = '6'
+
+# Arşivdeki açılmış boyutu bunu aşan evraklar her modda akış halinde çizilir
+STREAM_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+# PDF klasöründe kendi PDF'i olmadan duran taranmış görüntüler de sarılır
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.tif', '.tiff', '.png')
+
+# İzleme modunun durum dosyası (kuyruk derinliği ve gecikme)
+WATCH_STATUS_NAME = '.watch.json'
+# İzleme modunda arama dizinine toplu yazılacak en fazla evrak
+WATCH_FLUSH_COUNT = 100
 
 # Namespace tanımları
 NAMESPACES = {
@@ -19,35 +56,32 @@ NAMESPACES = {
     'style': 'urn:oasis:names:tc:opendocument:xmlns:style:1.0'
 }
 
-def extract_structured_content_from_udf(udf_file):
-    """UDF dosyasından yapılandırılmış içerik çıkar"""
+def extract_structured_content_from_udf(udf_file, documents=None):
+    """UDF dosyasından yapılandırılmış içerik çıkar
+
+    ``documents`` sözlüğü verilirse ayrıştırılan belge ``UDFDocument``
+    olarak evrak kimliği altında saklanır (arama dizini ve alan deposu
+    metni yeniden okumadan beslenir).
+    """
     try:
-        with zipfile.ZipFile(udf_file, 'r') as zip_ref:
-            # content.xml'i oku
-            xml_content = zip_ref.read('content.xml').decode('utf-8')
-            
-            # CDATA içeriğini çıkar
-            cdata_match = re.search(r'<!\[CDATA\[(.*?)\]\]>', xml_content, re.DOTALL)
-            
-            if cdata_match:
-                text_content = cdata_match.group(1)
-            else:
-                # CDATA yoksa tüm metni al
-                tree = ET.fromstring(xml_content)
-                text_content = ''.join(tree.itertext())
-            
-            # İçeriği satırlara böl ve temizle
-            lines = text_content.split('\n')
-            clean_lines = []
-            
-            for line in lines:
-                line = line.strip()
-                if line and line not in ['', ' ']:
-                    clean_lines.append(line)
-            
-            return clean_lines
+        # content.xml tek geçişte akış halinde okunur; paragraf sınırları
+        # <elements> bölümündeki ofsetlerden gelir
+        paragraphs = read_paragraphs(udf_file)
+        if documents is not None:
+            documents[udf_file.stem] = UDFDocument.from_paragraphs(paragraphs, udf_file.stem)
+        clean_lines = list(paragraph_lines(paragraphs))
+        
+        if not clean_lines:
+            # CDATA yoksa tüm metni al
+            with open_archive(udf_file) as zip_ref:
+                tree = ET.fromstring(zip_ref.read('content.xml'))
+            text_content = ''.join(tree.itertext())
+            clean_lines = [line.strip() for line in text_content.split('\n') if line.strip()]
+        
+        return clean_lines
                 
     except Exception as e:
+        metrics.fail(f'parse:{type(e).__name__}')
         print(f"Parse hatası: {e}")
         import traceback
         traceback.print_exc()
@@ -65,93 +99,219 @@ def clean_text(text):
     text = text.replace('□', '').strip()
     return text
 
-def create_professional_pdf(udf_file, output_dir):
-    """Profesyonel görünümlü PDF oluştur"""
+def fit_text(text, font_name, font_size, max_width):
+    """Metni verilen genişliğe sığacak şekilde kısalt"""
+    width = pdfmetrics.stringWidth(text, font_name, font_size)
+    if width <= max_width:
+        return text
+    length = max(0, int(len(text) * max_width / width))
+    while length and pdfmetrics.stringWidth(text[:length] + '…', font_name, font_size) > max_width:
+        length -= 1
+    return text[:length] + '…' if length else ''
+
+def create_spreadsheet_pdf(zip_ref, pdf_path, title, stream=False, compact=False):
+    """Excel içerikli UDF'yi sabit bellekle sayfalı tablo PDF'ine dönüştür
+
+    Sayfa XML'i satır satır akış halinde okunur; yalnızca o an çizilen
+    satır bellekte tutulur. ``stream=True`` ile tamamlanan sayfalar da
+    hemen dosyaya yazılır. ``pdf_path`` yol veya yazılabilir dosya olabilir.
+    """
+    reader = SheetReader(zip_ref)
+    rows = reader.iter_rows()
+    
+    profile = get_render_profile(compact)
+    font_name, font_bold = profile.font_name, profile.font_bold
+    
+    page_width, page_height = landscape(A4)
+    margin = 1*cm
+    font_size = 6
+    row_height = 9
+    
+    canvas_class = StreamingCanvas if stream else canvas.Canvas
+    c = canvas_class(pdf_path, pagesize=landscape(A4), pageCompression=1, **profile.canvas_options())
+    c.setTitle(title)
+    
+    first = next(rows, None)
+    header = first[1] if first else []
+    
+    # Sütun genişlikleri <cols> tanımından, sayfa genişliğine ölçeklenir
+    column_count = max(len(header), len(reader.column_widths), 1)
+    widths = [
+        (reader.column_widths[i] if i < len(reader.column_widths) else None) or 8.43
+        for i in range(column_count)
+    ]
+    scale = (page_width - 2*margin) / sum(widths)
+    widths = [w * scale for w in widths]
+    
+    def draw_row(cells, y, font):
+        c.setFont(font, font_size)
+        x = margin
+        for i, width in enumerate(widths):
+            if i < len(cells) and cells[i]:
+                c.drawString(x + 1, y, fit_text(cells[i], font, font_size, width - 2))
+            x += width
+    
+    def start_page(page_number):
+        c.setFont(font_bold, 9)
+        c.drawString(margin, page_height - margin, f"{title} {reader.title}".strip())
+        c.drawRightString(page_width - margin, page_height - margin, f"Sayfa {page_number}")
+        y = page_height - margin - 2*row_height
+        if header:
+            draw_row(header, y, font_bold)
+            c.line(margin, y - 2, page_width - margin, y - 2)
+            y -= row_height + 2
+        return y
+    
+    page_number = 1
+    y = start_page(page_number)
+    for _, cells in rows:
+        if y < margin:
+            c.showPage()
+            page_number += 1
+            y = start_page(page_number)
+        draw_row(cells, y, font_name)
+        y -= row_height
+    
+    with profile.writing():
+        c.save()
+
+def create_fast_pdf(lines, pdf_path, title, stream=False, compact=False):
+    """Platypus yerleşimi olmadan doğrudan canvas ile hızlı PDF oluştur
+
+    ``stream=True`` ile ``lines`` bir üreteç olabilir: satırlar temizlenip
+    çizildikçe tüketilir, sayfalar dolunca yazılır ve belge hiçbir aşamada
+    bütün olarak bellekte tutulmaz. Sayfa sayısını döndürür.
+    """
+    lines = iter(lines)
+    with metrics.stage('clean'):
+        header = [clean_text(line) for line in itertools.islice(lines, 5)]
+        body = (label_segments(text) for text in map(clean_text, lines) if text)
+        if not stream:
+            body = list(body)
+    
+    paragraphs = itertools.chain([[(line, True)] for line in header if line], [''], body)
+    # Akış modunda temizleme çizimle iç içe olduğundan yerleşime sayılır
+    with metrics.stage('layout'), metrics.output(pdf_path) as target:
+        return FastTextRenderer(compact=compact).render(paragraphs, target, title=title, stream=stream)
+
+def needs_streaming(zip_ref):
+    """Arşiv, sayfaların bellekte biriktirilemeyeceği kadar büyük mü?"""
+    return sum(info.file_size for info in zip_ref.infolist()) > STREAM_THRESHOLD_BYTES
+
+def render_mode(fast=False, stream=False):
+    """Dönüşüm kaydı ve ölçümler için çizim modu adı"""
+    return 'stream' if stream else 'fast' if fast else 'platypus'
+
+def manifest_version(fast=False, stream=False, linearize=False, compact=False):
+    mode = render_mode(fast, stream)
+    version = RENDERER_VERSION + ('' if mode == 'platypus' else '-' + mode)
+    if compact:
+        version += '-compact'
+    return version + '-lin' if linearize else version
+
+def create_professional_pdf(udf_file, output_dir, fast=False, stream=False, compact=False, documents=None):
+    """Profesyonel görünümlü PDF oluştur
+
+    ``fast=True`` toplu işler için Platypus yerine doğrudan canvas
+    çizicisini kullanır. ``stream=True`` (veya ``STREAM_THRESHOLD_BYTES``
+    üstündeki evraklar) hızlı çiziciyi akış modunda çalıştırır: metin
+    satır satır okunur ve her sayfa dolunca dosyaya yazılır. ``compact=True``
+    küçük çıktı profilini seçer (bkz. ``render_profile.RenderProfile``).
+    ``documents`` verilirse dönüşüm sırasında çıkarılan metin oraya
+    yazılır (bkz. ``extract_structured_content_from_udf``); tablo ve akış
+    modunda metin bütün olarak tutulmadığından yazılmaz.
+    """
     
     pdf_filename = udf_file.stem + '.pdf'
     pdf_path = output_dir / pdf_filename
     
     try:
-        # İçeriği çıkar
-        lines = extract_structured_content_from_udf(udf_file)
-        if not lines:
-            print(f"✗ İçerik çıkarılamadı: {udf_file.name}")
+        # .udf uzantılı dosya zaten PDF olabilir: yeniden çizilmeden yayımlanır
+        kind = sniff_type(udf_file)
+        engine = engine_for(kind)
+        if engine == 'passthrough':
+            with metrics.stage('publish'):
+                method = publish_file(udf_file, pdf_path)
+            print(f"✓ Hazır PDF yayımlandı ({method}): {pdf_filename}")
+            if documents is not None:
+                documents[udf_file.stem] = UDFDocument(udf_file.stem)
+            return True
+        if engine is None:
+            metrics.fail(f'unsupported:{kind}')
+            print(f"✗ Desteklenmeyen içerik ({kind}): {udf_file.name}")
             return False
+        # Önceden hardlink ile yayımlanmış çıktının üzerine yazmak kaynağı bozar
+        detach_output(pdf_path)
         
-        # PDF oluştur
-        doc = SimpleDocTemplate(
-            str(pdf_path),
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
+        if engine == 'image':
+            # Taranmış evrak: JPEG olduğu gibi gömülür, TIFF sayfa sayfa yazılır
+            with metrics.stage('layout'), metrics.output(pdf_path) as target:
+                pages = render_image_pdf(udf_file, target, kind, title=udf_file.stem)
+            print(f"✓ PDF oluşturuldu (görüntü, {pages} sayfa): {pdf_filename}")
+            if documents is not None:
+                documents[udf_file.stem] = UDFDocument(udf_file.stem)
+            return True
         
-        # Türkçe font kaydet
-        try:
-            pdfmetrics.registerFont(TTFont('Turkish', 'C:/Windows/Fonts/arial.ttf'))
-            pdfmetrics.registerFont(TTFont('Turkish-Bold', 'C:/Windows/Fonts/arialbd.ttf'))
-        except:
-            pass
+        # Bazı .udf dosyaları aslında Excel çalışma kitabıdır
+        with metrics.stage('unzip'):
+            zip_ref = open_archive(udf_file)
+            container = detect_container(zip_ref)
+        with zip_ref:
+            stream = stream or needs_streaming(zip_ref)
+            if container == 'xlsx':
+                # Sayfa akış halinde okunup çizildiğinden ayrıştırma da bu aşamaya sayılır
+                with metrics.stage('layout'), metrics.output(pdf_path) as target:
+                    create_spreadsheet_pdf(zip_ref, target, udf_file.stem, stream, compact)
+                print(f"✓ PDF oluşturuldu (tablo): {pdf_filename}")
+                return True
         
-        # Stiller
-        styles = getSampleStyleSheet()
+        if stream and container == 'udf':
+            lines = stream_lines(udf_file)
+            first = next(lines, None)
+            # CDATA metni yoksa aşağıdaki normal ayrıştırmaya düşülür
+            if first is not None:
+                create_fast_pdf(itertools.chain([first], lines), pdf_path, udf_file.stem, stream=True,
+                                compact=compact)
+                print(f"✓ PDF oluşturuldu (akış): {pdf_filename}")
+                return True
         
-        # Başlık stili
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontName='Turkish-Bold' if 'Turkish-Bold' in pdfmetrics.getRegisteredFontNames() else 'Helvetica-Bold',
-            fontSize=14,
-            textColor=colors.HexColor('#1a1a1a'),
-            alignment=TA_CENTER,
-            spaceAfter=20,
-            spaceBefore=10
-        )
+        # İçeriği çıkar
+        with metrics.stage('parse'):
+            lines = extract_structured_content_from_udf(udf_file, documents)
+        if not lines:
+            metrics.fail('empty_content')
+            print(f"✗ İçerik çıkarılamadı: {udf_file.name}")
+            return False
+        
+        if fast or stream:
+            create_fast_pdf(lines, pdf_path, udf_file.stem, stream, compact)
+            print(f"✓ PDF oluşturuldu: {pdf_filename}")
+            return True
         
-        # Normal metin stili
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontName='Turkish' if 'Turkish' in pdfmetrics.getRegisteredFontNames() else 'Helvetica',
-            fontSize=10,
-            textColor=colors.HexColor('#333333'),
-            alignment=TA_LEFT,
-            spaceAfter=8,
-            leading=14
-        )
+        # Fontlar ve stiller süreç başına bir kez yüklenir
+        profile = get_render_profile(compact)
+        styles = profile.styles
+        title_style = styles['EvrakTitle']
+        normal_style = styles['EvrakNormal']
+        emphasis_style = styles['EvrakEmphasis']
         
-        # Vurgu stili
-        emphasis_style = ParagraphStyle(
-            'CustomEmphasis',
-            parent=normal_style,
-            fontName='Turkish-Bold' if 'Turkish-Bold' in pdfmetrics.getRegisteredFontNames() else 'Helvetica-Bold',
-            fontSize=11,
-            textColor=colors.HexColor('#000000'),
-            spaceAfter=10
-        )
+        with metrics.stage('clean'):
+            cleaned = [clean_text(line) for line in lines]
         
         # PDF içeriği
         story = []
         
         # Başlık - ilk satırlar
-        if len(lines) > 0:
+        if len(cleaned) > 0:
             # İlk 5 satırı başlık olarak al
-            header_lines = []
-            for i, line in enumerate(lines[:5]):
-                clean_line = clean_text(line)
-                if clean_line:
-                    header_lines.append(clean_line)
+            header_lines = [line for line in cleaned[:5] if line]
             
             if header_lines:
                 story.append(Paragraph('<br/>'.join(header_lines), title_style))
                 story.append(Spacer(1, 0.5*cm))
         
         # İçerik - kalan satırlar
-        for line in lines[5:]:
-            text = clean_text(line)
-            
+        for text in cleaned[5:]:
             # Boş satırları atla
             if not text or text in ['', ' ']:
                 continue
@@ -177,33 +337,187 @@ def create_professional_pdf(udf_file, output_dir):
                 else:
                     story.append(Paragraph(text, normal_style))
         
-        # PDF'i oluştur
-        doc.build(story)
+        # PDF'i oluştur (yazma süresi ayrı ölçülür)
+        with metrics.stage('layout'), metrics.output(pdf_path) as target:
+            doc = SimpleDocTemplate(
+                target,
+                pagesize=A4,
+                rightMargin=2*cm,
+                leftMargin=2*cm,
+                topMargin=2*cm,
+                bottomMargin=2*cm,
+                **profile.canvas_options()
+            )
+            with profile.writing():
+                doc.build(story)
         print(f"✓ PDF oluşturuldu: {pdf_filename}")
         return True
         
     except Exception as e:
+        metrics.fail(type(e).__name__)
         print(f"✗ Hata ({udf_file.name}): {e}")
         import traceback
         traceback.print_exc()
         return False
 
-def convert_all_udf_to_professional_pdf():
-    """Tüm UDF dosyalarını profesyonel PDF'e dönüştür"""
+def linearize_output(udf_file, pdf_path):
+    """Çizilen PDF'i hızlı web görünümü için doğrusallaştır
+
+    Olduğu gibi yayımlanan hazır PDF'lere (kaynağın kendisi) dokunulmaz;
+    desteklenmeyen yapıdaki PDF doğrusal olmadan kalır.
+    """
+    if engine_for(sniff_type(udf_file)) == 'passthrough':
+        return
+    try:
+        with metrics.stage('linearize'):
+            linearize_file(pdf_path)
+    except LinearizeError as e:
+        print(f"⚠️  Doğrusallaştırılamadı ({pdf_path.name}): {e}")
+
+def convert_measured(udf_file, output_dir, fast=False, stream=False, linearize=False, compact=False,
+                     documents=None):
+    """Dosyayı aşama ölçümleriyle dönüştür: (başarılı mı, ölçüm kaydı)
+
+    Evrak ``evrak_budget`` sınırlarını aşarsa yarım PDF silinir ve
+    ``BudgetExceeded`` ölçüm kaydı (``record``) eklenerek yukarı atılır.
+    """
+    metrics.begin_document(udf_file.stem, udf_file)
+    pdf_path = output_dir / (udf_file.stem + '.pdf')
+    try:
+        with document_budget():
+            ok = create_professional_pdf(udf_file, output_dir, fast, stream, compact, documents)
+            if ok and linearize:
+                linearize_output(udf_file, pdf_path)
+    except BudgetExceeded as e:
+        pdf_path.unlink(missing_ok=True)
+        metrics.fail(f'budget:{e.kind}')
+        print(f"⚠️  Karantinaya alındı ({udf_file.name}): {e.reason}")
+        e.record = metrics.end_document(False)
+        raise
+    return ok, metrics.end_document(ok, pdf_path)
+
+def _convert_in_worker(udf_path, output_dir, fast=False, stream=False, linearize=False, compact=False):
+    """İşçi süreçte tek dosyayı dönüştür
+
+    (başarılı mı, yakalanan ekran çıktısı, ölçüm kaydı, sınır aşımı,
+    belge) döndürür; kayıt ana süreçte ``metrics.record_document`` ile
+    işlenir. Sınır aşımı yoksa dördüncü öğe None, varsa ``BudgetExceeded``
+    örneğidir. Belge, dönüşümde çıkarılan ``UDFDocument``'tır (yoksa None).
+    """
+    buffer = io.StringIO()
+    exceeded = None
+    documents = {}
+    udf_path = Path(udf_path)
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            ok, record = convert_measured(udf_path, Path(output_dir), fast, stream, linearize, compact, documents)
+        except BudgetExceeded as e:
+            ok, record, exceeded = False, e.record, e
+    return ok, buffer.getvalue(), record, exceeded, documents.get(udf_path.stem) if ok else None
+
+def needs_worker(udf_file):
+    """Dosya gerçekten çizilecek mi?
+
+    Hazır PDF'ler ve desteklenmeyen içerikler işçi süreç beklemeden ana
+    süreçte biter; karışık gelen kutularında işçiler yalnızca çizime harcanır.
+    """
+    try:
+        return engine_for(sniff_type(udf_file)) in ('render', 'image')
+    except OSError:
+        return True
+
+def find_loose_images(output_dir, manifest):
+    """PDF klasöründe PDF'i olmayan veya PDF'inden yeni görüntü dosyaları
+
+    Eski sürümler taranmış evrakları ``.tif``/``.jpg`` olarak bırakıyordu;
+    görüntüleyici bunları listelemez. Bir UDF'in çıktısı olan PDF'lere
+    dokunulmaz.
+    """
+    loose = []
+    for path in output_dir.iterdir():
+        if path.name.startswith('.') or path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        pdf_path = path.with_suffix('.pdf')
+        if pdf_path.name in manifest.entries:
+            continue
+        try:
+            if pdf_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        loose.append(path)
+    return loose
+
+def schedule_by_size(udf_files):
+    """Dosyaları büyükten küçüğe sırala
+
+    Büyük girdiler ilk sırada işçilere dağıtılır; böylece tek bir büyük dosya
+    çalışmanın sonunda diğer çekirdekleri boşta bekletmez.
+    """
+    return sorted(udf_files, key=lambda f: f.stat().st_size, reverse=True)
+
+def run_parallel(udf_files, output_dir, workers, on_success=None, fast=False, stream=False, linearize=False,
+                 compact=False, on_quarantine=None):
+    """Dosyaları süreç havuzunda dönüştür, sonuçları isim sırasıyla yazdır
+
+    Büyük dosyalar önce işçilere verilir; çıktı ve geri çağrılar yine de
+    isim sırasıyla gelir. Başarılı dönüşümler ``on_success`` (dosya,
+    dönüşümde çıkarılan belge veya None) ile bildirilir. Sınırı aşan evrak
+    işçiyi ve çalışmayı durdurmaz; ``on_quarantine`` (dosya,
+    ``BudgetExceeded``) ile bildirilir.
+    """
+    ordered = sorted(udf_files, key=lambda f: f.name)
+    position = {f.name: i for i, f in enumerate(ordered)}
+    results = [None] * len(ordered)
+    next_to_report = 0
+    success_count = 0
+
+    # Fork ile başlayan işçiler yüklenmiş profili devralır; diğerleri
+    # başlangıçta bir kez yükler
+    get_render_profile(compact)
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_render_profile, initargs=(compact,)) as executor:
+        futures = {
+            executor.submit(_convert_in_worker, str(f), str(output_dir), fast, stream, linearize, compact): f
+            for f in schedule_by_size(udf_files)
+        }
+        for future in as_completed(futures):
+            udf_file = futures[future]
+            exceeded = document = None
+            try:
+                ok, output, record, exceeded, document = future.result()
+                metrics.record_document(record)
+            except Exception as e:
+                metrics.count_failure(f'worker:{type(e).__name__}')
+                ok, output = False, f"✗ Hata ({udf_file.name}): {e}\n"
+            results[position[udf_file.name]] = (ok, output, exceeded, document)
+
+            # Sıradaki tamamlanmış sonuçları sabit sırayla raporla
+            while next_to_report < len(results) and results[next_to_report] is not None:
+                ok, output, exceeded, document = results[next_to_report]
+                udf_file = ordered[next_to_report]
+                print(output, end='')
+                if ok:
+                    success_count += 1
+                    if on_success:
+                        on_success(udf_file, document)
+                if on_quarantine and exceeded is not None:
+                    on_quarantine(udf_file, exceeded)
+                next_to_report += 1
+
+    return success_count
+
+def convert_all_udf_to_professional_pdf(workers=1, force=False, fast=False, stream=False, linearize=False,
+                                        compact=False):
+    """Yeni veya değişmiş UDF dosyalarını profesyonel PDF'e dönüştür"""
     
     source_dir = Path('evraklar_kaynak')
     output_dir = Path('evraklar_pdf')
+    started = time.time()
     
     if not source_dir.exists():
         print(f"✗ Kaynak klasör bulunamadı: {source_dir}")
         return
     
-    # Eski PDF'leri temizle
-    if output_dir.exists():
-        for old_pdf in output_dir.glob('*.pdf'):
-            old_pdf.unlink()
-        print("✓ Eski PDF'ler temizlendi\n")
-    
     output_dir.mkdir(exist_ok=True)
     
     udf_files = list(source_dir.glob('*.udf'))
@@ -213,24 +527,381 @@ def convert_all_udf_to_professional_pdf():
         return
     
     print(f"{len(udf_files)} adet UDF dosyası bulundu\n")
+    
+    # Hızlı mod farklı çıktı ürettiği için ayrı sürüm olarak kaydedilir
+    manifest = ConversionManifest(output_dir, manifest_version(fast, stream, linearize, compact))
+    
+    # Kaynağı silinmiş evrakların eski PDF'lerini kaldır
+    removed = manifest.remove_orphans({f.name for f in udf_files})
+    if removed:
+        print(f"✓ Kaynağı silinen {len(removed)} PDF kaldırıldı\n")
+    
+    # Sınırı aştığı için karantinadaki kaynaklar (PDF klasöründeki
+    # görüntüler dahil) değişene kadar atlanır
+    quarantine = Quarantine(output_dir)
+    images = find_loose_images(output_dir, manifest)
+    quarantine.prune({f.name for f in udf_files} | {f.name for f in images})
+    held = set() if force else {f.name for f in udf_files if quarantine.holds(f)}
+    held_images = [] if force else [f for f in images if quarantine.holds(f)]
+    images = [f for f in images if f not in held_images]
+    
+    # Yalnızca yeni veya değişmiş dosyaları işle
+    if force:
+        pending = udf_files
+    else:
+        pending = [
+            f for f in udf_files
+            if f.name not in held and not manifest.is_up_to_date(f, output_dir / (f.stem + '.pdf'))
+        ]
+    skipped_count = len(udf_files) - len(pending) - len(held)
+    quarantined = []
+    # Dönüşümde çıkarılan belgeler: dizin ve alan deposu bunlardan beslenir
+    documents = {}
+    
+    def on_success(udf_file, document=None):
+        manifest.record(udf_file, output_dir / (udf_file.stem + '.pdf'))
+        quarantine.release(udf_file.name)
+        if document is not None:
+            documents[udf_file.stem] = document
+    
+    def on_quarantine(udf_file, exceeded):
+        quarantine.add(udf_file, exceeded)
+        quarantined.append(udf_file.name)
+    
+    def convert_here(udf_file):
+        try:
+            ok, record = convert_measured(udf_file, output_dir, fast, stream, linearize, compact, documents)
+        except BudgetExceeded as e:
+            ok, record = False, e.record
+            on_quarantine(udf_file, e)
+        metrics.record_document(record)
+        if ok:
+            on_success(udf_file)
+        else:
+            documents.pop(udf_file.stem, None)
+        return ok
+    
     print("="*60)
     
-    success_count = 0
-    for udf_file in udf_files:
-        if create_professional_pdf(udf_file, output_dir):
-            success_count += 1
+    render, inline = [], []
+    for udf_file in pending:
+        (render if needs_worker(udf_file) else inline).append(udf_file)
+    
+    try:
+        success_count = 0
+        for udf_file in inline:
+            success_count += convert_here(udf_file)
+        if workers > 1 and len(render) > 1:
+            print(f"{workers} işçi süreç kullanılıyor\n")
+            success_count += run_parallel(render, output_dir, workers, on_success, fast, stream, linearize, compact,
+                                          on_quarantine)
+        else:
+            for udf_file in render:
+                success_count += convert_here(udf_file)
+        # Klasördeki görüntüler yerinde sarılır; kaynakları UDF olmadığı için kayda girmez
+        wrapped_count = 0
+        for image_file in images:
+            try:
+                ok, record = convert_measured(image_file, output_dir, linearize=linearize)
+            except BudgetExceeded as e:
+                ok, record = False, e.record
+                on_quarantine(image_file, e)
+            metrics.record_document(record)
+            if ok:
+                quarantine.release(image_file.name)
+            wrapped_count += ok
+    finally:
+        manifest.save()
+        quarantine.save()
+    
+    # Arama dizini ve alan deposu dönüşümde çıkarılan belgelerle beslenir;
+    # yalnızca dönüşümde metni tutulmayan (tablo, akış) veya dizinde eksik
+    # kalmış evraklar yeniden okunur
+    index_started = time.perf_counter()
+    index_writer = IndexWriter(output_dir / INDEX_DIR_NAME)
+    field_store = FieldStore(output_dir / FIELDS_DB_NAME)
+    try:
+        # Karantinadaki evrakların metni yeniden açılmaz; dizinden de çıkarılır
+        indexed, unindexed = sync_documents([f for f in udf_files if not quarantine.holds(f)],
+                                            [index_writer, field_store], documents=documents)
+    finally:
+        index_writer.close()
+        field_store.close()
+    if indexed or unindexed:
+        print(f"🔎 Arama dizini ve alanlar: {indexed} evrak işlendi, {unindexed} çıkarıldı")
+    
+    # Çalışma özeti (aşama histogramları, baytlar, hatalar) günlüğe eklenir;
+    # iş yapmayan çalışmalar son gerçek özeti gölgelemesin diye yazılmaz
+    if pending or images or indexed or unindexed:
+        metrics.write_run(output_dir, 'convert', started, mode=render_mode(fast, stream),
+                          compact=compact, workers=workers, skipped=skipped_count, indexed=indexed,
+                          index_seconds=round(time.perf_counter() - index_started, 3))
     
     print("="*60)
     print(f"\nToplam: {len(udf_files)} dosya")
+    print(f"Değişmemiş (atlandı): {skipped_count} dosya")
     print(f"Başarılı: {success_count} PDF")
-    print(f"Başarısız: {len(udf_files) - success_count} dosya")
+    print(f"Başarısız: {len(pending) - success_count} dosya")
+    if quarantined or held or held_images:
+        print(f"Karantinada: {len(quarantined)} yeni, {len(held) + len(held_images)} değişmemiş (atlandı) dosya")
+    if images:
+        print(f"Görüntüden PDF: {wrapped_count}/{len(images)} dosya")
     print(f"\nPDF'ler kaydedildi: {output_dir.absolute()}\n")
 
-if __name__ == "__main__":
+def _convert_and_publish(udf_path, output_dir, fast=False, stream=False, linearize=False, compact=False):
+    """Geçici klasörde dönüştür, PDF'i çıktı klasörüne atomik olarak taşı
+
+    Görüntüleyici böylece yarım yazılmış bir PDF görmez.
+    """
+    work_dir = tempfile.mkdtemp(prefix='.tmp-', dir=output_dir)
+    try:
+        result = _convert_in_worker(udf_path, work_dir, fast, stream, linearize, compact)
+        pdf_path = Path(work_dir) / (Path(udf_path).stem + '.pdf')
+        if result[0] and pdf_path.exists():
+            os.replace(pdf_path, Path(output_dir) / pdf_path.name)
+        return result
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def _stale_sources(source_dir, manifest, output_dir):
+    """Olay kuyruğu taştığında: güncel olmayan veya silinmiş kaynakların adları"""
+    names = {f.name for f in source_dir.glob('*.udf')}
+    stale = {
+        name: False for name in names
+        if not manifest.is_up_to_date(source_dir / name, output_dir / (Path(name).stem + '.pdf'))
+    }
+    for entry in manifest.entries.values():
+        if entry['source'] not in names:
+            stale[entry['source']] = False
+    return stale
+
+def _write_watch_status(output_dir, status):
+    """İzleme durumunu (kuyruk derinliği, gecikme) atomik olarak yaz"""
+    tmp_path = output_dir / (WATCH_STATUS_NAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(status, f, ensure_ascii=False)
+    os.replace(tmp_path, output_dir / WATCH_STATUS_NAME)
+
+def watch_and_convert(workers=1, force=False, fast=False, poll_interval=1.0, stream=False, linearize=False,
+                      compact=False):
+    """Kaynak klasörü izle, yeni veya değişen UDF'leri geldikçe dönüştür
+
+    Başlangıçta bir kez normal artımlı dönüşüm yapılır; sonrasında klasör
+    taranmaz, yalnızca izleyicinin (inotify veya yoklama) bildirdiği
+    dosyalar işlenir. Yazımı süren dosyalar durulana kadar bekletilir.
+    Aynı anda en fazla ``workers`` dosya dönüştürülür, kalanlar kuyrukta
+    bekler. Kuyruk derinliği ve gecikme (ilk olaydan PDF'in yayımlanmasına
+    kadar geçen süre) ``evraklar_pdf/.watch.json`` dosyasına yazılır.
+    """
+    source_dir = Path('evraklar_kaynak')
+    output_dir = Path('evraklar_pdf')
+
+    if not source_dir.exists():
+        print(f"✗ Kaynak klasör bulunamadı: {source_dir}")
+        return
+
+    # İzleyici ilk geçişten önce açılır; geçiş sırasında gelen dosyalar kaçmaz
+    watcher = open_watcher(source_dir, poll_interval=poll_interval)
+    convert_all_udf_to_professional_pdf(workers=workers, force=force, fast=fast, stream=stream,
+                                        linearize=linearize, compact=compact)
+
+    manifest = ConversionManifest(output_dir, manifest_version(fast, stream, linearize, compact))
+    quarantine = Quarantine(output_dir)
+    index_writer = IndexWriter(output_dir / INDEX_DIR_NAME)
+    field_store = FieldStore(output_dir / FIELDS_DB_NAME)
+    debouncer = Debouncer(source_dir)
+    kind = 'inotify' if isinstance(watcher, InotifyWatcher) else f'{poll_interval:g} sn yoklama'
+
+    # ad -> ilk olay zamanı; aynı dosya kuyrukta bir kez bulunur
+    queue = OrderedDict()
+    running = {}
+    converted, removed_ids = [], []
+    documents = {}
+    totals = {'converted': 0, 'failed': 0, 'removed': 0}
+    last_lag = None
+    run_started = time.time()
+
+    print(f"👀 {source_dir} izleniyor ({kind}, {workers} işçi). Durdurmak için Ctrl+C\n")
+    get_render_profile(compact)
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=get_render_profile, initargs=(compact,))
     try:
-        import reportlab
-        convert_all_udf_to_professional_pdf()
-    except ImportError:
-        print("✗ reportlab kütüphanesi kurulu değil!")
-        print("\nKurmak için:")
-        print("  pip install reportlab")
+        while True:
+            deadline = debouncer.next_deadline()
+            timeout = 1.0 if deadline is None else deadline - time.monotonic()
+            if running:
+                timeout = min(timeout, 0.05)
+            try:
+                changes = watcher.poll(timeout)
+            except RescanNeeded:
+                print("⚠️  Olay kuyruğu taştı, klasör bir kez yeniden taranıyor")
+                changes = _stale_sources(source_dir, manifest, output_dir)
+            for name, complete in changes.items():
+                debouncer.touch(name, complete)
+            changed = bool(changes)
+
+            for name, first, exists in debouncer.ready():
+                changed = True
+                if exists:
+                    udf_file = source_dir / name
+                    # Hazır PDF'ler ve desteklenmeyenler işçi beklemeden burada biter
+                    if not needs_worker(udf_file) and name not in {n for n, _ in running.values()}:
+                        queue.pop(name, None)
+                        if not manifest.is_up_to_date(udf_file, output_dir / (udf_file.stem + '.pdf')):
+                            future = Future()
+                            future.set_result(_convert_and_publish(str(udf_file), str(output_dir), fast, stream,
+                                                                   linearize, compact))
+                            running[future] = (name, first)
+                        continue
+                    queue.setdefault(name, first)
+                    continue
+                queue.pop(name, None)
+                for output in manifest.remove_source(name):
+                    print(f"✓ Kaynağı silinen PDF kaldırıldı: {output}")
+                    totals['removed'] += 1
+                removed_ids.append(Path(name).stem)
+
+            for future in [f for f in running if f.done()]:
+                changed = True
+                name, first = running.pop(future)
+                udf_file = source_dir / name
+                pdf_path = output_dir / (udf_file.stem + '.pdf')
+                exceeded = document = None
+                try:
+                    ok, output, record, exceeded, document = future.result()
+                    metrics.record_document(record)
+                except Exception as e:
+                    metrics.count_failure(f'worker:{type(e).__name__}')
+                    ok, output = False, f"✗ Hata ({name}): {e}\n"
+                last_lag = time.monotonic() - first
+                print(output, end='')
+                if exceeded is not None and udf_file.exists():
+                    quarantine.add(udf_file, exceeded)
+                    quarantine.save()
+                if not ok:
+                    totals['failed'] += 1
+                    continue
+                if name in quarantine.entries:
+                    quarantine.release(name)
+                    quarantine.save()
+                try:
+                    manifest.record(udf_file, pdf_path)
+                except FileNotFoundError:
+                    # Dönüştürülürken kaynağı silindi
+                    pdf_path.unlink(missing_ok=True)
+                    continue
+                converted.append(udf_file)
+                if document is not None:
+                    documents[udf_file.stem] = document
+                totals['converted'] += 1
+                print(f"   gecikme {last_lag:.2f} sn, kuyrukta {len(queue)} dosya")
+
+            # Aynı dosya aynı anda iki işçiye verilmez; yeni sürümü sırada bekler
+            busy = {name for name, _ in running.values()}
+            for name in list(queue):
+                if len(running) >= workers:
+                    break
+                if name in busy:
+                    continue
+                first = queue.pop(name)
+                udf_file = source_dir / name
+                if manifest.is_up_to_date(udf_file, output_dir / (udf_file.stem + '.pdf')):
+                    continue
+                if not force and quarantine.holds(udf_file):
+                    print(f"⚠️  Karantinada, değişmedi (atlandı): {name}")
+                    continue
+                future = executor.submit(_convert_and_publish, str(udf_file), str(output_dir), fast, stream,
+                                         linearize, compact)
+                running[future] = (name, first)
+
+            # Dizin ve alan deposu kuyruk boşalınca (veya belirli aralıkla) toplu güncellenir
+            idle = not queue and not running
+            if (converted or removed_ids) and (idle or len(converted) >= WATCH_FLUSH_COUNT):
+                sync_documents(converted, [index_writer, field_store], removed_ids, documents)
+                manifest.save()
+                metrics.write_run(output_dir, 'watch', run_started, workers=workers,
+                                  mode=render_mode(fast, stream), compact=compact, removed=len(removed_ids))
+                converted, removed_ids = [], []
+                documents.clear()
+                run_started = time.time()
+
+            if changed:
+                now = time.monotonic()
+                waiting = [debouncer.oldest()] + list(queue.values()) + [first for _, first in running.values()]
+                waiting = [t for t in waiting if t is not None]
+                _write_watch_status(output_dir, {
+                    'watcher': kind,
+                    'debouncing': len(debouncer),
+                    'queued': len(queue),
+                    'running': len(running),
+                    'oldest_wait_s': round(now - min(waiting), 3) if waiting else 0.0,
+                    'last_lag_s': round(last_lag, 3) if last_lag is not None else None,
+                    **totals,
+                    'updated': time.time(),
+                })
+    except KeyboardInterrupt:
+        print("\nİzleme durduruldu")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        watcher.close()
+        if converted or removed_ids:
+            sync_documents(converted, [index_writer, field_store], removed_ids, documents)
+            metrics.write_run(output_dir, 'watch', run_started, workers=workers,
+                              mode=render_mode(fast, stream), compact=compact, removed=len(removed_ids))
+        manifest.save()
+        index_writer.close()
+        field_store.close()
+
+def parse_args(argv=None, prog=None):
+    """Komut satırı argümanlarını oku"""
+    parser = argparse.ArgumentParser(prog=prog, description="UDF dosyalarını profesyonel PDF'e dönüştür")
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="paralel işçi süreç sayısı (0: tüm çekirdekler, varsayılan: 1)"
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="dönüşüm kaydını yok say ve tüm dosyaları yeniden dönüştür"
+    )
+    parser.add_argument(
+        '--fast', action='store_true',
+        help="toplu işler için Platypus yerine hızlı doğrudan canvas çizicisini kullan"
+    )
+    parser.add_argument(
+        '--stream', action='store_true',
+        help="hızlı çiziciyi akış modunda çalıştır: sayfalar dolunca yazılır, bellek sabit kalır"
+    )
+    parser.add_argument(
+        '--linearize', action='store_true',
+        help="PDF'leri doğrusallaştır (hızlı web görünümü): ilk sayfa dosyanın tamamı inmeden açılır"
+    )
+    parser.add_argument(
+        '--compact', action='store_true',
+        help="küçük çıktı profili: font alt kümeleri ipuçsuz gömülür, sayfa akışları yalnızca Flate ile sıkıştırılır"
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="kaynak klasörü izle ve yeni/değişen dosyaları geldikçe dönüştür"
+    )
+    parser.add_argument(
+        '--poll-interval', type=float, default=1.0,
+        help="inotify yoksa klasörü yoklama aralığı, saniye (varsayılan: 1)"
+    )
+    args = parser.parse_args(argv)
+    if args.workers <= 0:
+        args.workers = os.cpu_count() or 1
+    return args
+
+
+def main(argv=None, prog=None):
+    args = parse_args(argv, prog)
+    if args.watch:
+        watch_and_convert(workers=args.workers, force=args.force, fast=args.fast,
+                          poll_interval=args.poll_interval, stream=args.stream, linearize=args.linearize,
+                          compact=args.compact)
+    else:
+        convert_all_udf_to_professional_pdf(workers=args.workers, force=args.force, fast=args.fast,
+                                            stream=args.stream, linearize=args.linearize, compact=args.compact)
+
+
+if __name__ == "__main__":
+    main()
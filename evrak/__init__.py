@@ -0,0 +1,6 @@
+"""UDF evrak araçları için tek giriş noktası: ``python -m evrak <komut>``
+
+Komutlar (``extract``, ``render``, ``serve``, ``index``, ``bundle``) ağır
+bağımlılıkları yalnızca çalışırken yükler; paketin kendisi hiçbir şey
+içe aktarmaz.
+"""
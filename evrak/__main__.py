@@ -0,0 +1,5 @@
+import sys
+
+from evrak.cli import main
+
+sys.exit(main())
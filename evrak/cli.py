@@ -0,0 +1,118 @@
+import os
+import sys
+
+# Bu dosya yalnızca standart kütüphaneyi kullanır; her komut kendi
+# modülünü çalışırken içe aktarır. Böylece ``extract`` reportlab'i, arama
+# dizinini veya sunucuyu hiç yüklemez ve açılışı onlarca ms sürer.
+
+PROG = 'python -m evrak'
+
+# Argümanlarını kendisi okuyan modüllere devredilen komutlar
+DELEGATED = {
+    'render': ('create_professional_pdf', "UDF'leri PDF'e dönüştür (create_professional_pdf)"),
+    'index': ('search_index', 'Arama dizinini güncelle veya dizinde ara (search_index)'),
+    'bundle': ('pdf_bundle', "Evrakları tek PDF'te birleştir (pdf_bundle)"),
+}
+
+
+def udf_files(paths):
+    """Dosya yollarını olduğu gibi, klasörleri içindeki .udf dosyalarıyla üret"""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.udf'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def cmd_extract(args):
+    """UDF metinlerini (veya JSONL kayıtlarını) standart çıktıya ya da dosyaya yaz"""
+    import zipfile
+    from evrak_budget import BudgetExceeded
+    from udf_reader import extract_document_text
+
+    if args.output:
+        out = open(args.output, 'w', encoding='utf-8')
+    else:
+        out = sys.stdout
+        if args.jsonl:
+            # JSONL her zaman UTF-8'dir; terminalin kodlaması ne olursa olsun
+            out.reconfigure(encoding='utf-8')
+    if args.jsonl:
+        from text_export import export_jsonl
+
+        try:
+            _, failed = export_jsonl(udf_files(args.paths), out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return 1 if failed else 0
+
+    files = list(udf_files(args.paths))
+    failed = 0
+    try:
+        for path in files:
+            try:
+                text = extract_document_text(path)
+            except (zipfile.BadZipFile, KeyError, OSError, ValueError, BudgetExceeded) as e:
+                print(f"✗ {path}: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            if len(files) > 1:
+                out.write(f"==> {path} <==\n")
+            out.write(text)
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+def cmd_serve(args):
+    """Web görüntüleyici sunucusunu başlat"""
+    import start_server
+
+    port = args.port if args.port is not None else start_server.PORT
+    start_server.start_server(port=port, open_browser=not args.no_browser)
+    return 0
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=PROG, description='UDF evrak araçları')
+    commands = parser.add_subparsers(dest='command', metavar='komut', required=True)
+
+    extract = commands.add_parser('extract', help='UDF metnini çıkar')
+    extract.add_argument('paths', nargs='+', metavar='udf', help='UDF dosyası veya klasörü')
+    extract.add_argument('-o', '--output', help='Çıktı dosyası (varsayılan: standart çıktı)')
+    extract.add_argument('--jsonl', action='store_true',
+                         help='Evrak başına bir JSON satırı yaz: {"id", "text", "fields"}')
+    extract.set_defaults(handler=cmd_extract)
+
+    serve = commands.add_parser('serve', help='Web görüntüleyiciyi başlat (start_server)')
+    serve.add_argument('--port', type=int, help='Port (varsayılan: 8000)')
+    serve.add_argument('--no-browser', action='store_true', help='Tarayıcıyı açma')
+    serve.set_defaults(handler=cmd_serve)
+
+    # Yalnızca yardım metninde görünür; argümanları modülün kendisi okur
+    for name, (_, help_text) in DELEGATED.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    try:
+        if argv and argv[0] in DELEGATED:
+            import importlib
+
+            module = importlib.import_module(DELEGATED[argv[0]][0])
+            return module.main(argv[1:], prog=f'{PROG} {argv[0]}') or 0
+        args = build_parser().parse_args(argv)
+        return args.handler(args)
+    except BrokenPipeError:
+        # Okuyan taraf (ör. head) erken kapandı; çıkışta yeniden hata vermesin
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
@@ -0,0 +1,297 @@
+import contextlib
+import json
+import os
+import signal
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+# Evrak başına kaynak sınırları; 0 ilgili sınırı kapatır. Varsayılanlar
+# en büyük gerçek evrakın (2,8 MB'tan ≈60 MB'a açılan XLSX) birkaç katıdır.
+MB = 1024 * 1024
+MEMBER_MAX_BYTES = int(float(os.environ.get('EVRAK_MEMBER_MAX_MB', '256')) * MB)
+DOCUMENT_MAX_BYTES = int(float(os.environ.get('EVRAK_DOC_MAX_MB', '512')) * MB)
+DOCUMENT_MAX_SECONDS = float(os.environ.get('EVRAK_DOC_MAX_SECONDS', '300'))
+MAX_RSS_BYTES = int(float(os.environ.get('EVRAK_MAX_RSS_MB', '1024')) * MB)
+
+# Süre ve bellek denetimlerinin aralığı (sn)
+CHECK_INTERVAL = 0.25
+
+QUARANTINE_NAME = '.quarantine.json'
+
+try:
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    PAGE_SIZE = 4096
+
+_local = threading.local()
+
+
+class BudgetExceeded(BaseException):
+    """Evrak kaynak sınırını aştı
+
+    ``Exception`` yerine ``BaseException`` türevidir: dönüştürücünün ve
+    kütüphanelerin genel ``except Exception`` blokları sınır aşımını
+    yutmaz, hata evrak karantinaya alınana kadar yukarı taşınır.
+    """
+
+    def __init__(self, kind, reason):
+        super().__init__(kind, reason)
+        self.kind = kind
+        self.reason = reason
+
+    def __str__(self):
+        return self.reason
+
+
+def _mb(size):
+    return f'{size / MB:.1f} MB'
+
+
+def current_rss():
+    """Sürecin o anki yerleşik belleği (bayt); ölçülemiyorsa None
+
+    Yalnızca ``/proc`` bulunan sistemlerde (Linux) ölçülür.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Budget:
+    """Tek evrakın açılan bayt, süre ve bellek sınırları"""
+
+    def __init__(self, max_bytes=None, max_member=None, max_seconds=None, max_rss=None):
+        self.max_bytes = DOCUMENT_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_member = MEMBER_MAX_BYTES if max_member is None else max_member
+        self.max_seconds = DOCUMENT_MAX_SECONDS if max_seconds is None else max_seconds
+        self.max_rss = MAX_RSS_BYTES if max_rss is None else max_rss
+        self.used = 0
+        self.started = time.monotonic()
+        self.next_check = self.started + CHECK_INTERVAL
+        self.closed = False
+
+    def charge(self, size):
+        """Açılan ``size`` baytı evrak toplamına ekle, gerekirse süreyi ve belleği denetle"""
+        self.used += size
+        if self.max_bytes and self.used > self.max_bytes:
+            raise BudgetExceeded('document', f"açılan toplam veri {_mb(self.max_bytes)} sınırını aştı")
+        now = time.monotonic()
+        if now >= self.next_check:
+            self.next_check = now + CHECK_INTERVAL
+            self.check(now)
+
+    def check(self, now=None):
+        """Süre ve bellek sınırlarını denetle"""
+        now = time.monotonic() if now is None else now
+        if self.max_seconds and now - self.started > self.max_seconds:
+            raise BudgetExceeded('time', f"süre sınırı ({self.max_seconds:g} sn) aşıldı")
+        if self.max_rss:
+            rss = current_rss()
+            if rss is not None and rss > self.max_rss:
+                raise BudgetExceeded('memory', f"bellek kullanımı {_mb(rss)}, sınır {_mb(self.max_rss)}")
+
+
+def current():
+    """Bu iş parçacığında süren evrak bütçesi (yoksa None)"""
+    return getattr(_local, 'budget', None)
+
+
+def _arm(budget):
+    """Ana iş parçacığında süre/bellek denetimi için periyodik SIGALRM kur
+
+    Açma dışında kalan aşamalar (ör. sayfa çizimi) da böylece kesilebilir.
+    Kurulamazsa (ana iş parçacığı değil, setitimer yok) denetim yalnızca
+    açılan baytlar sayılırken yapılır; önceki işleyici döner (yoksa None).
+    """
+    if not (budget.max_seconds or budget.max_rss) or not hasattr(signal, 'setitimer'):
+        return None
+    if threading.current_thread() is not threading.main_thread():
+        return None
+
+    def on_alarm(signum, frame):
+        if budget.closed:
+            return
+        try:
+            budget.check()
+        except BudgetExceeded:
+            # Hata yukarı taşınırken tekrar tekrar atılmasın
+            budget.closed = True
+            raise
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, CHECK_INTERVAL, CHECK_INTERVAL)
+    return previous if previous is not None else signal.SIG_DFL
+
+
+@contextlib.contextmanager
+def document_budget():
+    """``with document_budget():`` bloğundaki evrak için sınırları uygula
+
+    Blok içinde ``open_archive`` ile açılan arşivler aynı bütçeye sayılır.
+    """
+    budget = Budget()
+    previous = current()
+    _local.budget = budget
+    handler = _arm(budget)
+    try:
+        yield budget
+    finally:
+        try:
+            budget.closed = True
+        finally:
+            if handler is not None:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, handler)
+            _local.budget = previous
+
+
+class _MeteredMember:
+    """Okunan (açılmış) baytları sayan arşiv üyesi"""
+
+    def __init__(self, raw, name, budget):
+        self._raw = raw
+        self._name = name
+        self._budget = budget
+        self._size = 0
+
+    def _charge(self, data):
+        self._size += len(data)
+        if self._budget.max_member and self._size > self._budget.max_member:
+            raise BudgetExceeded('member', f"{self._name} üyesi {_mb(self._budget.max_member)} sınırını aştı")
+        self._budget.charge(len(data))
+        return data
+
+    def read(self, n=-1):
+        return self._charge(self._raw.read(n))
+
+    def read1(self, n=-1):
+        return self._charge(self._raw.read1(n))
+
+    def readline(self, limit=-1):
+        return self._charge(self._raw.readline(limit))
+
+    def __iter__(self):
+        return iter(self.readline, b'')
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._raw.close()
+        return False
+
+
+class BudgetedZipFile(zipfile.ZipFile):
+    """Üyeleri akış halinde açan ve açılan baytları bütçeye sayan ZipFile
+
+    Bildirilen boyutu üye sınırını aşan üye hiç açılmaz; bildirilen boyut
+    yanlışsa gerçekten açılan baytlar sayılır. ``read`` de ``open``
+    üzerinden geçtiği için aynı sınırlara tabidir.
+    """
+
+    def __init__(self, file, mode='r', budget=None, **kwargs):
+        super().__init__(file, mode, **kwargs)
+        self.budget = budget if budget is not None else Budget(max_seconds=0, max_rss=0)
+
+    def open(self, name, mode='r', pwd=None, **kwargs):
+        if mode != 'r':
+            return super().open(name, mode, pwd, **kwargs)
+        info = name if isinstance(name, zipfile.ZipInfo) else self.getinfo(name)
+        limit = self.budget.max_member
+        if limit and info.file_size > limit:
+            raise BudgetExceeded('member', f"{info.filename} üyesi açıldığında {_mb(info.file_size)} "
+                                           f"olur, sınır {_mb(limit)}")
+        return _MeteredMember(super().open(info, mode, pwd, **kwargs), info.filename, self.budget)
+
+
+def open_archive(path):
+    """UDF/XLSX arşivini sınırlı okuma için aç
+
+    Süren bir ``document_budget`` varsa ona, yoksa arşive özel bir bayt
+    bütçesine sayılır.
+    """
+    return BudgetedZipFile(path, 'r', budget=current())
+
+
+class Quarantine:
+    """Sınırı aşan kaynakların kalıcı kaydı (``evraklar_pdf/.quarantine.json``)
+
+    Kaynak değişmedikçe (boyut ve mtime aynı) evrak sonraki toplu
+    dönüşümlerde atlanır; kaynak değişince veya ``--force`` ile yeniden
+    denenir. Kayıt toplu dönüştürücü, izleme modu ve sunucu arasında
+    ortaktır: ``save`` dosyayı yeniden okuyup yalnızca bu örnekte
+    eklenen/çıkarılan girdileri işler, aradaki başka yazımları ezmez.
+    """
+
+    def __init__(self, output_dir):
+        self.path = Path(output_dir) / QUARANTINE_NAME
+        # Kaydedilmemiş değişiklikler: ad -> girdi (çıkarılanlar için None)
+        self._changes = {}
+        self.entries = self._read()
+
+    def _read(self):
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Karantina kaydı okunamadı, yeniden oluşturulacak: {e}")
+            return {}
+
+    def holds(self, source):
+        """Kaynak karantinada ve o zamandan beri değişmemiş mi?"""
+        entry = self.entries.get(Path(source).name)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(source)
+        except FileNotFoundError:
+            return False
+        return entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns
+
+    def add(self, source, error):
+        """Kaynağı sınır aşımının türü ve nedeniyle karantinaya al"""
+        st = os.stat(source)
+        name = Path(source).name
+        self.entries[name] = self._changes[name] = {
+            'kind': error.kind,
+            'reason': error.reason,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'time': time.time(),
+        }
+
+    def release(self, name):
+        """Kaynağı karantinadan çıkar (ör. başarıyla dönüştürüldüğünde)"""
+        if self.entries.pop(name, None) is not None:
+            self._changes[name] = None
+
+    def prune(self, names):
+        """Kaynağı artık bulunmayan kayıtları sil"""
+        for name in [n for n in self.entries if n not in names]:
+            self.release(name)
+
+    def save(self):
+        """Değişiklik varsa güncel kayıtla birleştirip atomik olarak yaz"""
+        if not self._changes:
+            return
+        entries = self._read()
+        for name, entry in self._changes.items():
+            if entry is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = entry
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self.entries = entries
+        self._changes = {}
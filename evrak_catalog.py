@@ -0,0 +1,222 @@
+import base64
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+
+from static_assets import asset_version
+
+SORT_KEYS = ('id', 'mtime')
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+class CatalogError(ValueError):
+    """Geçersiz sorgu parametresi (ör. bozuk imleç)"""
+
+
+def encode_cursor(key):
+    raw = json.dumps(key, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError):
+        raise CatalogError('geçersiz imleç')
+    return tuple(key) if isinstance(key, list) else key
+
+
+class EvrakCatalog:
+    """PDF ve kaynak dizinlerinden oluşturulan bellek içi evrak kataloğu
+
+    Katalog ilk kullanımda yalnızca dosya adlarından bir kez oluşturulur.
+    Sonraki isteklerde en fazla ``refresh_interval`` saniyede bir
+    dizinlerin mtime değerine bakılır; yalnızca değişen dizin yeniden
+    okunur ve eklenen/silinen evraklar sıralı listelere tek tek işlenir.
+    Yerinde yeniden yazılan (``os.replace``) dosyalar da değişmiş sayılır:
+    taramada dizin girdisinin inode numarası (ek ``stat`` gerektirmez)
+    karşılaştırılır.
+    Tarihe göre sıralama dizini ilk gerektiğinde kurulur ve yalnızca yeni
+    dosyalar için ``stat`` yapılır. Sayfalama imleç (son görülen sıralama
+    anahtarı) ile yapılır, böylece sayfa maliyeti katalog büyüklüğünden
+    bağımsızdır.
+    """
+
+    def __init__(self, pdf_dir, source_dir, refresh_interval=1.0):
+        self.pdf_dir = str(pdf_dir)
+        self.source_dir = str(source_dir)
+        self.refresh_interval = refresh_interval
+        # dizin -> (dizin mtime, {evrak id: inode})
+        self._dirs = {self.pdf_dir: (None, {}), self.source_dir: (None, {})}
+        self._by_id = []
+        # Tarih sıralaması: (mtime, id) listesi ve id -> mtime, ilk kullanımda kurulur
+        self._by_mtime = None
+        self._mtimes = {}
+        self._checked = 0.0
+        self._generation = 0
+        self._count_cache = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scan(directory, suffix):
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name[:-len(suffix)]: entry.inode() for entry in entries
+                        if entry.name.endswith(suffix) and not entry.name.startswith('.')}
+        except FileNotFoundError:
+            return {}
+
+    def _contains(self, evrak_id):
+        return any(evrak_id in ids for _, ids in self._dirs.values())
+
+    def _file_mtime(self, evrak_id):
+        """PDF varsa onun, yoksa kaynak dosyanın değiştirilme zamanı"""
+        for directory, suffix in ((self.pdf_dir, '.pdf'), (self.source_dir, '.udf')):
+            if evrak_id in self._dirs[directory][1]:
+                try:
+                    return os.stat(os.path.join(directory, evrak_id + suffix)).st_mtime_ns
+                except FileNotFoundError:
+                    pass
+        return 0
+
+    def refresh(self, force=False):
+        """Değişen dizinleri yeniden okuyup katalogu güncelle"""
+        now = time.monotonic()
+        if not force and now - self._checked < self.refresh_interval:
+            return
+        with self._lock:
+            self._checked = now
+            changed = set()
+            for directory, suffix in ((self.pdf_dir, '.pdf'), (self.source_dir, '.udf')):
+                try:
+                    dir_mtime = os.stat(directory).st_mtime_ns
+                except FileNotFoundError:
+                    dir_mtime = -1
+                old_mtime, old_ids = self._dirs[directory]
+                if dir_mtime == old_mtime and not force:
+                    continue
+                ids = self._scan(directory, suffix)
+                changed |= old_ids.keys() ^ ids.keys()
+                # Aynı adla yeniden yazılan dosya yeni bir inode alır
+                changed |= {i for i in old_ids.keys() & ids.keys() if old_ids[i] != ids[i]}
+                self._dirs[directory] = (dir_mtime, ids)
+            if changed:
+                self._apply(changed)
+
+    def _apply(self, changed):
+        self._generation += 1
+        # Çok sayıda değişiklikte baştan sıralamak daha ucuz
+        if len(changed) > len(self._by_id) // 8:
+            ids = set().union(*(ids for _, ids in self._dirs.values()))
+            self._by_id = sorted(ids)
+            if self._by_mtime is not None:
+                old = self._mtimes
+                self._mtimes = {i: old[i] if i in old and i not in changed else self._file_mtime(i)
+                                for i in ids}
+                self._by_mtime = sorted((m, i) for i, m in self._mtimes.items())
+            return
+
+        for evrak_id in changed:
+            present = self._contains(evrak_id)
+            index = bisect_left(self._by_id, evrak_id)
+            listed = index < len(self._by_id) and self._by_id[index] == evrak_id
+            if listed and not present:
+                del self._by_id[index]
+            elif present and not listed:
+                self._by_id.insert(index, evrak_id)
+            if self._by_mtime is not None:
+                old = self._mtimes.pop(evrak_id, None)
+                if old is not None:
+                    del self._by_mtime[bisect_left(self._by_mtime, (old, evrak_id))]
+                if present:
+                    new = self._mtimes[evrak_id] = self._file_mtime(evrak_id)
+                    insort(self._by_mtime, (new, evrak_id))
+
+    def _mtime_index(self):
+        """Tarih sıralaması dizinini (gerekirse kurarak) döndür"""
+        if self._by_mtime is None:
+            self._mtimes = {i: self._file_mtime(i) for i in self._by_id}
+            self._by_mtime = sorted((m, i) for i, m in self._mtimes.items())
+        return self._by_mtime
+
+    def __len__(self):
+        self.refresh()
+        return len(self._by_id)
+
+    def item(self, evrak_id):
+        """Evrakın görüntüleyiciye verilecek kaydı"""
+        pdf_path = os.path.join(self.pdf_dir, evrak_id + '.pdf')
+        if evrak_id in self._dirs[self.pdf_dir][1]:
+            try:
+                # Sürümlü adres tarayıcıda kalıcı olarak önbelleğe alınır
+                url = f'{self.pdf_dir}/{evrak_id}.pdf?v={asset_version(pdf_path, "application/pdf")}'
+                return {'id': evrak_id, 'dosya': url, 'pdf': True}
+            except FileNotFoundError:
+                pass
+        # Henüz dönüştürülmemiş evrak ilk açılışta sunucuda dönüştürülür
+        return {'id': evrak_id, 'dosya': f'evrak/{evrak_id}.pdf', 'pdf': False}
+
+    def page(self, q='', sort='id', order='asc', cursor=None, limit=DEFAULT_LIMIT):
+        """Süzülmüş, sıralanmış bir sayfa ve sonraki sayfanın imleci"""
+        if sort not in SORT_KEYS:
+            raise CatalogError(f'geçersiz sıralama: {sort}')
+        if order not in ('asc', 'desc'):
+            raise CatalogError(f'geçersiz yön: {order}')
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        self.refresh()
+
+        q = q.strip().lower()
+        key = decode_cursor(cursor) if cursor else None
+        if key is not None and not (isinstance(key, str) if sort == 'id'
+                                    else isinstance(key, tuple) and len(key) == 2):
+            raise CatalogError('geçersiz imleç')
+
+        # Listeler yerinde güncellendiğinden tarama kilit altında yapılır;
+        # kayıtlar (dosya özetleri) kilit dışında hazırlanır
+        with self._lock:
+            keys = self._by_id if sort == 'id' else self._mtime_index()
+            total = len(keys)
+            if key is not None:
+                start = bisect_right(keys, key) if order == 'asc' else bisect_left(keys, key) - 1
+            else:
+                start = 0 if order == 'asc' else total - 1
+            step = 1 if order == 'asc' else -1
+
+            ids = []
+            last_key = None
+            has_more = False
+            i = start
+            while 0 <= i < total:
+                key = keys[i]
+                evrak_id = key if sort == 'id' else key[1]
+                if not q or q in evrak_id.lower():
+                    if len(ids) == limit:
+                        has_more = True
+                        break
+                    ids.append(evrak_id)
+                    last_key = key
+                i += step
+            matched = self._count(q) if q else total
+
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(list(last_key) if sort == 'mtime' else last_key)
+        return {
+            'items': [self.item(evrak_id) for evrak_id in ids],
+            'next_cursor': next_cursor,
+            'total': total,
+            'matched': matched,
+        }
+
+    def _count(self, q):
+        """Süzgece uyan toplam evrak sayısı (katalog değişene kadar saklanır)"""
+        cached = self._count_cache
+        if cached and cached[0] == self._generation and cached[1] == q:
+            return cached[2]
+        n = sum(1 for evrak_id in self._by_id if q in evrak_id.lower())
+        self._count_cache = (self._generation, q, n)
+        return n
@@ -0,0 +1,103 @@
+import os
+import shutil
+
+# Dosya başındaki imzalar (UYAP her şeyi .udf uzantısıyla indirebilir)
+SIGNATURES = (
+    (b'PK\x03\x04', 'zip'),
+    (b'%PDF-', 'pdf'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'{\\rtf', 'rtf'),
+    (b'<?xml', 'xml'),
+)
+# PDF imzası dosyanın ilk 1024 baytında herhangi bir yerde olabilir
+PDF_SEARCH_BYTES = 1024
+
+# Sezilen tür -> işleyen motor; listede olmayan türler desteklenmez
+ENGINES = {
+    'zip': 'render',
+    'pdf': 'passthrough',
+    'jpeg': 'image',
+    'tiff': 'image',
+    'png': 'image',
+}
+
+
+def sniff_type(path):
+    """Dosyanın gerçek türünü uzantıya değil ilk baytlara bakarak belirle"""
+    with open(path, 'rb') as f:
+        header = f.read(PDF_SEARCH_BYTES)
+    for signature, kind in SIGNATURES:
+        if header.startswith(signature):
+            return kind
+    if b'%PDF-' in header:
+        return 'pdf'
+    return 'unknown'
+
+
+def engine_for(kind):
+    """Tür için motor adı ('render', 'passthrough', 'image') veya None"""
+    return ENGINES.get(kind)
+
+
+def _copy_range(source, target):
+    """Çekirdek içinde kopyala (copy_file_range); desteklenmiyorsa normal kopya"""
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        if hasattr(os, 'copy_file_range'):
+            remaining = os.fstat(src.fileno()).st_size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining <= 0:
+                    return 'copy_file_range'
+            except OSError:
+                pass
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+        return 'copy'
+
+
+def publish_file(source, target):
+    """Hazır dosyayı yeniden kodlamadan ve kaynağa dokunmadan hedefe yayımla
+
+    Önce sabit bağlantı (hardlink) denenir; farklı dosya sistemi vb.
+    nedeniyle olmazsa içerik ``copy_file_range`` ile kopyalanır. Hedef
+    geçici adla hazırlanıp yerine taşındığından yarım dosya görünmez.
+    Kullanılan yöntemi döndürür.
+    """
+    target = os.fspath(target)
+    tmp_path = os.path.join(os.path.dirname(target) or '.', f'.{os.path.basename(target)}.{os.getpid()}.tmp')
+    try:
+        try:
+            os.link(source, tmp_path)
+            method = 'hardlink'
+        except OSError:
+            method = _copy_range(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return method
+
+
+def detach_output(path):
+    """Hardlink ile yayımlanmış eski çıktıyı, üzerine yazmadan önce ayır
+
+    Çıktı dosyası kaynakla aynı düğümü (inode) paylaşıyorsa yerinde yazmak
+    kaynağı bozar; bağlantı silinir ve yeni dosya açılır.
+    """
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,252 @@
+import re
+import sqlite3
+from pathlib import Path
+
+from search_index import fold
+
+# Alan deposu PDF klasörünün altında tutulur
+FIELDS_DB_NAME = '.fields.sqlite'
+
+# Katlanmış etiket (yalnızca harfler) -> alan adı
+LABELS = {
+    'davaci': 'davaci',
+    'davacilar': 'davaci',
+    'davali': 'davali',
+    'davalilar': 'davali',
+    'vekili': 'vekili',
+    'davacivekili': 'davaci_vekili',
+    'davalivekili': 'davali_vekili',
+    'konu': 'konu',
+    'hesasdeger': 'esas_deger',
+    'hesasdegeri': 'esas_deger',
+    'esasdeger': 'esas_deger',
+    'davaesasdegeri': 'esas_deger',
+    'dosyano': 'esas_no',
+    'esasno': 'esas_no',
+    'dava': 'dava_turu',
+    'davaturu': 'dava_turu',
+    'davatarihi': 'dava_tarihi',
+    'acilistarihi': 'dava_tarihi',
+    'celsetarihi': 'celse_tarihi',
+    'hakim': 'hakim',
+    'katip': 'katip',
+}
+
+# Etiketleri yalnızca dilekçe/tutanak başlığında ara
+HEADER_LINES = 40
+# Toplu yazımda tek işlemde yazılan evrak sayısı
+BATCH_SIZE = 500
+
+_LABEL_LINE = re.compile(r'^\s*([^\W\d_][^\W\d_ .\t]*(?:[ .\t]+[^\W\d_]+)*)[ \t.]*:(.*)$')
+_AMOUNT = re.compile(r'(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d{1,2}))?\s*(?:TL|₺)', re.IGNORECASE)
+_DATE = re.compile(r'\b(\d{1,2})[./](\d{1,2})[./](\d{4})\b')
+# Doldurulmamış şablon alanı ('davaciAdSoyad' gibi)
+_PLACEHOLDER = re.compile(r'^[a-z]+[A-Z]\w*$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    stamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    doc_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    value_folded TEXT NOT NULL,
+    amount_kurus INTEGER,
+    date TEXT
+);
+CREATE INDEX IF NOT EXISTS fields_doc ON fields(doc_id);
+CREATE INDEX IF NOT EXISTS fields_value ON fields(name, value_folded);
+CREATE INDEX IF NOT EXISTS fields_amount ON fields(name, amount_kurus) WHERE amount_kurus IS NOT NULL;
+CREATE INDEX IF NOT EXISTS fields_date ON fields(name, date) WHERE date IS NOT NULL;
+"""
+
+
+def parse_amount(text):
+    """'1.250,50 TL' biçimindeki ilk tutarı kuruş olarak döndür"""
+    match = _AMOUNT.search(text)
+    if not match:
+        return None
+    lira = int(match.group(1).replace('.', ''))
+    kurus = int((match.group(2) or '0').ljust(2, '0'))
+    return lira * 100 + kurus
+
+
+def parse_date(text):
+    """'12/11/2025' veya '12.11.2025' biçimindeki ilk tarihi ISO biçiminde döndür"""
+    for day, month, year in _DATE.findall(text):
+        day, month = int(day), int(month)
+        if 1 <= day <= 31 and 1 <= month <= 12:
+            return f'{year}-{month:02d}-{day:02d}'
+    return None
+
+
+def fold_value(value):
+    """Alan değerini aramaya uygun biçime getir (katlanmış, tek boşluklu)"""
+    return ' '.join(re.findall(r'\w+', fold(value)))
+
+
+def extract_fields(text):
+    """Başlıktaki 'ETİKET : değer' satırlarından alanları çıkar
+
+    (alan adı, değer, kuruş tutarı, ISO tarih) listesi döndürür. VEKİLİ
+    satırı kendinden önceki tarafa (davacı/davalı) bağlanır; öncesinde
+    taraf yoksa atlanır.
+    """
+    fields = []
+    party = None
+    for line in text.split('\n')[:HEADER_LINES]:
+        match = _LABEL_LINE.match(line)
+        if not match:
+            continue
+        label = match.group(1)
+        if label != label.upper():
+            continue
+        name = LABELS.get(re.sub(r'[^a-z]', '', fold(label)))
+        value = ' '.join(match.group(2).split())
+        if name is None or not value or _PLACEHOLDER.match(value):
+            continue
+
+        if name in ('davaci', 'davali'):
+            party = name
+        elif name == 'vekili':
+            # Tarafı belli olmayan vekil (ör. arabuluculuk tutanağı) kaydedilmez
+            if not party:
+                continue
+            name = f'{party}_vekili'
+
+        amount = parse_amount(value) if name == 'esas_deger' else None
+        date = parse_date(value) if name.endswith('tarihi') else None
+        fields.append((name, value, amount, date))
+    return fields
+
+
+class FieldStore:
+    """Evrak alanlarının SQLite deposu
+
+    Alanlar (evrak, ad, değer) satırları olarak tutulur; katlanmış değer,
+    tutar ve tarih sütunları (ad, ...) indeksleriyle sorgulanır. Yazımlar
+    ``BATCH_SIZE`` evraklık işlemlerle topluca yapılır. ``IndexWriter`` ile
+    aynı arayüzü sunduğundan ``sync_documents`` ile birlikte beslenir.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._stamps = dict(self.conn.execute('SELECT id, stamp FROM documents'))
+        self._batch = {}
+
+    def ids(self):
+        return set(self._stamps) | {k for k, v in self._batch.items() if v is not None}
+
+    def needs_update(self, doc_id, stamp):
+        if doc_id in self._batch:
+            return False
+        return self._stamps.get(doc_id) != stamp
+
+    def add(self, doc_id, document, stamp=''):
+        self._batch[doc_id] = (stamp, extract_fields(document.text()))
+        if len(self._batch) >= BATCH_SIZE:
+            self.commit()
+
+    def remove(self, doc_id):
+        if doc_id in self._stamps or doc_id in self._batch:
+            self._batch[doc_id] = None
+
+    def commit(self):
+        """Bekleyen evrakları tek işlemde yaz"""
+        if not self._batch:
+            return 0
+        ids = [(doc_id,) for doc_id in self._batch]
+        documents = [(doc_id, entry[0]) for doc_id, entry in self._batch.items() if entry]
+        rows = [
+            (doc_id, name, value, fold_value(value), amount, date)
+            for doc_id, entry in self._batch.items() if entry
+            for name, value, amount, date in entry[1]
+        ]
+        with self.conn:
+            self.conn.executemany('DELETE FROM fields WHERE doc_id = ?', ids)
+            self.conn.executemany('DELETE FROM documents WHERE id = ?', ids)
+            self.conn.executemany('INSERT INTO documents (id, stamp) VALUES (?, ?)', documents)
+            self.conn.executemany(
+                'INSERT INTO fields (doc_id, name, value, value_folded, amount_kurus, date) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        for doc_id, entry in self._batch.items():
+            if entry:
+                self._stamps[doc_id] = entry[0]
+            else:
+                self._stamps.pop(doc_id, None)
+        count = len(self._batch)
+        self._batch = {}
+        return count
+
+    def close(self):
+        self.conn.close()
+
+    def find(self, name, value=None, min_amount=None, max_amount=None, date_from=None, date_to=None):
+        """Alan süzgecine uyan evrak kimlikleri
+
+        ``value`` katlanmış değerin önekiyle eşleşir ('alipapila' ->
+        'ALİPAPİLA GIDA ...'); tutarlar kuruş, tarihler ISO biçimindedir.
+        Her koşul (ad, sütun) indeksi üzerinden aralık taramasıdır.
+        """
+        where = ['name = ?']
+        params = [name]
+        if value:
+            prefix = fold_value(value)
+            # Önek aramasını LIKE yerine indeks aralığı olarak yaz
+            where.append('value_folded >= ? AND value_folded < ?')
+            params += [prefix, prefix + '\uffff']
+        if min_amount is not None:
+            where.append('amount_kurus >= ?')
+            params.append(min_amount)
+        if max_amount is not None:
+            where.append('amount_kurus <= ?')
+            params.append(max_amount)
+        if date_from:
+            where.append('date >= ?')
+            params.append(date_from)
+        if date_to:
+            where.append('date <= ?')
+            params.append(date_to)
+        query = f"SELECT DISTINCT doc_id FROM fields WHERE {' AND '.join(where)} ORDER BY doc_id"
+        return [row[0] for row in self.conn.execute(query, params)]
+
+    def fields_of(self, doc_id):
+        """Evrakın tüm alanları {ad: [değer, ...]}"""
+        result = {}
+        for name, value in self.conn.execute(
+                'SELECT name, value FROM fields WHERE doc_id = ? ORDER BY rowid', (doc_id,)):
+            result.setdefault(name, []).append(value)
+        return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Evrak alanlarında süzme')
+    parser.add_argument('--db', default=f'evraklar_pdf/{FIELDS_DB_NAME}', help='Alan veritabanı')
+    parser.add_argument('--alan', default='davali', help='Alan adı (davaci, davali, konu, esas_deger, ...)')
+    parser.add_argument('--deger', help='Değerin başı (Türkçe harflere duyarsız)')
+    parser.add_argument('--min-tutar', type=float, help='En az tutar (TL)')
+    parser.add_argument('--max-tutar', type=float, help='En çok tutar (TL)')
+    parser.add_argument('--baslangic', help='En erken tarih (YYYY-AA-GG)')
+    parser.add_argument('--bitis', help='En geç tarih (YYYY-AA-GG)')
+    args = parser.parse_args()
+
+    store = FieldStore(args.db)
+    doc_ids = store.find(
+        args.alan, args.deger,
+        min_amount=round(args.min_tutar * 100) if args.min_tutar is not None else None,
+        max_amount=round(args.max_tutar * 100) if args.max_tutar is not None else None,
+        date_from=args.baslangic, date_to=args.bitis,
+    )
+    print(f"{len(doc_ids)} evrak")
+    for doc_id in doc_ids:
+        values = store.fields_of(doc_id).get(args.alan, [])
+        print(f"  {doc_id}  {' | '.join(values)}")
+    store.close()
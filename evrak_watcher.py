@@ -0,0 +1,228 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+import zipfile
+
+from evrak_dispatch import sniff_type
+
+# inotify olay bitleri (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+# Yazımı bitmiş dosyayı bildiren olaylar
+COMPLETE_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+_EVENT = struct.Struct('iIII')
+
+# Son olaydan sonra dosyanın hazır sayılması için beklenen süre (sn)
+QUIET_PERIOD = 0.25
+# Bu süreden sonra dosya bozuk görünse de dönüştürmeye verilir
+MAX_WAIT = 30.0
+
+# Türüne göre tamamlanmış dosyanın son 1 KB'ında bulunan bitiş işareti
+END_MARKERS = {'pdf': b'%%EOF', 'jpeg': b'\xff\xd9', 'png': b'IEND'}
+
+
+class RescanNeeded(Exception):
+    """Olay kuyruğu taştı; dizin bir kez baştan taranmalı"""
+
+
+def _looks_complete(path):
+    """Dosya yapısı tamamlanmış görünüyor mu (türüne göre)"""
+    try:
+        kind = sniff_type(path)
+        if kind in END_MARKERS:
+            # Yarım dosyanın sonunda bitiş işareti bulunmaz
+            with open(path, 'rb') as f:
+                f.seek(max(0, os.fstat(f.fileno()).st_size - 1024))
+                return END_MARKERS[kind] in f.read()
+    except OSError:
+        return False
+    if kind in ('zip', 'unknown'):
+        return zipfile.is_zipfile(path)
+    return True
+
+
+def _is_candidate(name, suffix):
+    # Yazım sırasında kullanılan gizli geçici adlar ('.x.udf.tmp') atlanır
+    return name.endswith(suffix) and not name.startswith('.')
+
+
+class InotifyWatcher:
+    """Linux inotify ile tek dizini izler (ctypes, ek bağımlılık yok)
+
+    ``poll`` yalnızca değişen dosya adlarını döndürür; dizin taranmaz.
+    """
+
+    def __init__(self, directory, suffix='.udf'):
+        self.directory = str(directory)
+        self.suffix = suffix
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify desteklenmiyor')
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 başarısız')
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(self.directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f'inotify_add_watch başarısız: {self.directory}')
+
+    def poll(self, timeout):
+        """{ad: yazım bitti mi} sözlüğü; olay yoksa boş döner"""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        changes = {}
+        if not ready:
+            return changes
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    raise RescanNeeded()
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    raise OSError(errno.ENOENT, f'izlenen dizin kaldırıldı: {self.directory}')
+                if mask & IN_ISDIR or not _is_candidate(name, self.suffix):
+                    continue
+                changes[name] = changes.get(name, False) or bool(mask & COMPLETE_MASK)
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """inotify olmayan sistemler için yoklamalı izleyici
+
+    Her ``interval`` saniyede dizin okunur ve (boyut, mtime) değişen
+    dosyalar bildirilir.
+    """
+
+    def __init__(self, directory, suffix='.udf', interval=1.0):
+        self.directory = str(directory)
+        self.suffix = suffix
+        self.interval = interval
+        self._stats = self._snapshot()
+        self._next = time.monotonic() + interval
+
+    def _snapshot(self):
+        stats = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if _is_candidate(entry.name, self.suffix):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    stats[entry.name] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def poll(self, timeout):
+        delay = self._next - time.monotonic()
+        if delay > timeout:
+            time.sleep(max(timeout, 0))
+            return {}
+        time.sleep(max(delay, 0))
+        self._next = time.monotonic() + self.interval
+        old, self._stats = self._stats, self._snapshot()
+        return {name: False for name in old.keys() | self._stats.keys()
+                if old.get(name) != self._stats.get(name)}
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, suffix='.udf', poll_interval=1.0):
+    """Mümkünse inotify, değilse yoklamalı izleyici döndür"""
+    try:
+        return InotifyWatcher(directory, suffix)
+    except (OSError, AttributeError):
+        return PollingWatcher(directory, suffix, poll_interval)
+
+
+class Debouncer:
+    """Yazımı süren dosyaları, durulana kadar bekletir
+
+    Bir dosya son olaydan ``quiet`` saniye sonra hazır sayılır. Yazımın
+    bittiği bildirilmediyse (yoklama, IN_MODIFY) boyut ve mtime bir
+    sessiz süre daha değişmeden kalmalıdır. Zip yapısı (PDF/JPEG/PNG'de bitiş
+    işareti) henüz tamamlanmamış dosyalar ``max_wait`` saniyeye kadar
+    beklemeye devam eder.
+    """
+
+    def __init__(self, directory, quiet=QUIET_PERIOD, max_wait=MAX_WAIT):
+        self.directory = str(directory)
+        self.quiet = quiet
+        self.max_wait = max_wait
+        # ad -> [ilk olay, son olay, son görülen stat, yazım bitti mi]
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def touch(self, name, complete=False, now=None):
+        now = time.monotonic() if now is None else now
+        entry = self._pending.get(name)
+        if entry is None:
+            self._pending[name] = [now, now, None, complete]
+        else:
+            entry[1] = now
+            entry[3] = complete
+
+    def oldest(self):
+        """Bekleyen en eski olayın zamanı (yoksa None)"""
+        return min((entry[0] for entry in self._pending.values()), default=None)
+
+    def next_deadline(self):
+        """Bir sonraki hazır olma denetiminin zamanı (yoksa None)"""
+        return min((entry[1] + self.quiet for entry in self._pending.values()), default=None)
+
+    def ready(self, now=None):
+        """Hazır dosyalar: (ad, ilk olay zamanı, var mı) listesi"""
+        now = time.monotonic() if now is None else now
+        result = []
+        for name, entry in list(self._pending.items()):
+            first, last, last_stat, complete = entry
+            if now - last < self.quiet:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                del self._pending[name]
+                result.append((name, first, False))
+                continue
+
+            stat = (st.st_size, st.st_mtime_ns)
+            if not complete and stat != last_stat:
+                # İlk denetim veya dosya hâlâ büyüyor: bir sessiz süre daha bekle
+                entry[1], entry[2] = now, stat
+                continue
+            if not _looks_complete(path) and now - first < self.max_wait:
+                entry[1], entry[2] = now, stat
+                continue
+            del self._pending[name]
+            result.append((name, first, True))
+        return result
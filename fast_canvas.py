@@ -0,0 +1,225 @@
+import functools
+import unicodedata
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+
+from pdf_stream import StreamingCanvas
+from render_profile import get_render_profile
+
+# Glif bulunmadığında kullanılacak Türkçe harf karşılıkları
+TRANSLITERATION = str.maketrans({
+    'ı': 'i', 'İ': 'I', 'ş': 's', 'Ş': 'S', 'ğ': 'g', 'Ğ': 'G',
+    '’': "'", '‘': "'", '“': '"', '”': '"', '–': '-', '—': '-', '…': '...',
+    '\t': ' ',
+})
+
+
+class FontMetrics:
+    """Font için karakter genişliği ve glif kapsama tablosu
+
+    Genişlikler 1 punto için bir kez hesaplanır ve saklanır; satır kırma
+    her karakter için yalnızca sözlükten okuma yapar.
+    """
+
+    def __init__(self, font_name):
+        self.font_name = font_name
+        font = pdfmetrics.getFont(font_name)
+        face = getattr(font, 'face', None)
+        if face is not None and hasattr(face, 'charToGlyph'):
+            # TrueType: cmap tablosu doğrudan kapsama bilgisidir
+            self._covered = face.charToGlyph
+            self._encoding = None
+        else:
+            # Standart Type1 fontlar WinAnsi kodlamasıyla çizilir
+            self._covered = None
+            self._encoding = 'cp1252'
+        self._widths = {}
+        self._covered_chars = set()
+
+    def covers(self, ch):
+        """Karakter için fontta glif var mı?"""
+        if self._covered is not None:
+            return ord(ch) in self._covered
+        try:
+            ch.encode(self._encoding)
+            return True
+        except UnicodeEncodeError:
+            return False
+
+    def char_width(self, ch):
+        width = self._widths.get(ch)
+        if width is None:
+            width = self._widths[ch] = pdfmetrics.stringWidth(ch, self.font_name, 1)
+        return width
+
+    def width(self, text, font_size):
+        widths = self._widths
+        total = 0.0
+        for ch in text:
+            width = widths.get(ch)
+            if width is None:
+                width = self.char_width(ch)
+            total += width
+        return total * font_size
+
+    def sanitize(self, text):
+        """Fontta olmayan karakterleri çizmeden önce karşılıklarıyla değiştir"""
+        chars = set(text)
+        if chars <= self._covered_chars:
+            return text
+        unknown = [ch for ch in chars - self._covered_chars if self.covers(ch)]
+        self._covered_chars.update(unknown)
+        if chars <= self._covered_chars:
+            return text
+        text = text.translate(TRANSLITERATION)
+        result = []
+        for ch in text:
+            if self.covers(ch):
+                result.append(ch)
+                continue
+            # Aksanlı harfi temel harfe indir, o da yoksa at
+            base = ''.join(c for c in unicodedata.normalize('NFKD', ch) if not unicodedata.combining(c))
+            result.append(''.join(c for c in base if self.covers(c)))
+        return ''.join(result)
+
+
+@functools.lru_cache(maxsize=None)
+def get_metrics(font_name):
+    """Font başına tek ``FontMetrics`` örneği"""
+    return FontMetrics(font_name)
+
+
+def wrap_segments(segments, metrics, font_size, max_width):
+    """(metin, kalın) parçalarını gerçek font genişliğine göre satırlara böl
+
+    ``metrics`` (normal, kalın) ``FontMetrics`` çiftidir. Her satır yine
+    (metin, kalın) parçalarından oluşan bir liste olarak döner.
+    """
+    lines = []
+    line = []
+    line_width = 0.0
+
+    for text, bold in segments:
+        m = metrics[1] if bold else metrics[0]
+        space = m.char_width(' ') * font_size
+        for word in text.split(' '):
+            word_width = m.width(word, font_size)
+            needed = word_width + (space if line else 0)
+
+            if line and line_width + needed > max_width:
+                lines.append(line)
+                line, line_width = [], 0.0
+                needed = word_width
+
+            # Satıra sığmayan tek kelimeyi karakter bazında böl
+            while word_width > max_width and word:
+                cut = len(word)
+                while cut > 1 and m.width(word[:cut], font_size) > max_width:
+                    cut -= 1
+                lines.append([(word[:cut], bold)])
+                word = word[cut:]
+                word_width = needed = m.width(word, font_size)
+
+            if line and line[-1][1] == bold:
+                line[-1] = (line[-1][0] + ' ' + word, bold)
+            elif line:
+                line.append((' ' + word, bold))
+            else:
+                line.append((word, bold))
+            line_width += needed
+
+    if line:
+        lines.append(line)
+    return lines
+
+
+class FastTextRenderer:
+    """Toplu işler için doğrudan canvas üzerine hızlı metin çizici
+
+    Platypus yerleşimi kullanılmaz: satırlar gerçek font genişliğine göre
+    kırılır, glif kapsaması çizimden önce denetlenir ve her sayfa tek bir
+    metin nesnesi (text object) olarak yazılır.
+    """
+
+    def __init__(self, font_size=10, leading=14, margin=50, pagesize=A4, compact=False):
+        profile = self.profile = get_render_profile(compact)
+        self.font_name = profile.font_name
+        self.font_bold = profile.font_bold
+        self.metrics = (get_metrics(self.font_name), get_metrics(self.font_bold))
+        self.font_size = font_size
+        self.leading = leading
+        self.margin = margin
+        self.pagesize = pagesize
+
+    def render(self, paragraphs, pdf_path, title=None, stream=False):
+        """Paragrafları PDF'e yaz
+
+        ``paragraphs`` düz metin veya (metin, kalın) parça listesi üreten
+        herhangi bir yinelenebilirdir; boş metin boş satır bırakır.
+        ``stream=True`` ile her sayfa dolar dolmaz dosyaya yazılır; üreteçten
+        gelen paragraflarla bellek kullanımı belge uzunluğundan bağımsızdır.
+        Yazılan sayfa sayısını döndürür.
+        """
+        width, height = self.pagesize
+        max_width = width - 2 * self.margin
+        # Yol veya yazılabilir dosya nesnesi kabul edilir
+        target = pdf_path if hasattr(pdf_path, 'write') else str(pdf_path)
+        canvas_class = StreamingCanvas if stream else canvas.Canvas
+        c = canvas_class(target, pagesize=self.pagesize, pageCompression=1, **self.profile.canvas_options())
+        top = height - self.margin
+
+        if title:
+            c.setTitle(title)
+            c.setFont(self.font_bold, 12)
+            c.drawString(self.margin, height - 40, self.metrics[1].sanitize(title))
+            c.line(self.margin, height - 45, width - self.margin, height - 45)
+            first_top = height - 70
+        else:
+            first_top = top
+
+        text = self._begin_page(c, first_top)
+        bold_font = False
+        y = first_top
+
+        for paragraph in paragraphs:
+            if isinstance(paragraph, str):
+                paragraph = [(paragraph, False)]
+            segments = [(self.metrics[1 if bold else 0].sanitize(t), bold) for t, bold in paragraph]
+            lines = wrap_segments(segments, self.metrics, self.font_size, max_width) or [[('', False)]]
+
+            for line in lines:
+                if y < self.margin:
+                    c.drawText(text)
+                    c.showPage()
+                    y = top
+                    text = self._begin_page(c, y)
+                    bold_font = False
+                for segment, bold in line:
+                    # Font yalnızca değiştiğinde yeniden seçilir
+                    if bold != bold_font:
+                        text.setFont(self.font_bold if bold else self.font_name, self.font_size, self.leading)
+                        bold_font = bold
+                    text.textOut(segment)
+                text.textLine()
+                y -= self.leading
+
+        c.drawText(text)
+        pages = c.getPageNumber()
+        with self.profile.writing():
+            c.save()
+        return pages
+
+    def _begin_page(self, c, y):
+        text = c.beginText(self.margin, y)
+        text.setFont(self.font_name, self.font_size, self.leading)
+        return text
+
+
+def label_segments(line):
+    """'ETİKET : değer' satırını kalın etiket + normal değer parçalarına ayır"""
+    if ':' in line:
+        label, value = line.split(':', 1)
+        return [(label.strip() + ':', True), (value.strip(), False)]
+    return [(line, False)]
@@ -0,0 +1,169 @@
+import struct
+
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
+
+# PDF'e gömülü TrueType alt kümesinde görüntüleyicinin kullanmadığı tablolar.
+# 'name' yalnızca ad/telif metnidir (DejaVu'da ~15 KB); 'cvt ', 'fpgm' ve
+# 'prep' ipucu (hinting) programlarıdır ve glif talimatlarıyla birlikte atılır.
+DROPPED_TABLES = frozenset([b'name', b'cvt ', b'fpgm', b'prep', b'hdmx', b'LTSH', b'VDMX', b'gasp', b'kern'])
+
+# Küçük fontların yüz (PostScript) adı eki; gömülü BaseFont adında da görünür
+COMPACT_FACE_SUFFIX = b'-Compact'
+
+# Bileşik glif bayrakları
+ARG_1_AND_2_ARE_WORDS = 0x0001
+WE_HAVE_A_SCALE = 0x0008
+MORE_COMPONENTS = 0x0020
+WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+WE_HAVE_A_TWO_BY_TWO = 0x0080
+WE_HAVE_INSTRUCTIONS = 0x0100
+
+HEAD_CHECKSUM_ADJUSTMENT = 8
+HEAD_INDEX_TO_LOC_FORMAT = 50
+MAXP_MAX_SIZE_OF_INSTRUCTIONS = 26
+CHECKSUM_MAGIC = 0xB1B0AFBA
+
+
+def read_tables(data):
+    """sfnt verisinden {etiket: tablo baytları}"""
+    count = struct.unpack_from('>H', data, 4)[0]
+    tables = {}
+    for i in range(count):
+        tag, _, offset, length = struct.unpack_from('>4sIII', data, 12 + 16 * i)
+        tables[tag] = data[offset:offset + length]
+    return tables
+
+
+def strip_glyph(glyph):
+    """Glifin ipucu talimatlarını at; çizim verisi değişmez"""
+    if len(glyph) < 10:
+        return glyph
+    contours = struct.unpack_from('>h', glyph)[0]
+    if contours >= 0:
+        pos = 10 + 2 * contours
+        length = struct.unpack_from('>H', glyph, pos)[0]
+        return glyph[:pos] + b'\x00\x00' + glyph[pos + 2 + length:]
+    # Bileşik glif: talimatlar son bileşenden sonra gelir
+    pos = 10
+    while True:
+        flags_pos = pos
+        flags = struct.unpack_from('>H', glyph, pos)[0]
+        pos += 8 if flags & ARG_1_AND_2_ARE_WORDS else 6
+        if flags & WE_HAVE_A_SCALE:
+            pos += 2
+        elif flags & WE_HAVE_AN_X_AND_Y_SCALE:
+            pos += 4
+        elif flags & WE_HAVE_A_TWO_BY_TWO:
+            pos += 8
+        if not flags & MORE_COMPONENTS:
+            break
+    if not flags & WE_HAVE_INSTRUCTIONS:
+        return glyph
+    stripped = bytearray(glyph[:pos])
+    struct.pack_into('>H', stripped, flags_pos, flags & ~WE_HAVE_INSTRUCTIONS)
+    return bytes(stripped)
+
+
+def _checksum(data):
+    data += b'\x00' * (-len(data) % 4)
+    return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xFFFFFFFF
+
+
+def write_sfnt(tables):
+    """Tabloları dizin, sağlama toplamları ve 4 bayt hizasıyla sfnt olarak yaz"""
+    tags = sorted(tables)
+    count = len(tags)
+    power = 1
+    while power * 2 <= count:
+        power *= 2
+    directory = [struct.pack('>IHHHH', 0x00010000, count, power * 16, power.bit_length() - 1,
+                             count * 16 - power * 16)]
+    body = []
+    offset = 12 + 16 * count
+    head_offset = None
+    for tag in tags:
+        data = tables[tag]
+        if tag == b'head':
+            data = data[:HEAD_CHECKSUM_ADJUSTMENT] + b'\x00' * 4 + data[HEAD_CHECKSUM_ADJUSTMENT + 4:]
+            head_offset = offset
+        directory.append(struct.pack('>4sIII', tag, _checksum(data), offset, len(data)))
+        padded = data + b'\x00' * (-len(data) % 4)
+        body.append(padded)
+        offset += len(padded)
+    font = bytearray(b''.join(directory + body))
+    if head_offset is not None:
+        adjustment = (CHECKSUM_MAGIC - _checksum(bytes(font))) & 0xFFFFFFFF
+        struct.pack_into('>I', font, head_offset + HEAD_CHECKSUM_ADJUSTMENT, adjustment)
+    return bytes(font)
+
+
+def compact_subset(data):
+    """reportlab alt kümesini ad tablosu ve ipuçları olmadan yeniden yaz
+
+    PDF görüntüleyicileri gömülü fontun adını PDF sözlüğünden alır ve
+    glifleri ipuçsuz da doğru çizer; yalnızca çok düşük çözünürlükte
+    piksel yerleşimi biraz değişebilir.
+    """
+    tables = read_tables(data)
+    head = bytearray(tables[b'head'])
+    long_loca = struct.unpack_from('>h', head, HEAD_INDEX_TO_LOC_FORMAT)[0] == 1
+    loca = tables[b'loca']
+    if long_loca:
+        offsets = struct.unpack(f'>{len(loca) // 4}I', loca)
+    else:
+        offsets = [o * 2 for o in struct.unpack(f'>{len(loca) // 2}H', loca)]
+    glyf = tables[b'glyf']
+
+    glyphs = []
+    new_offsets = [0]
+    pos = 0
+    for start, end in zip(offsets, offsets[1:]):
+        glyph = strip_glyph(glyf[start:end]) if end > start else b''
+        glyph += b'\x00' * (-len(glyph) % 4)
+        glyphs.append(glyph)
+        pos += len(glyph)
+        new_offsets.append(pos)
+
+    if pos >> 1 > 0xFFFF:
+        tables[b'loca'] = struct.pack(f'>{len(new_offsets)}I', *new_offsets)
+        struct.pack_into('>h', head, HEAD_INDEX_TO_LOC_FORMAT, 1)
+    else:
+        tables[b'loca'] = struct.pack(f'>{len(new_offsets)}H', *(o >> 1 for o in new_offsets))
+        struct.pack_into('>h', head, HEAD_INDEX_TO_LOC_FORMAT, 0)
+    tables[b'glyf'] = b''.join(glyphs)
+    tables[b'head'] = bytes(head)
+    maxp = bytearray(tables[b'maxp'])
+    if len(maxp) > MAXP_MAX_SIZE_OF_INSTRUCTIONS + 1:
+        struct.pack_into('>H', maxp, MAXP_MAX_SIZE_OF_INSTRUCTIONS, 0)
+    tables[b'maxp'] = bytes(maxp)
+    for tag in DROPPED_TABLES:
+        tables.pop(tag, None)
+    return write_sfnt(tables)
+
+
+class CompactTTFontFace(TTFontFace):
+    """Alt kümeleri ``compact_subset`` ile küçültülmüş gömen font yüzü"""
+
+    def makeSubset(self, subset):
+        return compact_subset(TTFontFace.makeSubset(self, subset))
+
+
+class CompactTTFont(TTFont):
+    """Yalnızca kullanılan glifleri, ad tablosu ve ipuçları olmadan gömen TrueType font
+
+    Ölçüler ve glifler ``TTFont`` ile aynıdır; reportlab ``Canvas`` ve
+    ``StreamingCanvas`` alt kümeyi yüzün ``makeSubset`` yöntemiyle ürettiği
+    için ikisinde de geçerlidir.
+    """
+
+    def __init__(self, name, filename, validate=0, subfontIndex=0):
+        # asciiReadable kapalı: alt küme yalnızca kullanılan karakterlerden
+        # oluşur (açıkken belgede geçmese de tüm ASCII glifleri gömülür)
+        TTFont.__init__(self, name, filename, validate=validate, subfontIndex=subfontIndex,
+                        asciiReadable=False)
+        # Yüz bir kez ayrıştırılır; yalnızca alt küme üretimi değişir
+        self.face.__class__ = CompactTTFontFace
+        # reportlab aynı yüz adlı ikinci fontu ilk kaydedilene eşler; aynı
+        # dosyadan yüklenen normal font önce kaydedilmişse küçük alt kümeler
+        # hiç üretilmezdi
+        self.face.name += COMPACT_FACE_SUFFIX
@@ -0,0 +1,220 @@
+import io
+import os
+import struct
+import zlib
+
+from reportlab.lib.pagesizes import A4
+
+from pdf_stream import StreamingCanvas
+
+try:
+    from PIL import Image, ImageSequence
+except ImportError:
+    Image = None
+
+# JPEG çerçeve başlıkları (SOFn); C4 (DHT), C8 (JPG) ve CC (DAC) başka işaretlerdir
+SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Uzunluk alanı taşımayan işaretler (TEM, RSTn, SOI)
+STANDALONE_MARKERS = frozenset([0x01, 0xD8] + list(range(0xD0, 0xD8)))
+
+COLOR_SPACES = {1: '/DeviceGray', 3: '/DeviceRGB', 4: '/DeviceCMYK'}
+MODE_COLOR_SPACES = {'1': '/DeviceGray', 'L': '/DeviceGray', 'RGB': '/DeviceRGB', 'CMYK': '/DeviceCMYK'}
+
+# Bu aralık dışındaki çözünürlük bilgisi güvenilmez sayılır (ör. birimsiz 1x1);
+# o zaman görüntü A4 genişliğine sığdırılır
+MIN_DPI, MAX_DPI = 50, 2400
+
+# TIFF etiketleri
+TIFF_COMPRESSION = 259
+TIFF_PHOTOMETRIC = 262
+TIFF_FILL_ORDER = 266
+TIFF_STRIP_OFFSETS = 273
+TIFF_ROWS_PER_STRIP = 278
+TIFF_STRIP_BYTE_COUNTS = 279
+TIFF_T6_OPTIONS = 293
+TIFF_GROUP4 = 4
+
+# Çözülen kareler hızlı düzeyde sıkıştırılır; taranmış siyah-beyaz sayfalarda
+# 6. düzey yalnızca ~%10 küçültür, süreyi üçe katlar
+FLATE_LEVEL = 1
+
+
+def jpeg_info(f):
+    """JPEG başlığından (genişlik, yükseklik, bileşen, dpi, adobe) oku
+
+    Yalnızca işaret bölümleri okunur, görüntü çözülmez. ``adobe`` APP14
+    işaretinin varlığıdır; Adobe CMYK JPEG'leri ters kaydedilir.
+    """
+    f.seek(2)
+    dpi = None
+    adobe = False
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ValueError('Geçersiz JPEG başlığı')
+        code = marker[1]
+        if code == 0xFF:
+            # Dolgu baytı
+            f.seek(-1, 1)
+            continue
+        if code in STANDALONE_MARKERS:
+            continue
+        if code in (0xD9, 0xDA):
+            raise ValueError('JPEG çerçeve başlığı bulunamadı')
+        length = struct.unpack('>H', f.read(2))[0]
+        segment = f.read(length - 2)
+        if code == 0xE0 and segment.startswith(b'JFIF\x00') and len(segment) >= 12:
+            unit, x_density, y_density = struct.unpack('>BHH', segment[7:12])
+            if unit == 1:
+                dpi = (x_density, y_density)
+            elif unit == 2:
+                dpi = (x_density * 2.54, y_density * 2.54)
+        elif code == 0xEE and segment.startswith(b'Adobe'):
+            adobe = True
+        elif code in SOF_MARKERS:
+            _, height, width, components = struct.unpack('>BHHB', segment[:6])
+            if not height or components not in COLOR_SPACES:
+                raise ValueError(f'Desteklenmeyen JPEG ({components} bileşen, yükseklik {height})')
+            return width, height, components, dpi, adobe
+
+
+def page_size(width, height, dpi=None):
+    """Piksel boyutundan sayfa boyutu (pt)"""
+    if dpi and all(MIN_DPI <= d <= MAX_DPI for d in dpi):
+        return width * 72.0 / dpi[0], height * 72.0 / dpi[1]
+    return A4[0], height * A4[0] / width
+
+
+def _show(canvas, name, size):
+    canvas.setPageSize(size)
+    canvas.drawImageObject(name, 0, 0, *size)
+    canvas.showPage()
+
+
+def _add_jpeg(canvas, path):
+    """JPEG verisini çözmeden (DCT olduğu gibi) tek sayfa olarak ekle"""
+    with open(path, 'rb') as f:
+        width, height, components, dpi, adobe = jpeg_info(f)
+        header = (f'/Width {width} /Height {height} /ColorSpace {COLOR_SPACES[components]} '
+                  f'/BitsPerComponent 8 /Filter /DCTDecode')
+        if components == 4 and adobe:
+            header += ' /Decode [1 0 1 0 1 0 1 0]'
+        length = os.fstat(f.fileno()).st_size
+        f.seek(0)
+        name = canvas.writeImage(header, f, length)
+    _show(canvas, name, page_size(width, height, dpi))
+
+
+def _group4_strips(frame):
+    """CCITT G4 karesinin şeritleri: [(ofset, uzunluk, satır sayısı, başlık)]
+
+    Bu biçim PDF'in ``CCITTFaxDecode`` süzgeciyle aynıdır; veri dosyadan
+    olduğu gibi kopyalanabilir. Her şerit ayrı kodlandığı (beyaz başvuru
+    satırıyla başladığı) için şeritler tek akışa birleştirilemez. G4
+    olmayan karelerde None.
+    """
+    tags = frame.tag_v2
+    offsets = tags.get(TIFF_STRIP_OFFSETS)
+    counts = tags.get(TIFF_STRIP_BYTE_COUNTS)
+    if (tags.get(TIFF_COMPRESSION) != TIFF_GROUP4 or tags.get(TIFF_FILL_ORDER, 1) != 1
+            or tags.get(TIFF_T6_OPTIONS, 0) != 0 or not offsets or not counts or len(counts) != len(offsets)):
+        return None
+    width, height = frame.size
+    rows_per_strip = min(tags.get(TIFF_ROWS_PER_STRIP, height), height)
+    if rows_per_strip <= 0 or len(offsets) != -(-height // rows_per_strip):
+        return None
+    # Kodlanmış siyah/beyaz koşular 1/0 olarak çözülür; BlackIsZero'da ters çevrilir
+    decode = ' /Decode [1 0]' if tags.get(TIFF_PHOTOMETRIC, 0) == 1 else ''
+    strips = []
+    for i, (offset, length) in enumerate(zip(offsets, counts)):
+        rows = min(rows_per_strip, height - i * rows_per_strip)
+        header = (f'/Width {width} /Height {rows} /ColorSpace /DeviceGray /BitsPerComponent 1 '
+                  f'/Filter /CCITTFaxDecode /DecodeParms << /K -1 /Columns {width} /Rows {rows} >>{decode}')
+        strips.append((offset, length, rows, header))
+    return strips
+
+
+def _encode_group4(frame):
+    """Kareyi tek şeritli CCITT G4 olarak yeniden kodla: (başlık, veri)
+
+    Çok şeritli G4 karesinin her şeridi ayrı görüntü olursa PDF kaynaktan
+    büyür (8 satırlık şeritlerde 2-3 katı) ve görüntüleyici sayfa başına
+    yüzlerce görüntü çizer. Tek akış şerit başlarındaki beyaz başvuru
+    satırlarından da kurtulur. Pillow libtiff'siz kurulmuşsa veya kare
+    iki renkli değilse None.
+    """
+    if frame.mode != '1':
+        return None
+    buffer = io.BytesIO()
+    try:
+        frame.save(buffer, 'TIFF', compression='group4', tiffinfo={TIFF_ROWS_PER_STRIP: frame.size[1]})
+    except (OSError, ValueError):
+        return None
+    buffer.seek(0)
+    with Image.open(buffer) as single:
+        strips = _group4_strips(single)
+    if not strips or len(strips) != 1:
+        return None
+    offset, length, _, header = strips[0]
+    return header, buffer.getbuffer()[offset:offset + length].tobytes()
+
+
+def _encode_frame(frame):
+    """Çözülmüş kareyi (başlık, Flate ile sıkıştırılmış veri) olarak kodla"""
+    if frame.mode not in MODE_COLOR_SPACES:
+        if frame.mode in ('RGBA', 'LA', 'PA') or 'transparency' in frame.info:
+            # Saydam alanlar beyaz zemine oturtulur
+            rgba = frame.convert('RGBA')
+            background = Image.new('RGB', frame.size, 'white')
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            frame = background
+        else:
+            frame = frame.convert('RGB')
+    width, height = frame.size
+    bits = 1 if frame.mode == '1' else 8
+    header = (f'/Width {width} /Height {height} /ColorSpace {MODE_COLOR_SPACES[frame.mode]} '
+              f'/BitsPerComponent {bits} /Filter /FlateDecode')
+    return header, zlib.compress(frame.tobytes(), FLATE_LEVEL)
+
+
+def _add_frames(canvas, path):
+    """TIFF/PNG karelerini sırayla, her seferinde tek kare çözerek ekle"""
+    if Image is None:
+        raise RuntimeError('TIFF/PNG görüntüleri için Pillow kurulu olmalı (pip install pillow)')
+    with Image.open(path) as image, open(path, 'rb') as raw:
+        # Kareler tembel okunur; bellekte yalnızca o anki kare bulunur
+        for frame in ImageSequence.Iterator(image):
+            size = page_size(*frame.size, frame.info.get('dpi'))
+            strips = _group4_strips(frame) if image.format == 'TIFF' else None
+            if strips is not None and len(strips) == 1:
+                # Tek şeritli G4 çözülmeden kopyalanır
+                offset, length, _, header = strips[0]
+                raw.seek(offset)
+                _show(canvas, canvas.writeImage(header, raw, length), size)
+                continue
+            # Çok şeritli G4 bir kez çözülüp tek G4 akışı olarak yazılır; taranmış
+            # iki renkli sayfada G4 Flate'in yaklaşık yarısı olduğundan Flate
+            # yalnızca G4 yazılamazsa (libtiff yok) denenir
+            encoded = _encode_group4(frame) if strips is not None else None
+            header, data = encoded or _encode_frame(frame)
+            _show(canvas, canvas.writeImage(header, data), size)
+
+
+def render_image_pdf(path, target, kind, title=None):
+    """Görüntü dosyasını her karesi bir sayfa olacak şekilde PDF'e yaz
+
+    ``kind`` ``evrak_dispatch.sniff_type`` sonucudur. JPEG'ler olduğu gibi
+    gömülür; TIFF sayfaları akış halinde yazılır. Tek şeritli G4 sayfalar
+    çözülmeden kopyalanır, çok şeritli olanlar tek G4 akışına yeniden
+    kodlanır. Sayfa sayısını döndürür.
+    """
+    canvas = StreamingCanvas(target)
+    if title:
+        canvas.setTitle(title)
+    if kind == 'jpeg':
+        _add_jpeg(canvas, path)
+    else:
+        _add_frames(canvas, path)
+    pages = canvas.getPageNumber() - 1
+    canvas.save()
+    return pages
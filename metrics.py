@@ -0,0 +1,393 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# EVRAK_METRICS=0 ile tüm ölçümler kapatılır; kapalıyken her çağrı tek bir
+# bayrak denetimine iner
+ENABLED = os.environ.get('EVRAK_METRICS', '1') != '0'
+
+# Dönüşüm çalışmalarının özet satırları PDF klasörüne eklenir
+METRICS_LOG_NAME = '.metrics.jsonl'
+
+# Süre kovaları (sn) ve çalışma özetinde tutulan en yavaş evrak sayısı
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SLOWEST_KEPT = 10
+
+DESCRIPTIONS = {
+    'evrak_stage_seconds': ('histogram', 'Dönüşüm aşaması süresi (alt aşamalar hariç)'),
+    'evrak_document_seconds': ('histogram', 'Evrak başına toplam dönüşüm süresi'),
+    'evrak_documents_total': ('counter', 'Dönüştürülen evrak sayısı'),
+    'evrak_failures_total': ('counter', 'Nedenine göre başarısız dönüşümler'),
+    'evrak_bytes_in_total': ('counter', 'Okunan kaynak baytı'),
+    'evrak_bytes_out_total': ('counter', 'Yazılan PDF baytı'),
+    'evrak_http_request_seconds': ('histogram', 'HTTP istek süresi'),
+    'evrak_cache_requests_total': ('counter', 'Önbellek istekleri (hit/miss/shared)'),
+    'evrak_cache_hit_ratio': ('gauge', 'Önbellek isabet oranı'),
+    'evrak_pdf_cache_bytes': ('gauge', 'PDF disk önbelleğinin boyutu'),
+    'evrak_catalog_documents': ('gauge', 'Katalogdaki evrak sayısı'),
+    'evrak_watch_queue_depth': ('gauge', 'İzleme modunda kuyruktaki dosyalar'),
+    'evrak_watch_oldest_wait_seconds': ('gauge', 'İzleme modunda en eski bekleyen dosyanın bekleme süresi'),
+    'evrak_watch_last_lag_seconds': ('gauge', 'İzleme modunda son dosyanın olaydan yayına gecikmesi'),
+    # Son toplu çalışmanın özeti; her çalışmada sıfırdan sayıldığı için sayaç değil göstergedir
+    'evrak_last_run_documents': ('gauge', 'Son çalışmada dönüştürülen evrak sayısı'),
+    'evrak_last_run_failures': ('gauge', 'Son çalışmada nedenine göre başarısız dönüşümler'),
+    'evrak_last_run_bytes_in': ('gauge', 'Son çalışmada okunan kaynak baytı'),
+    'evrak_last_run_bytes_out': ('gauge', 'Son çalışmada yazılan PDF baytı'),
+    'evrak_last_run_stage_seconds': ('gauge', 'Son çalışmada aşamaların toplam süresi'),
+    'evrak_last_run_document_seconds': ('gauge', 'Son çalışmada evrakların toplam dönüşüm süresi'),
+    'evrak_last_run_seconds': ('gauge', 'Son çalışmanın süresi'),
+    'evrak_last_run_timestamp_seconds': ('gauge', 'Son çalışmanın başlangıç zamanı (Unix)'),
+}
+
+_local = threading.local()
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(DURATION_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class Registry:
+    """Sayaç, gösterge ve histogramların iş parçacığı güvenli deposu"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.slowest = []
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def keep_slow(self, record):
+        with self._lock:
+            self.slowest.append(record)
+            self.slowest.sort(key=lambda r: r['seconds'], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+    def snapshot(self):
+        """JSON'a yazılabilir kopya"""
+        with self._lock:
+            return {
+                'counters': [[n, dict(l), v] for (n, l), v in self.counters.items()],
+                'gauges': [[n, dict(l), v] for (n, l), v in self.gauges.items()],
+                'histograms': [[n, dict(l), {'counts': list(h.counts), 'sum': round(h.sum, 6), 'count': h.count}]
+                               for (n, l), h in self.histograms.items()],
+                'slowest': list(self.slowest),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.slowest = []
+
+
+REGISTRY = Registry()
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Aşama süresini o anki evrak kaydına ekler
+
+    İç içe aşamalarda dıştaki aşamaya yalnızca kendi süresi yazılır
+    (ör. ``layout`` içindeki ``write`` süresi ``layout``'a sayılmaz).
+    """
+
+    __slots__ = ('name', 'start', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.children = 0.0
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        record = getattr(_local, 'document', None)
+        if record is not None:
+            stages = record['stages']
+            stages[self.name] = stages.get(self.name, 0.0) + elapsed - self.children
+        return False
+
+
+def stage(name):
+    """``with stage('parse'):`` bloğunun süresini ölç (kapalıyken boş bağlam)"""
+    if not ENABLED:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+class _TimedFile:
+    """Yazma süresini ``write`` aşaması olarak ölçen dosya"""
+
+    def __init__(self, path):
+        self._f = open(path, 'wb')
+
+    def write(self, data):
+        with stage('write'):
+            return self._f.write(data)
+
+    def close(self):
+        with stage('write'):
+            self._f.close()
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class _PathTarget:
+    __slots__ = ('path',)
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def __enter__(self):
+        return self.path
+
+    def __exit__(self, *exc):
+        return False
+
+
+def output(path):
+    """PDF yazıcılarına verilecek hedef
+
+    ``with output(yol) as hedef:`` ölçüm açıkken yazma süresini ölçen
+    bir dosya, kapalıyken yolun kendisini verir.
+    """
+    if not ENABLED:
+        return _PathTarget(path)
+    return _TimedFile(path)
+
+
+def begin_document(doc_id, source_path=None):
+    """Bu iş parçacığında yeni bir evrak kaydı başlat"""
+    if not ENABLED:
+        return
+    bytes_in = os.path.getsize(source_path) if source_path else 0
+    _local.document = {'id': doc_id, 'stages': {}, 'bytes_in': bytes_in,
+                       'bytes_out': 0, 'cause': None, 'started': time.perf_counter()}
+
+
+def fail(cause):
+    """O anki evrakın başarısızlık nedenini kaydet (ilk neden korunur)"""
+    record = getattr(_local, 'document', None) if ENABLED else None
+    if record is not None and record['cause'] is None:
+        record['cause'] = cause
+
+
+def end_document(ok, output_path=None):
+    """Evrak kaydını kapat ve döndür (süreçler arası taşınabilir sözlük)"""
+    record = getattr(_local, 'document', None) if ENABLED else None
+    if record is None:
+        return None
+    _local.document = None
+    record['seconds'] = time.perf_counter() - record.pop('started')
+    record['ok'] = bool(ok)
+    # Aşamalara girmeyen süre (Platypus paragraf hazırlığı vb.)
+    other = record['seconds'] - sum(record['stages'].values())
+    if other > 0:
+        record['stages']['other'] = other
+    if ok and output_path:
+        try:
+            record['bytes_out'] = os.path.getsize(output_path)
+        except OSError:
+            pass
+    if not ok and record['cause'] is None:
+        record['cause'] = 'unknown'
+    return record
+
+
+def count_failure(cause, registry=REGISTRY):
+    """Kayıt üretemeden düşen dönüşümü (ör. çöken işçi süreç) say"""
+    if ENABLED:
+        registry.inc('evrak_failures_total', cause=cause)
+        registry.inc('evrak_documents_total', result='failed')
+
+
+def record_document(record, registry=REGISTRY):
+    """Evrak kaydını (aynı veya işçi süreçten) depoya işle"""
+    if record is None:
+        return
+    for name, seconds in record['stages'].items():
+        registry.observe('evrak_stage_seconds', seconds, stage=name)
+    registry.observe('evrak_document_seconds', record['seconds'])
+    registry.inc('evrak_documents_total', result='ok' if record['ok'] else 'failed')
+    registry.inc('evrak_bytes_in_total', record['bytes_in'])
+    registry.inc('evrak_bytes_out_total', record['bytes_out'])
+    if record['cause']:
+        registry.inc('evrak_failures_total', cause=record['cause'])
+    registry.keep_slow({
+        'id': record['id'],
+        'seconds': round(record['seconds'], 4),
+        'stages': {k: round(v, 4) for k, v in record['stages'].items()},
+    })
+
+
+def write_run(output_dir, name, started, registry=REGISTRY, **extra):
+    """Çalışma özetini JSON satırı olarak ekle ve depoyu sıfırla"""
+    if not ENABLED:
+        return
+    line = {
+        'run': name,
+        'started': started,
+        'seconds': round(time.time() - started, 3),
+        **extra,
+        **registry.snapshot(),
+    }
+    with open(os.path.join(output_dir, METRICS_LOG_NAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(line, ensure_ascii=False) + '\n')
+    registry.reset()
+
+
+_last_run = (None, None)
+
+
+def last_run(output_dir):
+    """Günlükteki son çalışma özeti (dosya değişmedikçe yeniden okunmaz)"""
+    global _last_run
+    path = os.path.join(output_dir, METRICS_LOG_NAME)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _last_run[0] == stamp:
+        return _last_run[1]
+    with open(path, 'rb') as f:
+        f.seek(max(0, st.st_size - 1024 * 1024))
+        lines = f.read().splitlines()
+    run = None
+    for raw in reversed(lines):
+        try:
+            run = json.loads(raw)
+            break
+        except ValueError:
+            continue
+    _last_run = (stamp, run)
+    return run
+
+
+def _last_run_name(name):
+    """'evrak_documents_total' -> 'evrak_last_run_documents'"""
+    base = name[len('evrak_'):] if name.startswith('evrak_') else name
+    if base.endswith('_total'):
+        base = base[:-len('_total')]
+    return 'evrak_last_run_' + base
+
+
+def last_run_snapshot(run):
+    """Çalışma özetini yalnızca göstergelerden oluşan anlık görüntüye çevir
+
+    ``write_run`` her çalışmadan sonra depoyu sıfırladığından özetteki
+    sayaç ve histogramlar birikmez; sayaç olarak yayımlansalar daha çok
+    evrak dönüştüren ikinci çalışma artış gibi görünür ve ``rate()``
+    yanlış çıkar. Sayaçlar ``evrak_last_run_*`` göstergelerine,
+    histogramlar toplam sürelerine çevrilir.
+    """
+    gauges = [[_last_run_name(n), l, v] for n, l, v in run.get('counters', [])]
+    gauges += [[_last_run_name(n), l, h['sum']] for n, l, h in run.get('histograms', [])]
+    gauges += [list(g) for g in run.get('gauges', [])]
+    if 'seconds' in run:
+        gauges.append(['evrak_last_run_seconds', {}, run['seconds']])
+    if 'started' in run:
+        gauges.append(['evrak_last_run_timestamp_seconds', {}, run['started']])
+    return {'gauges': gauges}
+
+
+def _label_value(value):
+    """Etiket değerini metin biçiminin istediği gibi kaçışla (\\, \", \n)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_label_value(v)}"' for k, v in sorted(labels.items())) + '}'
+
+
+def render_prometheus(sources):
+    """(anlık görüntü, ek etiketler) listesini Prometheus metin biçimine çevir"""
+    series = {}
+    for snapshot, extra in sources:
+        for name, labels, value in snapshot.get('counters', []) + snapshot.get('gauges', []):
+            series.setdefault(name, []).append(({**labels, **extra}, value))
+        for name, labels, h in snapshot.get('histograms', []):
+            series.setdefault(name, []).append(({**labels, **extra}, h))
+
+    lines = []
+    for name in sorted(series):
+        kind, help_text = DESCRIPTIONS.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series[name]:
+            if kind != 'histogram':
+                lines.append(f'{name}{_labels(labels)} {value}')
+                continue
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ('+Inf',), value['counts']):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels({**labels, "le": bound})} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {value["sum"]}')
+            lines.append(f'{name}_count{_labels(labels)} {value["count"]}')
+    return '\n'.join(lines) + '\n'
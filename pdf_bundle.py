@@ -0,0 +1,460 @@
+import hashlib
+import mmap
+import os
+import re
+import sys
+import zlib
+
+from pdf_linearize import (
+    COPY_CHUNK_SIZE, OBJECT_TAIL, STREAM_TAIL, LinearizeError, Name, Ref,
+    _OBJ_HEADER, _SPACE, _STARTXREF, _XREF_ENTRY, _XREF_SUBSECTION, _Object, _SourcePDF, parse_value,
+)
+from pdf_stream import pdf_text
+
+# Dava dosyası birleştirme: seçilen evrakların nesneleri yeniden
+# numaralanarak tek PDF'e art arda kopyalanır, hiçbiri yeniden çizilmez.
+# Çıktı belge belge yazılır; katalog, sayfa ağacı, yer imleri ve xref
+# tablosu en sonda gelir (PDF okuyucular dosyayı sondan okur).
+
+CATALOG, PAGES, OUTLINES, INFO = 1, 2, 3, 4
+FIRST_FREE = 5
+HEADER = b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n'
+PRODUCER = 'pdf_bundle'
+
+# Birleştirilmiş sayfada anlamını yitiren girdiler (üst düğüm yeniden
+# bağlanır, makale zincirleri kaynak belgenin kataloğundadır)
+DROPPED_PAGE_KEYS = ('Parent', 'B')
+
+_OBJSTM_HEADER = re.compile(rb'(\d+)\s+(\d+)')
+
+
+class BundleError(ValueError):
+    """Evrak birleştirilemiyor"""
+
+
+def _format_real(value):
+    # repr() '1e-05' gibi PDF'te geçersiz gösterim üretebilir
+    text = ('%.6f' % value).rstrip('0').rstrip('.')
+    return text if text not in ('', '-0') else '0'
+
+
+def serialize(value):
+    """Ayrıştırılmış PDF değerini yeniden baytlara çevir"""
+    if isinstance(value, dict):
+        return b'<<' + b''.join(b'/%s %s' % (key.encode('latin-1'), serialize(item))
+                                for key, item in value.items()) + b'>>'
+    if isinstance(value, list):
+        return b'[' + b' '.join(serialize(item) for item in value) + b']'
+    if isinstance(value, Name):
+        return b'/' + value.encode('latin-1')
+    if isinstance(value, (bytes, bytearray)):
+        # Dizgiler parantez/köşeli ayraçlarıyla olduğu gibi saklanır
+        return bytes(value)
+    if isinstance(value, Ref):
+        return b'%d %d R' % value
+    if value is None:
+        return b'null'
+    if isinstance(value, bool):
+        return b'true' if value else b'false'
+    if isinstance(value, int):
+        return b'%d' % value
+    return _format_real(value).encode('ascii')
+
+
+def _unpredict(data, columns, colors=1, bits=8):
+    """PNG öngörücüsüyle (Predictor >= 10) kodlanmış satırları çöz"""
+    pixel = max(1, colors * bits // 8)
+    width = (columns * colors * bits + 7) // 8
+    out = bytearray()
+    previous = bytearray(width)
+    for pos in range(0, len(data), width + 1):
+        kind = data[pos]
+        row = bytearray(data[pos + 1:pos + 1 + width])
+        for i in range(len(row)):
+            left = row[i - pixel] if i >= pixel else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                corner = previous[i - pixel] if i >= pixel else 0
+                estimate = left + up - corner
+                pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - corner)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else corner)) & 0xFF
+            elif kind != 0:
+                raise BundleError(f'Bilinmeyen PNG öngörücüsü: {kind}')
+        out += row
+        previous = row
+    return bytes(out)
+
+
+def decode_stream(value, raw):
+    """Yalnızca Flate (ve PNG öngörücüsü) ile kodlanmış akışı çöz
+
+    xref ve nesne akışları için yeterlidir; içerik akışları hiç çözülmez.
+    """
+    filters = value.get('Filter')
+    if filters is None:
+        return bytes(raw)
+    if isinstance(filters, list):
+        if len(filters) != 1:
+            raise BundleError('Zincirlenmiş süzgeçli nesne akışı desteklenmiyor')
+        filters = filters[0]
+    if filters != 'FlateDecode':
+        raise BundleError(f'Desteklenmeyen akış süzgeci: {filters}')
+    data = zlib.decompress(raw)
+    params = value.get('DecodeParms')
+    if isinstance(params, list):
+        params = params[0]
+    predictor = params.get('Predictor', 1) if params else 1
+    if predictor >= 10:
+        return _unpredict(data, params.get('Columns', 1), params.get('Colors', 1),
+                          params.get('BitsPerComponent', 8))
+    if predictor != 1:
+        raise BundleError(f'Desteklenmeyen öngörücü: {predictor}')
+    return data
+
+
+class BundleSource(_SourcePDF):
+    """Her yapıdaki (xref akışı, nesne akışı, artımlı güncelleme) PDF'i okur
+
+    ``offsets`` değerleri dosya ofseti ya da nesne akışındaki yer için
+    (akış numarası, sıra) çiftidir.
+    """
+
+    def __init__(self, data):
+        self._streams = {}
+        _SourcePDF.__init__(self, data)
+
+    def _read_xref(self):
+        data = self.data
+        m = _STARTXREF.match(data, data.rfind(b'startxref'))
+        if m is None:
+            raise BundleError('startxref bulunamadı')
+        entries = {}
+        trailer = None
+        pos = int(m.group(1))
+        seen = set()
+        # En yeni bölümden eskiye: önce görülen girdi geçerlidir
+        while pos is not None and pos not in seen:
+            seen.add(pos)
+            if data[pos:pos + 4] == b'xref':
+                section = self._xref_table(pos, entries)
+                # Karma dosya: tablodaki eksikler xref akışında
+                if isinstance(section.get('XRefStm'), int):
+                    self._xref_stream(section['XRefStm'], entries)
+            else:
+                section = self._xref_stream(pos, entries)
+            if trailer is None:
+                trailer = section
+            pos = section.get('Prev')
+        if 'Encrypt' in trailer:
+            raise BundleError('Şifreli PDF desteklenmiyor')
+        return {num: where for num, where in entries.items() if where is not None}, trailer
+
+    def _xref_table(self, pos, entries):
+        data = self.data
+        pos += 4
+        while True:
+            pos = _SPACE.match(data, pos).end()
+            if data[pos:pos + 7] == b'trailer':
+                break
+            m = _XREF_SUBSECTION.match(data, pos)
+            if m is None:
+                raise BundleError(f'Bozuk xref tablosu: {pos}')
+            start, count = int(m.group(1)), int(m.group(2))
+            pos = m.end()
+            for number in range(start, start + count):
+                m = _XREF_ENTRY.match(data, pos)
+                if m is None:
+                    raise BundleError(f'Bozuk xref girdisi: {pos}')
+                pos = m.end()
+                entries.setdefault(number, int(m.group(1)) if m.group(3) == b'n' else None)
+        return parse_value(data, pos + 7)[0]
+
+    def _xref_stream(self, pos, entries):
+        obj = self._load(pos)
+        value = obj.value
+        if value.get('Type') != 'XRef':
+            raise BundleError(f'xref bulunamadı: {pos}')
+        rows = decode_stream(value, self.data[obj.stream_start:obj.stream_start + obj.stream_length])
+        widths = value['W']
+        index = value.get('Index', [0, value['Size']])
+        pos = 0
+        for start, count in zip(index[::2], index[1::2]):
+            for number in range(start, start + count):
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(rows[pos:pos + width], 'big'))
+                    pos += width
+                kind = fields[0] if widths[0] else 1
+                if kind == 1:
+                    entries.setdefault(number, fields[1])
+                elif kind == 2:
+                    entries.setdefault(number, (fields[1], fields[2]))
+                elif kind == 0:
+                    entries.setdefault(number, None)
+        if pos > len(rows):
+            raise BundleError('Bozuk xref akışı')
+        return value
+
+    def _load(self, offset, num=None):
+        data = self.data
+        m = _OBJ_HEADER.match(data, offset)
+        if m is None or (num is not None and int(m.group(1)) != num):
+            raise BundleError(f'{num}. nesne xref ofsetinde değil')
+        obj = _Object()
+        obj.start = m.end()
+        obj.value, obj.end = parse_value(data, obj.start)
+        obj.stream_start = None
+        pos = _SPACE.match(data, obj.end).end()
+        if data[pos:pos + 6] == b'stream':
+            pos += 6
+            pos += 2 if data[pos:pos + 2] == b'\r\n' else 1
+            obj.stream_start = pos
+            length = obj.value['Length']
+            # xref okunurken dolaylı uzunluk çözülemez; xref akışında doğrudan olmalı
+            obj.stream_length = self.resolve(length) if num is not None else length
+        return obj
+
+    def object(self, num):
+        obj = self._objects.get(num)
+        if obj is not None:
+            return obj
+        where = self.offsets[num]
+        if isinstance(where, tuple):
+            obj = self._compressed(num, *where)
+        else:
+            obj = self._load(where, num)
+        self._objects[num] = obj
+        return obj
+
+    def _compressed(self, num, stream_num, index):
+        streams = self._streams
+        if stream_num not in streams:
+            stream = self._load(self.offsets[stream_num], stream_num)
+            start = stream.stream_start
+            data = decode_stream(stream.value, self.data[start:start + stream.stream_length])
+            first = stream.value['First']
+            pairs = _OBJSTM_HEADER.findall(data[:first])
+            streams[stream_num] = data, first, [(int(n), int(off)) for n, off in pairs]
+        data, first, pairs = streams[stream_num]
+        if index >= len(pairs) or pairs[index][0] != num:
+            raise BundleError(f'{num}. nesne nesne akışında bulunamadı')
+        obj = _Object()
+        obj.start = first + pairs[index][1]
+        obj.value, obj.end = parse_value(data, obj.start)
+        obj.stream_start = None
+        return obj
+
+
+def _is_unique(value):
+    """Aynı içerikli kopyası olsa da paylaştırılmayacak nesne (açıklamalar sayfaya aittir)"""
+    return isinstance(value, dict) and ('Rect' in value or value.get('Type') == 'Annot')
+
+
+class PDFBundle:
+    """Evrakları tek PDF'te, nesnelerini kopyalayarak birleştirir
+
+    Her ``add`` çağrısı o evrakın sayfalarını ve ulaştıkları nesneleri
+    hemen ``target``'a yazar; ``close`` sayfa ağacını, yer imlerini ve xref
+    tablosunu ekler. Aynı içerikli nesneler (ör. iki evrakta birebir aynı
+    gömülü font veya görüntü) bir kez yazılır.
+    """
+
+    def __init__(self, target, title=None):
+        self.target = target
+        self.title = title
+        self.position = 0
+        self.offsets = [None] * FIRST_FREE
+        self.page_numbers = []
+        self.outline = []
+        self._digests = {}
+        self._write(HEADER)
+
+    def _write(self, data):
+        self.target.write(data)
+        self.position += len(data)
+
+    def _reserve(self):
+        self.offsets.append(None)
+        return len(self.offsets) - 1
+
+    def _write_object(self, number, value, source=None, obj=None):
+        self.offsets[number] = self.position
+        if obj is None or obj.stream_start is None:
+            self._write(b'%d 0 obj\n%s%s' % (number, serialize(value), OBJECT_TAIL))
+            return
+        self._write(b'%d 0 obj\n%s\nstream\n' % (number, serialize(value)))
+        start, end = obj.stream_start, obj.stream_start + obj.stream_length
+        while start < end:
+            chunk = min(COPY_CHUNK_SIZE, end - start)
+            self._write(source.data[start:start + chunk])
+            start += chunk
+        self._write(STREAM_TAIL)
+
+    def _copy_value(self, source, value, numbers, active):
+        if isinstance(value, Ref):
+            number = self._copy_object(source, value.num, numbers, active)
+            return Ref(number, 0) if number else None
+        if isinstance(value, dict):
+            return {key: self._copy_value(source, item, numbers, active) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._copy_value(source, item, numbers, active) for item in value]
+        return value
+
+    def _copy_object(self, source, num, numbers, active):
+        """Nesneyi (önce ulaştığı nesneleri) kopyala ve yeni numarasını döndür"""
+        if num in numbers:
+            return numbers[num]
+        if num not in source:
+            return None
+        if num in active:
+            # Döngü: numara şimdiden ayrılır, nesne tamamlanınca bu numarayla yazılır
+            numbers[num] = self._reserve()
+            return numbers[num]
+        obj = source.object(num)
+        value = obj.value
+        if obj.stream_start is not None:
+            value = {**value, 'Length': obj.stream_length}
+        active.add(num)
+        value = self._copy_value(source, value, numbers, active)
+        active.discard(num)
+
+        if num in numbers:
+            self._write_object(numbers[num], value, source, obj)
+            return numbers[num]
+        digest = None
+        if not _is_unique(value):
+            digest = hashlib.sha256(serialize(value))
+            if obj.stream_start is not None:
+                with memoryview(source.data) as view:
+                    digest.update(view[obj.stream_start:obj.stream_start + obj.stream_length])
+            digest = digest.digest()
+            if digest in self._digests:
+                numbers[num] = self._digests[digest]
+                return numbers[num]
+        numbers[num] = self._reserve()
+        self._write_object(numbers[num], value, source, obj)
+        if digest is not None:
+            self._digests[digest] = numbers[num]
+        return numbers[num]
+
+    def add_source(self, source, title):
+        """Okunmuş PDF'in tüm sayfalarını ekle; sayfa sayısını döndürür"""
+        pages, tree_nodes = source.pages()
+        if not pages:
+            return 0
+        numbers = {num: self._reserve() for num, _ in pages}
+        numbers.update((num, PAGES) for num in tree_nodes)
+        numbers[source.trailer['Root'].num] = CATALOG
+        active = set()
+        for num, inherited in pages:
+            page = {**inherited, **source.object(num).value}
+            for key in DROPPED_PAGE_KEYS:
+                page.pop(key, None)
+            page = self._copy_value(source, page, numbers, active)
+            page['Parent'] = Ref(PAGES, 0)
+            self._write_object(numbers[num], page)
+        first = len(self.page_numbers)
+        self.page_numbers.extend(numbers[num] for num, _ in pages)
+        self.outline.append((title, self.page_numbers[first]))
+        return len(pages)
+
+    def add(self, path, title=None):
+        """PDF dosyasını ekle (yer imi başlığı verilmezse dosya adı)"""
+        path = os.fspath(path)
+        if title is None:
+            title = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                return self.add_source(BundleSource(data), title)
+            except (LinearizeError, KeyError, IndexError, TypeError, AttributeError, zlib.error) as e:
+                # Yazılmış nesneler sahipsiz kalır; dosya yine geçerlidir
+                raise BundleError(f'Okunamayan PDF yapısı: {e}') from e
+
+    def close(self):
+        """Sayfa ağacı, yer imleri, katalog ve xref tablosunu yaz"""
+        items = [self._reserve() for _ in self.outline]
+        for i, (title, page) in enumerate(self.outline):
+            entry = {'Title': pdf_text(title).encode('latin-1'), 'Parent': Ref(OUTLINES, 0),
+                     'Dest': [Ref(page, 0), Name('Fit')]}
+            if i:
+                entry['Prev'] = Ref(items[i - 1], 0)
+            if i + 1 < len(items):
+                entry['Next'] = Ref(items[i + 1], 0)
+            self._write_object(items[i], entry)
+        outlines = {'Type': Name('Outlines'), 'Count': len(items)}
+        if items:
+            outlines.update(First=Ref(items[0], 0), Last=Ref(items[-1], 0))
+        self._write_object(OUTLINES, outlines)
+        self._write_object(PAGES, {'Type': Name('Pages'), 'Count': len(self.page_numbers),
+                                   'Kids': [Ref(n, 0) for n in self.page_numbers]})
+        self._write_object(CATALOG, {'Type': Name('Catalog'), 'Pages': Ref(PAGES, 0),
+                                     'Outlines': Ref(OUTLINES, 0), 'PageMode': Name('UseOutlines')})
+        info = {'Producer': pdf_text(PRODUCER).encode('latin-1')}
+        if self.title:
+            info['Title'] = pdf_text(self.title).encode('latin-1')
+        self._write_object(INFO, info)
+
+        xref_offset = self.position
+        self._write(b'xref\n0 %d\n0000000000 65535 f \n' % len(self.offsets))
+        # Ayrılıp yazılmamış numaralar (yarıda kalan evrak) boş girdidir
+        self._write(b''.join(b'%010d 00000 n \n' % offset if offset is not None
+                             else b'0000000000 65535 f \n' for offset in self.offsets[1:]))
+        self._write(b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            len(self.offsets), CATALOG, INFO, xref_offset))
+
+
+def bundle_files(paths, target, title=None):
+    """PDF'leri (yol veya (yol, başlık)) sırayla birleştirip ``target``'a yaz
+
+    Okunamayan evraklar atlanır; (eklenen evrak, toplam sayfa, hatalar) döner.
+    """
+    bundle = PDFBundle(target, title)
+    added, pages, errors = 0, 0, []
+    for item in paths:
+        path, item_title = item if isinstance(item, tuple) else (item, None)
+        try:
+            count = bundle.add(path, item_title)
+        # Yalnızca kaynağın hataları; hedefe yazılamıyorsa (ör. istemci gitti) iş durur
+        except (ValueError, FileNotFoundError, PermissionError, IsADirectoryError) as e:
+            errors.append((os.fspath(path), str(e)))
+            continue
+        if count:
+            added += 1
+            pages += count
+    bundle.close()
+    return added, pages, errors
+
+
+def main(argv=None, prog=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Evrakları tek PDF dava dosyasında birleştir')
+    parser.add_argument('evrak', nargs='+', help='Evrak kimliği (evraklar_pdf/<kimlik>.pdf) veya PDF yolu')
+    parser.add_argument('-o', '--output', default='dava_dosyasi.pdf', help="Çıktı PDF'i ('-': standart çıktı)")
+    parser.add_argument('--pdf-dir', default='evraklar_pdf', help='Evrak PDF klasörü')
+    parser.add_argument('--title', help='Dosya başlığı')
+    args = parser.parse_args(argv)
+
+    paths = []
+    for name in args.evrak:
+        path = name if os.path.isfile(name) else os.path.join(args.pdf_dir, name + '.pdf')
+        paths.append(path)
+
+    if args.output == '-':
+        added, pages, errors = bundle_files(paths, sys.stdout.buffer, args.title)
+    else:
+        with open(args.output, 'wb') as f:
+            added, pages, errors = bundle_files(paths, f, args.title)
+    for path, error in errors:
+        print(f"✗ {path}: {error}", file=sys.stderr)
+    print(f"✓ {added} evrak, {pages} sayfa -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
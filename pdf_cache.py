@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+class SingleFlight:
+    """Aynı anahtar için eşzamanlı çağrıları tek bir çalışmada birleştir
+
+    İlk gelen çağrı işi yapar; aynı anahtarla o sırada gelen diğerleri
+    bekler ve aynı sonucu (veya hatayı) alır.
+    """
+
+    class _Call:
+        __slots__ = ('event', 'result', 'error')
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """``fn``'i anahtar başına bir kez çalıştır, (sonuç, paylaşıldı mı) döndür"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+        else:
+            call.event.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+
+class PDFCache:
+    """Boyutu sınırlı, en az kullanılanı silen (LRU) disk önbelleği
+
+    Girdiler ``<anahtar>.pdf`` olarak saklanır. Sunucu yeniden
+    başladığında sıra dosyaların erişim zamanlarından kurulur.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Mevcut önbellek dosyalarını son erişim sırasıyla yükle"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.pdf'):
+                st = entry.stat()
+                files.append((max(st.st_atime, st.st_mtime), entry.name[:-4], st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self.total_bytes += size
+
+    def path_for(self, key):
+        return self.cache_dir / f'{key}.pdf'
+
+    def get(self, key):
+        """Önbellekteki dosyanın yolunu döndür ve en yeni kullanılan yap"""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            path = self.path_for(key)
+            if not path.exists():
+                self.total_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key, source_path):
+        """Hazır dosyayı önbelleğe taşı, gerekirse eski girdileri sil"""
+        path = self.path_for(key)
+        os.replace(source_path, path)
+        size = path.stat().st_size
+        with self._lock:
+            self.total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            # Yeni eklenen girdi, sınırı tek başına aşsa bile korunur
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old_size = self._entries.popitem(last=False)
+                self.total_bytes -= old_size
+                try:
+                    self.path_for(old_key).unlink()
+                except FileNotFoundError:
+                    pass
+        return path
+
+    def discard_document(self, doc_id):
+        """Kaynağı değişmiş bir evrakın eski sürümlerini sil
+
+        Anahtarlar ``<kimlik>-<parmak izi>`` biçimindedir; parmak izi ``-``
+        içermediğinden kimlik son ``-``'den öncesidir. Önek karşılaştırması
+        ``evrak_1`` için ``evrak_1-2``'nin girdilerini de silerdi.
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k.rpartition('-')[0] == doc_id]:
+                self.total_bytes -= self._entries.pop(key)
+                try:
+                    self.path_for(key).unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def source_fingerprint(source, renderer_version):
+    """Kaynak dosyanın durumundan türetilen kısa sürüm kimliği (ETag)"""
+    st = os.stat(source)
+    raw = f'{st.st_size}:{st.st_mtime_ns}:{renderer_version}'.encode()
+    return hashlib.sha1(raw).hexdigest()[:16]
@@ -0,0 +1,576 @@
+import mmap
+import os
+import re
+import zlib
+from collections import Counter, deque, namedtuple
+
+# Doğrusallaştırılmış ("hızlı web görünümü") PDF yazımı, PDF 1.7 Ek F.
+#
+# Dosya sırası: başlık, doğrusallaştırma sözlüğü, ilk sayfa xref tablosu,
+# katalog ve belge açılışı için gereken nesneler, ipucu akışı, ilk sayfanın
+# tüm nesneleri, diğer sayfaların kendi nesneleri (sayfa sırasıyla),
+# paylaşılan nesneler, geri kalanlar ve ana xref tablosu. Görüntüleyici
+# ilk birkaç KB ile ilk sayfanın nerede bittiğini (/E) öğrenir ve Range
+# istekleriyle yalnızca o kısmı indirip sayfayı gösterir.
+
+Ref = namedtuple('Ref', 'num gen')
+
+
+class Name(str):
+    """PDF adı (baştaki '/' olmadan)"""
+
+
+class LinearizeError(ValueError):
+    """PDF desteklenen yapıda değil (xref akışı, nesne akışı, şifreli, artımlı güncelleme)"""
+
+
+_WS = rb'\x00\t\n\f\r '
+_DELIMITERS = rb'()<>\[\]{}/%'
+_SPACE = re.compile(rb'(?:[' + _WS + rb']+|%[^\r\n]*)*')
+_REGULAR = re.compile(rb'[^' + _WS + _DELIMITERS + rb']*')
+_REF = re.compile(rb'(\d+)[' + _WS + rb']+(\d+)[' + _WS + rb']+R(?![^' + _WS + _DELIMITERS + rb'])')
+# Dizgi dışındaki dolaylı başvurular; sayının başka bir sözcüğün parçası olmaması gerekir
+_REF_OR_STRING = re.compile(rb'\(|(?<![^' + _WS + _DELIMITERS + rb'])' + _REF.pattern)
+_STRING_PART = re.compile(rb'\\.|[()]', re.S)
+_OBJ_HEADER = re.compile(rb'[' + _WS + rb']*(\d+)[' + _WS + rb']+(\d+)[' + _WS + rb']+obj')
+_XREF_SUBSECTION = re.compile(rb'(\d+)[' + _WS + rb']+(\d+)')
+_XREF_ENTRY = re.compile(rb'[' + _WS + rb']*(\d{10}) (\d{5}) ([nf])')
+_STARTXREF = re.compile(rb'startxref[' + _WS + rb']+(\d+)')
+
+# Belge açılırken okunan katalog girdileri (ilk sayfadan önce yazılır)
+OPEN_DOCUMENT_KEYS = ('ViewerPreferences', 'Threads', 'OpenAction', 'AcroForm')
+# Sayfa ağacında üst düğümden devralınabilen sayfa girdileri
+INHERITABLE_KEYS = ('Resources', 'MediaBox', 'CropBox', 'Rotate')
+
+# Paylaşılan nesne başvurularının kesir alanı kullanılmaz; payda yalnızca
+# tablo başlığı için gereklidir
+SHARED_DENOMINATOR = 4
+COPY_CHUNK_SIZE = 1024 * 1024
+STREAM_TAIL = b'\nendstream\nendobj\n'
+OBJECT_TAIL = b'\nendobj\n'
+
+
+def _string_end(data, pos):
+    """``pos``'taki '(' ile başlayan dizginin bitişi"""
+    depth = 0
+    for m in _STRING_PART.finditer(data, pos):
+        if m.group() == b'(':
+            depth += 1
+        elif m.group() == b')':
+            depth -= 1
+            if depth == 0:
+                return m.end()
+    raise LinearizeError(f'Kapanmamış dizgi: {pos}')
+
+
+def parse_value(data, pos):
+    """``pos``'tan başlayan PDF değerini oku: (değer, bitiş)"""
+    pos = _SPACE.match(data, pos).end()
+    head = data[pos:pos + 2]
+    if head == b'<<':
+        result = {}
+        pos += 2
+        while True:
+            pos = _SPACE.match(data, pos).end()
+            if data[pos:pos + 2] == b'>>':
+                return result, pos + 2
+            key, pos = parse_value(data, pos)
+            if not isinstance(key, Name):
+                raise LinearizeError(f'Sözlük anahtarı ad değil: {pos}')
+            result[key], pos = parse_value(data, pos)
+    first = head[:1]
+    if first == b'[':
+        items = []
+        pos += 1
+        while True:
+            pos = _SPACE.match(data, pos).end()
+            if data[pos:pos + 1] == b']':
+                return items, pos + 1
+            value, pos = parse_value(data, pos)
+            items.append(value)
+    if first == b'(':
+        end = _string_end(data, pos)
+        return data[pos:end], end
+    if first == b'<':
+        end = data.find(b'>', pos) + 1
+        return data[pos:end], end
+    if first == b'/':
+        m = _REGULAR.match(data, pos + 1)
+        return Name(m.group().decode('latin-1')), m.end()
+    m = _REF.match(data, pos)
+    if m:
+        return Ref(int(m.group(1)), int(m.group(2))), m.end()
+    m = _REGULAR.match(data, pos)
+    word = m.group()
+    for convert in (int, float):
+        try:
+            return convert(word), m.end()
+        except ValueError:
+            pass
+    keywords = {b'true': True, b'false': False, b'null': None}
+    if word not in keywords:
+        raise LinearizeError(f'Beklenmeyen sözcük {word!r}: {pos}')
+    return keywords[word], m.end()
+
+
+def _refs(value):
+    """Değerdeki dolaylı başvuruların nesne numaraları"""
+    if isinstance(value, Ref):
+        yield value.num
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _refs(item)
+
+
+def _rewrite_refs(text, numbers):
+    """Dizgilere dokunmadan başvuruları yeni numaralara çevir"""
+    out = []
+    pos = 0
+    while True:
+        m = _REF_OR_STRING.search(text, pos)
+        if m is None:
+            break
+        if m.group() == b'(':
+            end = _string_end(text, m.start())
+            out.append(text[pos:end])
+            pos = end
+            continue
+        out.append(text[pos:m.start()])
+        number = numbers.get(int(m.group(1)))
+        # Var olmayan nesneye başvuru PDF'te null demektir
+        out.append(b'%d 0 R' % number if number else b'null')
+        pos = m.end()
+    out.append(text[pos:])
+    return b''.join(out)
+
+
+def _nbits(value):
+    return max(value, 0).bit_length()
+
+
+class _BitWriter:
+    def __init__(self):
+        self.data = bytearray()
+        self._value = 0
+        self._bits = 0
+
+    def write(self, value, bits):
+        if not bits:
+            return
+        self._value = (self._value << bits) | value
+        self._bits += bits
+        while self._bits >= 8:
+            self._bits -= 8
+            self.data.append((self._value >> self._bits) & 0xFF)
+        self._value &= (1 << self._bits) - 1
+
+    def write_all(self, values, bits):
+        """Tablonun bir sütununu yaz; her sütun bayt sınırında başlar"""
+        for value in values:
+            self.write(value, bits)
+        self.flush()
+
+    def flush(self):
+        if self._bits:
+            self.data.append((self._value << (8 - self._bits)) & 0xFF)
+            self._value = 0
+            self._bits = 0
+
+
+class _Object:
+    __slots__ = ('value', 'start', 'end', 'stream_start', 'stream_length')
+
+
+class _SourcePDF:
+    """Klasik xref tablolu PDF'in nesnelerini gerektikçe okur"""
+
+    def __init__(self, data):
+        self.data = data
+        self.version = data[:data.find(b'\n')].strip()
+        if not self.version.startswith(b'%PDF-'):
+            raise LinearizeError('PDF başlığı yok')
+        self.offsets, self.trailer = self._read_xref()
+        self._objects = {}
+
+    def _read_xref(self):
+        data = self.data
+        m = _STARTXREF.match(data, data.rfind(b'startxref'))
+        if m is None:
+            raise LinearizeError('startxref bulunamadı')
+        pos = int(m.group(1))
+        if data[pos:pos + 4] != b'xref':
+            raise LinearizeError('Çapraz başvuru akışı desteklenmiyor')
+        pos += 4
+        offsets = {}
+        while True:
+            pos = _SPACE.match(data, pos).end()
+            if data[pos:pos + 7] == b'trailer':
+                break
+            m = _XREF_SUBSECTION.match(data, pos)
+            if m is None:
+                raise LinearizeError(f'Bozuk xref tablosu: {pos}')
+            start, count = int(m.group(1)), int(m.group(2))
+            pos = m.end()
+            for number in range(start, start + count):
+                m = _XREF_ENTRY.match(data, pos)
+                if m is None:
+                    raise LinearizeError(f'Bozuk xref girdisi: {pos}')
+                pos = m.end()
+                if m.group(3) == b'n':
+                    offsets[number] = int(m.group(1))
+        trailer, _ = parse_value(data, pos + 7)
+        if 'Prev' in trailer or 'XRefStm' in trailer:
+            raise LinearizeError('Artımlı güncellenmiş PDF desteklenmiyor')
+        if 'Encrypt' in trailer:
+            raise LinearizeError('Şifreli PDF desteklenmiyor')
+        return offsets, trailer
+
+    def __contains__(self, num):
+        return num in self.offsets
+
+    def object(self, num):
+        obj = self._objects.get(num)
+        if obj is not None:
+            return obj
+        data = self.data
+        m = _OBJ_HEADER.match(data, self.offsets[num])
+        if m is None or int(m.group(1)) != num:
+            raise LinearizeError(f'{num}. nesne xref ofsetinde değil')
+        obj = _Object()
+        obj.start = m.end()
+        obj.value, obj.end = parse_value(data, obj.start)
+        obj.stream_start = None
+        pos = _SPACE.match(data, obj.end).end()
+        if data[pos:pos + 6] == b'stream':
+            if obj.value.get('Type') in ('ObjStm', 'XRef'):
+                raise LinearizeError('Nesne akışı desteklenmiyor')
+            pos += 6
+            pos += 2 if data[pos:pos + 2] == b'\r\n' else 1
+            obj.stream_start = pos
+            obj.stream_length = self.resolve(obj.value['Length'])
+        self._objects[num] = obj
+        return obj
+
+    def resolve(self, value):
+        while isinstance(value, Ref):
+            value = self.object(value.num).value if value.num in self.offsets else None
+        return value
+
+    def closure(self, value, stop):
+        """Değerden ulaşılan nesneler (genişlik öncelikli sırayla); ``stop`` dışında"""
+        order = []
+        seen = set()
+        queue = deque(_refs(value))
+        while queue:
+            num = queue.popleft()
+            if num in seen or num in stop or num not in self.offsets:
+                continue
+            seen.add(num)
+            order.append(num)
+            queue.extend(_refs(self.object(num).value))
+        return order
+
+    def pages(self):
+        """(sayfa numarası, devralınan girdiler) listesi ve sayfa ağacı düğümleri"""
+        root = self.resolve(self.trailer['Root'])
+        pages, nodes = [], set()
+        stack = [(root['Pages'], {})]
+        while stack:
+            ref, inherited = stack.pop()
+            if not isinstance(ref, Ref) or ref.num in nodes:
+                raise LinearizeError('Sayfa ağacı bozuk')
+            node = self.object(ref.num).value
+            if node.get('Type') == 'Pages' or 'Kids' in node:
+                nodes.add(ref.num)
+                inherited = {**inherited, **{key: node[key] for key in INHERITABLE_KEYS if key in node}}
+                kids = self.resolve(node['Kids'])
+                stack.extend((kid, inherited) for kid in reversed(kids))
+            else:
+                own = {key: value for key, value in inherited.items() if key not in node}
+                pages.append((ref.num, own))
+        return pages, nodes
+
+
+class _Plan:
+    """Nesnelerin bölümlere ayrılması ve yeni numaraları"""
+
+    def __init__(self, pdf):
+        self.pdf = pdf
+        pages, tree_nodes = pdf.pages()
+        if not pages:
+            raise LinearizeError('Sayfa yok')
+        page_numbers = {num for num, _ in pages}
+        catalog_num = pdf.trailer['Root'].num
+        catalog = pdf.object(catalog_num).value
+        stop = page_numbers | tree_nodes | {catalog_num}
+
+        # Belge açılışı: katalog ve açılışta okunan girdileri
+        keys = list(OPEN_DOCUMENT_KEYS)
+        if catalog.get('PageMode') == 'UseOutlines':
+            keys.append('Outlines')
+        self.open_document = [catalog_num] + pdf.closure([catalog[key] for key in keys if key in catalog], stop)
+        opening = set(self.open_document)
+
+        # Her sayfanın ihtiyaç duyduğu nesneler (sayfa nesnesi başta)
+        needed = []
+        for num, inherited in pages:
+            page = {key: value for key, value in pdf.object(num).value.items() if key != 'Parent'}
+            objects = [num] + pdf.closure([page, inherited], stop)
+            needed.append([n for n in objects if n not in opening])
+
+        self.first_page = needed[0]
+        in_first = set(self.first_page)
+        users = Counter(n for objects in needed[1:] for n in set(objects) if n not in in_first)
+        self.private = [[n for n in objects if n not in in_first and users[n] == 1] for objects in needed[1:]]
+        self.shared = list(dict.fromkeys(n for objects in needed[1:] for n in objects if users[n] > 1))
+        self.page_needs = needed
+
+        placed = opening | in_first | set(self.shared)
+        placed.update(n for objects in self.private for n in objects)
+        everything = pdf.closure([pdf.trailer.get('Root'), pdf.trailer.get('Info')], set())
+        self.other = [n for n in everything if n not in placed]
+
+        # Ana xref'tekiler 1..m, ilk sayfa bölümü m+1..n
+        low = [n for objects in self.private for n in objects] + self.shared + self.other
+        self.numbers = {num: i for i, num in enumerate(low, 1)}
+        self.first_section_start = len(low) + 1
+        next_number = self.first_section_start
+        self.lindict_number = next_number
+        next_number += 1
+        for num in self.open_document:
+            self.numbers[num] = next_number
+            next_number += 1
+        self.hint_number = next_number
+        next_number += 1
+        for num in self.first_page:
+            self.numbers[num] = next_number
+            next_number += 1
+        self.size = next_number
+
+    def content_stream(self, page_num):
+        """Sayfanın ilk içerik akışının nesne numarası"""
+        contents = self.pdf.object(page_num).value.get('Contents')
+        if isinstance(contents, Ref):
+            target = self.pdf.resolve(contents)
+            if isinstance(target, list):
+                contents = target
+        if isinstance(contents, list):
+            contents = contents[0] if contents else None
+        return contents.num if isinstance(contents, Ref) else None
+
+
+class _Layout:
+    """Nesne baytları ve ofsetleri; ipucu akışı yokmuş gibi hesaplanır"""
+
+    def __init__(self, plan):
+        self.plan = plan
+        pdf = plan.pdf
+        self.pieces = {}
+        self.lengths = {}
+        for num, new in plan.numbers.items():
+            obj = pdf.object(num)
+            text = _rewrite_refs(bytes(pdf.data[obj.start:obj.end]), plan.numbers).strip()
+            if obj.stream_start is None:
+                head = b'%d 0 obj\n%s%s' % (new, text, OBJECT_TAIL)
+                self.lengths[num] = len(head)
+            else:
+                head = b'%d 0 obj\n%s\nstream\n' % (new, text)
+                self.lengths[num] = len(head) + obj.stream_length + len(STREAM_TAIL)
+            self.pieces[num] = head
+
+    def physical_order(self):
+        plan = self.plan
+        return (plan.open_document, plan.first_page,
+                [n for objects in plan.private for n in objects], plan.shared, plan.other)
+
+
+def _hint_stream(plan, layout, offsets, first_page_end):
+    """Sayfa ofset ve paylaşılan nesne ipucu tablolarını üret: (veri, /S)"""
+    lengths = layout.lengths
+    sections = [plan.first_page] + plan.private
+    shared_table = plan.first_page + plan.shared
+    shared_index = {num: i for i, num in enumerate(shared_table)}
+
+    page_offsets = [offsets[objects[0]] for objects in sections]
+    page_lengths = [first_page_end - page_offsets[0]]
+    page_lengths += [sum(lengths[n] for n in objects) for objects in plan.private]
+    object_counts = [len(objects) for objects in sections]
+    shared_refs = [[]] + [
+        [shared_index[n] for n in needs if n in shared_index]
+        for needs in plan.page_needs[1:]
+    ]
+    content_offsets, content_lengths = [], []
+    for objects, start in zip(sections, page_offsets):
+        content = plan.content_stream(objects[0])
+        if content in objects:
+            content_offsets.append(offsets[content] - start)
+            content_lengths.append(lengths[content])
+        else:
+            content_offsets.append(0)
+            content_lengths.append(0)
+
+    w = _BitWriter()
+    min_objects, min_length = min(object_counts), min(page_lengths)
+    min_content_offset, min_content_length = min(content_offsets), min(content_lengths)
+    bits_objects = _nbits(max(object_counts) - min_objects)
+    bits_length = _nbits(max(page_lengths) - min_length)
+    bits_content_offset = _nbits(max(content_offsets) - min_content_offset)
+    bits_content_length = _nbits(max(content_lengths) - min_content_length)
+    bits_shared_count = _nbits(max(len(refs) for refs in shared_refs))
+    bits_shared_id = _nbits(len(shared_table) - 1)
+    for value, bits in ((min_objects, 32), (page_offsets[0], 32), (bits_objects, 16),
+                        (min_length, 32), (bits_length, 16),
+                        (min_content_offset, 32), (bits_content_offset, 16),
+                        (min_content_length, 32), (bits_content_length, 16),
+                        (bits_shared_count, 16), (bits_shared_id, 16),
+                        (0, 16), (SHARED_DENOMINATOR, 16)):
+        w.write(value, bits)
+    w.write_all((count - min_objects for count in object_counts), bits_objects)
+    w.write_all((length - min_length for length in page_lengths), bits_length)
+    w.write_all((len(refs) for refs in shared_refs), bits_shared_count)
+    w.write_all((i for refs in shared_refs for i in refs), bits_shared_id)
+    # Kesir payları: sütun yalnızca bayt sınırına hizalanır (0 bit)
+    w.flush()
+    w.write_all((offset - min_content_offset for offset in content_offsets), bits_content_offset)
+    w.write_all((length - min_content_length for length in content_lengths), bits_content_length)
+
+    shared_start = len(w.data)
+    group_lengths = [lengths[n] for n in shared_table]
+    min_group = min(group_lengths)
+    bits_group = _nbits(max(group_lengths) - min_group)
+    first_shared = plan.shared[0] if plan.shared else None
+    for value, bits in ((plan.numbers[first_shared] if first_shared else 0, 32),
+                        (offsets[first_shared] if first_shared else 0, 32),
+                        (len(plan.first_page), 32), (len(shared_table), 32),
+                        (0, 16), (min_group, 32), (bits_group, 16)):
+        w.write(value, bits)
+    w.write_all((length - min_group for length in group_lengths), bits_group)
+    # MD5 imzası yok; her grup tek nesnedir
+    w.write_all((0 for _ in shared_table), 1)
+    return bytes(w.data), shared_start
+
+
+def _write_linearized(pdf, target):
+    plan = _Plan(pdf)
+    layout = _Layout(plan)
+    numbers = plan.numbers
+    data = pdf.data
+
+    trailer = pdf.trailer
+    extra = b''
+    if isinstance(trailer.get('Info'), Ref) and trailer['Info'].num in numbers:
+        extra += b' /Info %d 0 R' % numbers[trailer['Info'].num]
+    if isinstance(trailer.get('ID'), list):
+        extra += b' /ID [' + b' '.join(trailer['ID']) + b']'
+
+    header = pdf.version + b'\n%\xe2\xe3\xcf\xd3\n'
+    first_count = plan.size - plan.first_section_start
+    main_count = plan.first_section_start
+
+    def lindict(length, hint_offset, hint_length, first_page_end, main_entry):
+        return b'%d 0 obj\n<< /Linearized 1 /L %010d /H [ %010d %010d ] /O %d /E %010d /N %d /T %010d >>%s' % (
+            plan.lindict_number, length, hint_offset, hint_length, numbers[plan.first_page[0]],
+            first_page_end, len(plan.page_needs), main_entry, OBJECT_TAIL)
+
+    def first_xref(entries, main_offset):
+        return (b'xref\n%d %d\n' % (plan.first_section_start, first_count)
+                + b''.join(b'%010d 00000 n \n' % offset for offset in entries)
+                + b'trailer\n<< /Size %d /Root %d 0 R%s /Prev %010d >>\nstartxref\n0\n%%%%EOF\n' % (
+                    plan.size, numbers[trailer['Root'].num], extra, main_offset))
+
+    main_head = b'xref\n0 %d\n' % main_count
+
+    # 1. geçiş: ipucu akışı yokmuş gibi ofsetler (ipucu tabloları bu ofsetleri kullanır)
+    open_document, first_page, private, shared, other = layout.physical_order()
+    offsets = {}
+    pos = len(header) + len(lindict(0, 0, 0, 0, 0)) + len(first_xref([0] * first_count, 0))
+    for num in open_document:
+        offsets[num] = pos
+        pos += layout.lengths[num]
+    hint_offset = pos
+    for num in first_page:
+        offsets[num] = pos
+        pos += layout.lengths[num]
+    first_page_end = pos
+    for section in (private, shared, other):
+        for num in section:
+            offsets[num] = pos
+            pos += layout.lengths[num]
+    main_offset = pos
+
+    hint_data, shared_start = _hint_stream(plan, layout, offsets, first_page_end)
+    hint_data = zlib.compress(hint_data)
+    hint_object = b'%d 0 obj\n<< /Filter /FlateDecode /S %d /Length %d >>\nstream\n%s%s' % (
+        plan.hint_number, shared_start, len(hint_data), hint_data, STREAM_TAIL)
+
+    # 2. geçiş: ipucu akışından sonraki her şey onun boyu kadar kayar
+    shift = len(hint_object)
+    for num in offsets:
+        if offsets[num] >= hint_offset:
+            offsets[num] += shift
+    first_page_end += shift
+    main_offset += shift
+    trailer_bytes = b'trailer\n<< /Size %d >>\nstartxref\n%d\n%%%%EOF\n' % (
+        main_count, len(header) + len(lindict(0, 0, 0, 0, 0)))
+    file_length = main_offset + len(main_head) + 20 * main_count + len(trailer_bytes)
+
+    by_number = {new: offsets[num] for num, new in numbers.items()}
+    by_number[plan.lindict_number] = len(header)
+    by_number[plan.hint_number] = hint_offset
+    first_entries = [by_number[n] for n in range(plan.first_section_start, plan.size)]
+
+    target.write(header)
+    target.write(lindict(file_length, hint_offset, shift, first_page_end, main_offset + len(main_head) - 1))
+    target.write(first_xref(first_entries, main_offset))
+    for section in (open_document, [None], first_page, private, shared, other):
+        for num in section:
+            if num is None:
+                target.write(hint_object)
+                continue
+            target.write(layout.pieces[num])
+            obj = pdf.object(num)
+            if obj.stream_start is None:
+                continue
+            start, end = obj.stream_start, obj.stream_start + obj.stream_length
+            while start < end:
+                chunk = min(COPY_CHUNK_SIZE, end - start)
+                target.write(data[start:start + chunk])
+                start += chunk
+            target.write(STREAM_TAIL)
+    target.write(main_head + b'0000000000 65535 f \n')
+    target.write(b''.join(b'%010d 00000 n \n' % by_number[n] for n in range(1, main_count)))
+    target.write(trailer_bytes)
+
+
+def is_linearized(path):
+    """Dosyanın ilk nesnesi doğrusallaştırma sözlüğü mü?"""
+    with open(path, 'rb') as f:
+        head = f.read(1024)
+    return b'/Linearized' in head
+
+
+def linearize_file(path):
+    """PDF'i yerinde doğrusallaştır (geçici dosya + atomik yer değiştirme)
+
+    Zaten doğrusalsa dokunmaz ve False döndürür. Desteklenmeyen yapıda
+    (xref akışı, şifreli vb.) ``LinearizeError`` verir; dosya değişmez.
+    """
+    path = os.fspath(path)
+    if is_linearized(path):
+        return False
+    tmp_path = os.path.join(os.path.dirname(path) or '.', f'.{os.path.basename(path)}.{os.getpid()}.lin')
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            with open(tmp_path, 'wb') as target:
+                _write_linearized(_SourcePDF(data), target)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
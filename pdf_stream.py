@@ -0,0 +1,302 @@
+import codecs
+import zlib
+from array import array
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.rl_accel import escapePDF, fp_str
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import FF_NONSYMBOLIC, FF_SYMBOLIC, SUBSETN, TTFont, makeToUnicodeCMap
+
+# Sonda yazılan sabit nesneler; sayfalar bunlara baştan numarayla başvurur
+CATALOG, PAGES, RESOURCES, INFO, FONTS = 1, 2, 3, 4, 5
+FIRST_FREE = 6
+
+PRODUCER = 'create_professional_pdf (akış modu)'
+
+# Hazır kodlanmış görüntü verisi bu boyutta parçalarla kopyalanır
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def pdf_text(value):
+    """Bilgi sözlüğü için PDF metin dizgisi (gerekirse UTF-16)"""
+    try:
+        raw = value.encode('latin-1')
+    except UnicodeEncodeError:
+        raw = codecs.BOM_UTF16_BE + value.encode('utf-16-be')
+    return '(' + escapePDF(raw) + ')'
+
+
+class _FontEntry:
+    """Belgede kullanılan bir fontun kaynak adı ve alt küme durumu"""
+
+    __slots__ = ('font', 'index', 'truetype')
+
+    def __init__(self, font, index):
+        self.font = font
+        self.index = index
+        self.truetype = isinstance(font, TTFont)
+
+    def resource(self, subset):
+        return f'F{self.index}' if not self.truetype else f'F{self.index}S{subset}'
+
+    def split(self, text, doc):
+        """Metni (kaynak adı, kodlanmış bayt) parçalarına ayır"""
+        if not self.truetype:
+            return [(self.resource(0), text.encode('cp1252', 'replace'))]
+        return [(self.resource(subset), data) for subset, data in self.font.splitString(text, doc)]
+
+
+class StreamingTextObject:
+    """``canvas.beginText`` karşılığı: setFont, textOut, textLine"""
+
+    def __init__(self, canvas, x, y):
+        self._canvas = canvas
+        self._code = [f'BT 1 0 0 1 {fp_str(x, y)} Tm']
+        self._entry = None
+        self._size = None
+        self._current = None
+
+    def setFont(self, name, size, leading=None):
+        self._entry = self._canvas._font(name)
+        self._size = size
+        self._current = None
+        if leading is not None:
+            self._code.append(f'{fp_str(leading)} TL')
+
+    def textOut(self, text):
+        code = self._code
+        for resource, data in self._entry.split(text, self._canvas):
+            if resource != self._current:
+                code.append(f'/{resource} {fp_str(self._size)} Tf')
+                self._current = resource
+            code.append(f'({escapePDF(data)}) Tj')
+
+    def textLine(self, text=''):
+        if text:
+            self.textOut(text)
+        self._code.append('T*')
+
+
+class StreamingCanvas:
+    """Sayfaları tamamlandıkça dosyaya yazan PDF tuvali
+
+    reportlab ``Canvas``'ının hızlı çizicilerin kullandığı alt kümesini
+    (metin, çizgi, sayfa geçişi, hazır kodlanmış görüntü) sağlar. ``Canvas``
+    tüm sayfaları ``save`` çağrılana kadar bellekte tutar; burada her sayfa
+    ``showPage`` ile sıkıştırılıp yazılır ve bellekte yalnızca nesne
+    ofsetleri kalır. Font alt kümeleri belge sonunda, kullanılan karakterlere
+    göre gömülür.
+    """
+
+    def __init__(self, target, pagesize=A4, pageCompression=1, initialFontName=None):
+        # ``initialFontName`` yalnızca Canvas uyumluluğu içindir: sayfalar
+        # başlangıç fontu seçmez, yalnızca kullanılan fontlar gömülür
+        if hasattr(target, 'write'):
+            self._file, self._owns_file = target, False
+        else:
+            self._file, self._owns_file = open(target, 'wb'), True
+        self._pagesize = pagesize
+        self._compress = bool(pageCompression)
+        self._offset = 0
+        self._offsets = array('q', [0] * FIRST_FREE)
+        self._pages = array('q')
+        self._fonts = {}
+        self._image_count = 0
+        self._page_images = []
+        self._title = None
+        self._code = []
+        self._font_name = None
+        self._font_size = None
+        self._write(b'%PDF-1.4\n%\x93\x8c\x8b\x9e\n')
+
+    def _write(self, data):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def _new_object(self):
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write_object(self, number, body):
+        self._offsets[number] = self._offset
+        self._write(f'{number} 0 obj\n'.encode('latin-1') + body + b'\nendobj\n')
+
+    def _write_stream(self, number, data, extra=''):
+        if self._compress:
+            data = zlib.compress(data)
+            extra += ' /Filter /FlateDecode'
+        head = f'<< /Length {len(data)}{extra} >>\nstream\n'.encode('latin-1')
+        self._write_object(number, head + data + b'\nendstream')
+
+    def _font(self, name):
+        entry = self._fonts.get(name)
+        if entry is None:
+            entry = self._fonts[name] = _FontEntry(pdfmetrics.getFont(name), len(self._fonts) + 1)
+        return entry
+
+    def setTitle(self, title):
+        self._title = title
+
+    def setPageSize(self, size):
+        """Bundan sonra gösterilecek sayfaların boyutu"""
+        self._pagesize = size
+
+    def setFont(self, name, size, leading=None):
+        self._font_name = name
+        self._font_size = size
+
+    def stringWidth(self, text, name=None, size=None):
+        return pdfmetrics.stringWidth(text, name or self._font_name, size or self._font_size)
+
+    def drawString(self, x, y, text):
+        t = self.beginText(x, y)
+        t.setFont(self._font_name, self._font_size)
+        t.textOut(text)
+        self.drawText(t)
+
+    def drawRightString(self, x, y, text):
+        self.drawString(x - self.stringWidth(text), y, text)
+
+    def line(self, x1, y1, x2, y2):
+        self._code.append(f'{fp_str(x1, y1)} m {fp_str(x2, y2)} l S')
+
+    def beginText(self, x=0, y=0):
+        return StreamingTextObject(self, x, y)
+
+    def drawText(self, text_object):
+        self._code.extend(text_object._code)
+        self._code.append('ET')
+
+    def writeImage(self, header, data, length=None):
+        """Kodlanmış görüntüyü XObject olarak hemen yaz, kaynak adını döndür
+
+        ``header`` görüntü sözlüğünün girdileridir (``/Width``, ``/Filter``
+        ...); veri yeniden kodlanmaz. ``data`` bayt dizisi ya da ``length``
+        bayt okunacak açık bir dosyadır (büyük JPEG'ler parça parça kopyalanır).
+        """
+        number = self._new_object()
+        if length is None:
+            length = len(data)
+        self._offsets[number] = self._offset
+        self._write((
+            f'{number} 0 obj\n<< /Type /XObject /Subtype /Image {header} /Length {length} >>\nstream\n'
+        ).encode('latin-1'))
+        if isinstance(data, bytes):
+            self._write(data)
+        else:
+            remaining = length
+            while remaining > 0:
+                chunk = data.read(min(COPY_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError('Görüntü verisi beklenenden kısa')
+                self._write(chunk)
+                remaining -= len(chunk)
+        self._write(b'\nendstream\nendobj\n')
+        self._image_count += 1
+        name = f'Im{self._image_count}'
+        self._page_images.append((name, number))
+        return name
+
+    def drawImageObject(self, name, x, y, width, height):
+        """Bu sayfada ``writeImage`` ile yazılmış görüntüyü verilen kutuya çiz"""
+        self._code.append(f'q {fp_str(width)} 0 0 {fp_str(height)} {fp_str(x, y)} cm /{name} Do Q')
+
+    def showPage(self):
+        """Sayfayı yaz ve belleği boşalt"""
+        content = self._new_object()
+        page = self._new_object()
+        self._write_stream(content, '\n'.join(self._code).encode('latin-1'))
+        width, height = self._pagesize
+        resources = f'{RESOURCES} 0 R'
+        if self._page_images:
+            # Görüntüler yalnızca kendi sayfasının kaynaklarında yer alır; ortak
+            # sözlükte toplanırsa her sayfa (doğrusal PDF'te ilk sayfa) hepsine bağlanır
+            images = ' '.join(f'/{name} {number} 0 R' for name, number in self._page_images)
+            resources = f'<< /Font {FONTS} 0 R /XObject << {images} >> /ProcSet [/PDF /Text /ImageB /ImageC] >>'
+        self._write_object(page, (
+            f'<< /Type /Page /Parent {PAGES} 0 R /MediaBox [0 0 {fp_str(width, height)}] '
+            f'/Resources {resources} /Contents {content} 0 R >>'
+        ).encode('latin-1'))
+        self._pages.append(page)
+        self._code = []
+        self._page_images = []
+
+    def getPageNumber(self):
+        return len(self._pages) + 1
+
+    def save(self):
+        """Son sayfayı, fontları ve çapraz başvuru tablosunu yazıp kapat"""
+        if self._code or not self._pages:
+            self.showPage()
+
+        fonts = []
+        for entry in self._fonts.values():
+            if entry.truetype:
+                fonts += self._write_truetype(entry)
+            else:
+                number = self._new_object()
+                self._write_object(number, (
+                    f'<< /Type /Font /Subtype /Type1 /BaseFont /{entry.font.face.name} '
+                    f'/Encoding /WinAnsiEncoding >>'
+                ).encode('latin-1'))
+                fonts.append((entry.resource(0), number))
+
+        font_dict = ' '.join(f'/{name} {number} 0 R' for name, number in fonts)
+        self._write_object(FONTS, f'<< {font_dict} >>'.encode('latin-1'))
+        self._write_object(RESOURCES, f'<< /Font {FONTS} 0 R /ProcSet [/PDF /Text] >>'.encode('latin-1'))
+        kids = ' '.join(f'{page} 0 R' for page in self._pages)
+        self._write_object(PAGES, f'<< /Type /Pages /Count {len(self._pages)} /Kids [{kids}] >>'.encode('latin-1'))
+        self._write_object(CATALOG, f'<< /Type /Catalog /Pages {PAGES} 0 R >>'.encode('latin-1'))
+        info = f'/Producer {pdf_text(PRODUCER)}'
+        if self._title:
+            info += f' /Title {pdf_text(self._title)}'
+        self._write_object(INFO, f'<< {info} >>'.encode('latin-1'))
+
+        xref = self._offset
+        lines = [f'xref\n0 {len(self._offsets)}\n', '0000000000 65535 f \n']
+        lines += [f'{offset:010d} 00000 n \n' for offset in self._offsets[1:]]
+        self._write(''.join(lines).encode('latin-1'))
+        self._write((
+            f'trailer\n<< /Size {len(self._offsets)} /Root {CATALOG} 0 R /Info {INFO} 0 R >>\n'
+            f'startxref\n{xref}\n%%EOF\n'
+        ).encode('latin-1'))
+        if self._owns_file:
+            self._file.close()
+
+    def _write_truetype(self, entry):
+        """Kullanılan her 256 karakterlik alt küme için font nesnelerini yaz"""
+        font = entry.font
+        face = font.face
+        # Alt küme durumu TTFont içinde belgeye göre tutulur; işi biten belgeninki atılır
+        state = font.state.pop(self, None)
+        subsets = state.subsets if state is not None else []
+        written = []
+        for n, subset in enumerate(subsets):
+            base_name = (SUBSETN(n) + b'+' + face.name + face.subfontNameX).decode('latin-1')
+
+            font_file = self._new_object()
+            data = face.makeSubset(subset)
+            self._write_stream(font_file, data, f' /Length1 {len(data)}')
+
+            descriptor = self._new_object()
+            flags = (face.flags & ~FF_NONSYMBOLIC) | FF_SYMBOLIC
+            self._write_object(descriptor, (
+                f'<< /Type /FontDescriptor /FontName /{base_name} /Flags {flags} '
+                f'/FontBBox [{fp_str(*face.bbox)}] /ItalicAngle {fp_str(face.italicAngle)} '
+                f'/Ascent {fp_str(face.ascent)} /Descent {fp_str(face.descent)} '
+                f'/CapHeight {fp_str(face.capHeight)} /StemV {fp_str(face.stemV)} '
+                f'/MissingWidth {fp_str(face.defaultWidth)} /FontFile2 {font_file} 0 R >>'
+            ).encode('latin-1'))
+
+            to_unicode = self._new_object()
+            self._write_stream(to_unicode, makeToUnicodeCMap(base_name, subset).encode('latin-1'))
+
+            number = self._new_object()
+            widths = ' '.join(fp_str(face.getCharWidth(code)) for code in subset)
+            self._write_object(number, (
+                f'<< /Type /Font /Subtype /TrueType /BaseFont /{base_name} '
+                f'/FirstChar 0 /LastChar {len(subset) - 1} /Widths [{widths}] '
+                f'/FontDescriptor {descriptor} 0 R /ToUnicode {to_unicode} 0 R >>'
+            ).encode('latin-1'))
+            written.append((entry.resource(n), number))
+        return written
@@ -0,0 +1,248 @@
+import contextlib
+import functools
+import os
+import shutil
+import subprocess
+
+from reportlab import rl_config
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from font_subset import CompactTTFont
+
+FONT_NAME = 'Turkish'
+FONT_BOLD = 'Turkish-Bold'
+# Küçük çıktı profilinin fontları ayrı adlarla kaydedilir; iki profil aynı
+# süreçte birbirini etkilemeden kullanılabilir
+COMPACT_SUFFIX = '-Compact'
+
+# Türkçe karakter içeren font adayları (normal, kalın) - öncelik sırasıyla
+FONT_CANDIDATES = [
+    ('C:/Windows/Fonts/arial.ttf', 'C:/Windows/Fonts/arialbd.ttf'),
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+     '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/dejavu/DejaVuSans.ttf',
+     '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+     '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf'),
+    ('/usr/share/fonts/liberation-sans/LiberationSans-Regular.ttf',
+     '/usr/share/fonts/liberation-sans/LiberationSans-Bold.ttf'),
+    ('/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf',
+     '/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf'),
+    ('/Library/Fonts/Arial.ttf', '/Library/Fonts/Arial Bold.ttf'),
+    ('/System/Library/Fonts/Supplemental/Arial.ttf',
+     '/System/Library/Fonts/Supplemental/Arial Bold.ttf'),
+]
+
+# Fontun Türkçe metni çizebilmesi için gereken karakterler
+TURKISH_CHARS = 'çÇğĞıİöÖşŞüÜ'
+
+
+def _fc_match(pattern):
+    """fontconfig ile desene uyan TTF dosyasını bul"""
+    if not shutil.which('fc-match'):
+        return None
+    try:
+        path = subprocess.run(
+            ['fc-match', '-f', '%{file}', pattern],
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return path if path.lower().endswith('.ttf') and os.path.exists(path) else None
+
+
+def font_candidates():
+    """Denenecek (normal, kalın) font yolu çiftleri"""
+    # Ortam değişkeni ile açıkça verilen font her zaman önce denenir
+    if os.environ.get('EVRAK_FONT'):
+        yield os.environ['EVRAK_FONT'], os.environ.get('EVRAK_FONT_BOLD', os.environ['EVRAK_FONT'])
+    yield from FONT_CANDIDATES
+    regular = _fc_match('sans-serif:lang=tr:style=Regular')
+    if regular:
+        yield regular, _fc_match('sans-serif:lang=tr:style=Bold') or regular
+
+
+def covers_turkish(font):
+    """Font, Türkçe karakterlerin tamamı için glif içeriyor mu?"""
+    char_to_glyph = font.face.charToGlyph
+    return all(ord(ch) in char_to_glyph for ch in TURKISH_CHARS)
+
+
+def _register_font(font):
+    # Aynı adla ikinci kayıt ilkini değiştirmez; yüz adları ayrı olduğundan
+    # (bkz. ``CompactTTFont``) iki profilin fontları birbirine eşlenmez
+    if font.fontName not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(font)
+
+
+def register_fonts(compact=False):
+    """Türkçe destekli fontu bul ve bir kez kaydet
+
+    (normal, kalın, dosya yolu) döndürür. Uygun TTF bulunamazsa Türkçe
+    karakterleri eksik çizen Helvetica'ya düşülür. ``compact=True`` ile
+    fontlar ad tablosu ve ipuçları atılarak gömülür (``font_subset``).
+    """
+    font_class = CompactTTFont if compact else TTFont
+    suffix = COMPACT_SUFFIX if compact else ''
+    font_name, font_bold = FONT_NAME + suffix, FONT_BOLD + suffix
+    for regular_path, bold_path in font_candidates():
+        if not os.path.exists(regular_path):
+            continue
+        try:
+            regular = font_class(font_name, regular_path)
+            if not covers_turkish(regular):
+                continue
+            bold = font_class(font_bold, bold_path if os.path.exists(bold_path) else regular_path)
+        except Exception:
+            continue
+        _register_font(regular)
+        _register_font(bold)
+        # <b> etiketlerinin kalın fonta eşlenmesi için aile kaydı
+        pdfmetrics.registerFontFamily(
+            font_name, normal=font_name, bold=font_bold, italic=font_name, boldItalic=font_bold
+        )
+        return font_name, font_bold, regular_path
+
+    print("⚠️  Türkçe destekli TTF font bulunamadı, Helvetica kullanılıyor (EVRAK_FONT ile belirtin)")
+    return 'Helvetica', 'Helvetica-Bold', None
+
+
+def build_styles(font_name, font_bold):
+    """Tüm dönüştürücülerin kullandığı paragraf stilleri"""
+    styles = getSampleStyleSheet()
+
+    # create_professional_pdf stilleri
+    styles.add(ParagraphStyle(
+        name='EvrakTitle',
+        parent=styles['Heading1'],
+        fontName=font_bold,
+        fontSize=14,
+        textColor=colors.HexColor('#1a1a1a'),
+        alignment=TA_CENTER,
+        spaceAfter=20,
+        spaceBefore=10
+    ))
+    styles.add(ParagraphStyle(
+        name='EvrakNormal',
+        parent=styles['Normal'],
+        fontName=font_name,
+        fontSize=10,
+        textColor=colors.HexColor('#333333'),
+        alignment=TA_LEFT,
+        spaceAfter=8,
+        leading=14
+    ))
+    styles.add(ParagraphStyle(
+        name='EvrakEmphasis',
+        parent=styles['EvrakNormal'],
+        fontName=font_bold,
+        fontSize=11,
+        textColor=colors.HexColor('#000000'),
+        spaceAfter=10
+    ))
+
+    # ProfessionalPDFCreator stilleri
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontName=font_bold,
+        fontSize=16,
+        textColor=colors.HexColor('#1a1a1a'),
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        borderWidth=2,
+        borderColor=colors.HexColor('#333333'),
+        borderPadding=10
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomHeading',
+        parent=styles['Heading2'],
+        fontName=font_bold,
+        fontSize=12,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=12,
+        spaceBefore=12,
+        alignment=TA_LEFT
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomBody',
+        parent=styles['Normal'],
+        fontName=font_name,
+        fontSize=10,
+        textColor=colors.HexColor('#333333'),
+        spaceAfter=8,
+        alignment=TA_LEFT,
+        leading=14
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomHighlight',
+        parent=styles['Normal'],
+        fontName=font_bold,
+        fontSize=11,
+        textColor=colors.HexColor('#c0392b'),
+        spaceAfter=10,
+        alignment=TA_CENTER
+    ))
+
+    return styles
+
+
+@contextlib.contextmanager
+def flate_only():
+    """reportlab sayfa akışlarını ASCII85 sarmalaması olmadan yaz
+
+    ASCII85 sıkıştırılmış akışı yalnızca 7 bitlik metne çevirir ve ~%25
+    büyütür. Ayar süreç genelinde olduğundan yalnızca yazım süresince değişir.
+    """
+    saved = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = saved
+
+
+class RenderProfile:
+    """Süreç başına bir kez yüklenen font ve stil seti
+
+    ``compact=True`` küçük çıktı profilidir: font alt kümeleri ad tablosu
+    ve ipuçları olmadan gömülür, sayfa akışları yalnızca Flate ile
+    sıkıştırılır ve hiç kullanılmayan varsayılan Helvetica gömülmez.
+    """
+
+    def __init__(self, compact=False):
+        self.compact = compact
+        self.font_name, self.font_bold, self.font_path = register_fonts(compact)
+        self.styles = build_styles(self.font_name, self.font_bold)
+
+    @property
+    def has_turkish_font(self):
+        return self.font_path is not None
+
+    def canvas_options(self):
+        """reportlab ``Canvas``/``SimpleDocTemplate`` için ek seçenekler"""
+        if not self.compact:
+            return {}
+        # Canvas her sayfanın başında başlangıç fontunu seçer; varsayılan
+        # Helvetica hiçbir metinde kullanılmasa da belgeye eklenir
+        return {'initialFontName': self.font_name}
+
+    def writing(self):
+        """``save``/``build`` çağrısını saran bağlam (akış süzgeçleri kaydederken seçilir)"""
+        return flate_only() if self.compact else contextlib.nullcontext()
+
+
+@functools.lru_cache(maxsize=None)
+def get_render_profile(compact=False):
+    """Sürecin ortak render profilini döndür (ilk çağrıda yüklenir)
+
+    Süreç havuzlarında ``initializer`` olarak verildiğinde her işçi fontu
+    bir kez ayrıştırır; fork ile başlatılan işçiler ana süreçte yüklenmiş
+    profili kopyalamadan devralır.
+    """
+    return RenderProfile(compact)
@@ -0,0 +1,346 @@
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+STAGES = ('extract', 'render', 'render_fast', 'render_legacy', 'serve',
+          'render_compact', 'render_fast_compact', 'render_legacy_compact', 'startup',
+          'render_long', 'render_long_canvas')
+# Uzun belge aşamaları (varsayılan 10.000 sayfa) yalnızca istenince çalışır
+DEFAULT_STAGES = STAGES[:9]
+LONG_DOCUMENT = 'long/evrak_uzun.udf'
+BASELINE_PATH = ROOT / 'scripts' / 'benchmark_baseline.json'
+# Daha yüksek olması iyi / daha düşük olması iyi ölçüler
+HIGHER_IS_BETTER = ('docs_per_s', 'mb_per_s', 'pages_per_s')
+LOWER_IS_BETTER = ('peak_rss_mb', 'bytes_per_doc', 'startup_ms')
+# startup aşamasında her biri ayrı süreçte çalıştırılan komut sayısı
+STARTUP_RUNS = 20
+
+
+def peak_rss_mb():
+    """Sürecin en yüksek bellek kullanımı (MB); ölçülemiyorsa None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def corpus_files(corpus):
+    return sorted(Path(corpus).glob('*.udf'))
+
+
+def quietly(fn, *args, **kwargs):
+    """Dönüştürücülerin dosya başına ekran çıktısını bastır"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def stage_extract(files, work):
+    from udf_reader import extract_document_text
+
+    for f in files:
+        extract_document_text(f)
+    return len(files), sum(f.stat().st_size for f in files)
+
+
+def stage_startup(files, work):
+    """Her evrak için ayrı ``python -m evrak extract``: süreç açılışı ve içe aktarmalar dahil"""
+    sample = files[:STARTUP_RUNS]
+    times = []
+    for f in sample:
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'evrak', 'extract', str(f)], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return len(sample), sum(f.stat().st_size for f in sample), {
+        'startup_ms': round(times[len(times) // 2] * 1000, 1),
+    }
+
+
+def output_size(out_dir, docs):
+    """Evrak başına ortalama PDF boyutu (bayt); depolama/aktarım ile CPU dengesi için"""
+    total = sum(p.stat().st_size for p in out_dir.glob('*.pdf'))
+    return {'bytes_per_doc': round(total / docs) if docs else 0}
+
+
+def _render(files, out_dir, fast, compact=False):
+    from create_professional_pdf import create_professional_pdf
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    done = 0
+    for f in files:
+        if quietly(create_professional_pdf, f, out_dir, fast, compact=compact):
+            done += 1
+    if done < len(files):
+        print(f"⚠️  {len(files) - done} evrak dönüştürülemedi", file=sys.stderr)
+    return done, sum(f.stat().st_size for f in files), output_size(out_dir, done)
+
+
+def stage_render(files, work):
+    return _render(files, work / 'render', fast=False)
+
+
+def stage_render_fast(files, work):
+    # Sunum aşaması bu çıktıları kullanır
+    return _render(files, work / 'evraklar_pdf', fast=True)
+
+
+def stage_render_compact(files, work):
+    """Küçük çıktı profili (ipuçsuz font alt kümeleri, yalnızca Flate)"""
+    return _render(files, work / 'render_compact', fast=False, compact=True)
+
+
+def stage_render_fast_compact(files, work):
+    return _render(files, work / 'render_fast_compact', fast=True, compact=True)
+
+
+def stage_render_legacy(files, work, compact=False):
+    """scripts/udf_to_professional_pdf.ProfessionalPDFCreator (Excel tablolarını desteklemez)"""
+    import zipfile
+    from udf_reader import detect_container, iter_lines
+    from udf_to_professional_pdf import ProfessionalPDFCreator
+
+    out_dir = work / ('legacy_compact' if compact else 'legacy')
+    out_dir.mkdir(parents=True, exist_ok=True)
+    creator = ProfessionalPDFCreator(compact)
+    done = size = 0
+    for f in files:
+        with zipfile.ZipFile(f) as zip_ref:
+            if detect_container(zip_ref) != 'udf':
+                continue
+        content = {'paragraphs': list(iter_lines(f)), 'tables': []}
+        quietly(creator.create_pdf, out_dir / f.name, content)
+        done += 1
+        size += f.stat().st_size
+    return done, size, output_size(out_dir, done)
+
+
+def stage_render_legacy_compact(files, work):
+    return stage_render_legacy(files, work, compact=True)
+
+
+def _render_long(work, stream):
+    """Tek uzun belgeyi hızlı çiziciyle çiz; (sayfa, bayt) döndür"""
+    from create_professional_pdf import create_fast_pdf
+    from udf_reader import iter_lines, stream_lines
+
+    source = work / LONG_DOCUMENT
+    # Akış modu satırları üreteçten tüketir; karşılaştırma modu hepsini önce okur
+    lines = stream_lines(source) if stream else list(iter_lines(source))
+    pages = create_fast_pdf(lines, source.with_suffix('.pdf'), source.stem, stream=stream)
+    return pages, source.stat().st_size
+
+
+def stage_render_long(files, work):
+    """Uzun belgeyi akış modunda çiz (sayfalar dolunca yazılır)"""
+    pages, size = _render_long(work, stream=True)
+    return 1, size, {'pages': pages}
+
+
+def stage_render_long_canvas(files, work):
+    """Karşılaştırma için aynı belgeyi tüm sayfaları bellekte tutan reportlab Canvas ile çiz"""
+    pages, size = _render_long(work, stream=False)
+    return 1, size, {'pages': pages}
+
+
+def stage_serve(files, work, clients=20, requests=25):
+    """Üretilmiş PDF'leri evrak sunucusundan kalıcı bağlantılarla iste"""
+    from http_load_test import client, percentile, start_local_server
+
+    pdf_dir = work / 'evraklar_pdf'
+    if not any(pdf_dir.glob('*.pdf')):
+        _render(files, pdf_dir, fast=True)
+    (work / 'evraklar_kaynak').mkdir(exist_ok=True)
+    paths = [f'/evraklar_pdf/{p.name}' for p in sorted(pdf_dir.glob('*.pdf'))]
+
+    base, httpd = start_local_server(work)
+    results, errors = [], []
+    start_event = threading.Event()
+    threads = [threading.Thread(target=client, args=(base, paths, requests, 2, results, errors, start_event))
+               for _ in range(clients)]
+    for t in threads:
+        t.start()
+    t0 = time.perf_counter()
+    start_event.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    httpd.shutdown()
+
+    latencies = sorted(l for client_latencies, _ in results for l in client_latencies)
+    if errors:
+        print(f"⚠️  {len(errors)} istek başarısız", file=sys.stderr)
+    return len(latencies), sum(r for _, r in results), {
+        'seconds': elapsed,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def run_stage(stage, corpus, work):
+    """Tek aşamayı bu süreçte çalıştır ve ölçüleri döndür"""
+    files = corpus_files(corpus)
+    work = Path(work)
+    fn = globals()[f'stage_{stage}']
+    t0 = time.perf_counter()
+    result = fn(files, work)
+    elapsed = time.perf_counter() - t0
+    docs, size = result[:2]
+    extra = result[2] if len(result) > 2 else {}
+    elapsed = extra.pop('seconds', elapsed)
+    if 'pages' in extra:
+        extra['pages_per_s'] = round(extra['pages'] / elapsed, 1) if elapsed else 0.0
+    return {
+        'docs': docs,
+        'seconds': round(elapsed, 3),
+        'docs_per_s': round(docs / elapsed, 2) if elapsed else 0.0,
+        'mb_per_s': round(size / elapsed / 1024 / 1024, 3) if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        **extra,
+    }
+
+
+def run_isolated(stage, corpus, work):
+    """Aşamayı ayrı süreçte çalıştır; böylece bellek tepe değeri aşamaya özgü olur"""
+    proc = subprocess.run(
+        [sys.executable, __file__, '--run-stage', stage, '--corpus', str(corpus), '--work', str(work)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f'{stage} aşaması başarısız (çıkış kodu {proc.returncode})')
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """Taban değerlere göre geriye gidişleri listele"""
+    regressions = []
+    for stage, metrics in results.items():
+        base = baseline.get('stages', {}).get(stage)
+        # Uzun belge farklı sayfa sayısıyla üretilmişse karşılaştırılamaz
+        if not base or base.get('pages') != metrics.get('pages'):
+            continue
+        for key in HIGHER_IS_BETTER:
+            if base.get(key) and metrics.get(key) is not None and metrics[key] < base[key] * (1 - tolerance):
+                regressions.append(f"{stage}.{key}: {metrics[key]:g} < {base[key]:g} (taban)")
+        for key in LOWER_IS_BETTER:
+            if base.get(key) and metrics.get(key) is not None and metrics[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{stage}.{key}: {metrics[key]:g} > {base[key]:g} (taban)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Çıkarma, dönüştürme ve sunum kıyaslaması')
+    parser.add_argument('--corpus', help='UDF klasörü (verilmezse sentetik derlem üretilir)')
+    parser.add_argument('--count', type=int, default=200, help='Üretilecek sentetik evrak sayısı')
+    parser.add_argument('--seed', type=int, default=1, help='Sentetik derlem tohumu')
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f"Çalıştırılacak aşamalar ({', '.join(STAGES)})")
+    parser.add_argument('--long-pages', type=int, default=10000,
+                        help='render_long aşamalarındaki belgenin yaklaşık sayfa sayısı')
+    parser.add_argument('--work', help='Çalışma klasörü (varsayılan: geçici klasör)')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help='Taban değer dosyası')
+    parser.add_argument('--save-baseline', action='store_true', help='Sonuçları taban değer olarak kaydet')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='İzin verilen göreli geriye gidiş (varsayılan: 0.25)')
+    parser.add_argument('--run-stage', choices=STAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        print(json.dumps(run_stage(args.run_stage, args.corpus, args.work)))
+        return 0
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"bilinmeyen aşama: {', '.join(sorted(unknown))}")
+
+    work = Path(args.work or tempfile.mkdtemp(prefix='evrak-bench-'))
+    work.mkdir(parents=True, exist_ok=True)
+    try:
+        if args.corpus:
+            corpus = Path(args.corpus)
+            corpus_info = {'path': str(corpus)}
+        else:
+            from generate_corpus import generate_corpus
+            corpus = work / 'corpus'
+            generate_corpus(corpus, count=args.count, seed=args.seed)
+            corpus_info = {'count': args.count, 'seed': args.seed}
+        files = corpus_files(corpus)
+        corpus_info['files'] = len(files)
+        corpus_info['bytes'] = sum(f.stat().st_size for f in files)
+        print(f"Derlem: {len(files)} evrak, {corpus_info['bytes'] / 1024 / 1024:.1f} MB")
+        if any(stage.startswith('render_long') for stage in stages):
+            from generate_corpus import write_long_udf
+            long_path = work / LONG_DOCUMENT
+            long_path.parent.mkdir(exist_ok=True)
+            write_long_udf(long_path, args.long_pages, seed=args.seed)
+            print(f"Uzun belge: ~{args.long_pages} sayfa, {long_path.stat().st_size / 1024 / 1024:.1f} MB")
+        print()
+
+        results = {}
+        for stage in stages:
+            results[stage] = run_isolated(stage, corpus, work)
+            m = results[stage]
+            rss = f"{m['peak_rss_mb']:.0f} MB" if m['peak_rss_mb'] is not None else '-'
+            if 'pages' in m:
+                rate, count = f"{m['pages_per_s']:>9.1f} sayfa/sn", f"{m['pages']} sayfa"
+            else:
+                rate, count = f"{m['docs_per_s']:>9.1f} evrak/sn", f"{m['docs']} evrak"
+            # Çizim aşamalarında çıktı boyutu ve evrak başına süre birlikte gösterilir
+            output = ''
+            if 'bytes_per_doc' in m and m['docs']:
+                output = f"   {m['bytes_per_doc'] / 1024:>6.1f} KB/evrak {m['seconds'] * 1000 / m['docs']:>6.1f} ms/evrak"
+            elif 'startup_ms' in m:
+                output = f"   {m['startup_ms']:>6.1f} ms/komut (ortanca)"
+            print(f"{stage:<21} {rate} {m['mb_per_s']:>8.2f} MB/sn"
+                  f"   bellek {rss:>7}{output}   ({count}, {m['seconds']:.1f} sn)")
+    finally:
+        if not args.work:
+            shutil.rmtree(work, ignore_errors=True)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({'corpus': corpus_info, 'stages': results}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n✓ Taban değerler kaydedildi: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\n⚠️  Taban değer dosyası yok ({baseline_path}); karşılaştırma yapılmadı")
+        return 0
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('corpus') != corpus_info:
+        print("\n⚠️  Derlem taban değerlerinkinden farklı; karşılaştırma yapılmadı")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n✗ Geriye gidiş (tolerans %{args.tolerance * 100:.0f}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\n✓ Taban değerlerin %{args.tolerance * 100:.0f} toleransı içinde")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,298 @@
+from pathlib import Path
+import argparse
+import math
+import random
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+# UYAP imza dosyası (PKCS#7) yerine geçen rastgele baytların boyutu
+SIGN_SIZE = 2625
+# Hızlı çizicide (A4, 10 punto) bir sayfaya sığan yaklaşık metin
+CHARS_PER_PAGE = 4700
+
+MAHKEMELER = ['İŞ MAHKEMESİ', 'ASLİYE HUKUK MAHKEMESİ', 'SULH HUKUK MAHKEMESİ',
+              'İCRA HUKUK MAHKEMESİ', 'ASLİYE TİCARET MAHKEMESİ', 'AİLE MAHKEMESİ']
+ILLER = ['ZONGULDAK', 'ANKARA', 'İSTANBUL', 'İZMİR', 'BURSA', 'ÇANAKKALE', 'MUĞLA', 'ŞANLIURFA']
+ADLAR = ['Yeliz', 'Ahmet', 'Ayşe', 'Mehmet', 'Gülşen', 'Çağrı', 'Özge', 'İsmail', 'Şükrü', 'Ümran']
+SOYADLAR = ['PAT', 'YILMAZ', 'KAYA', 'DEMİR', 'ŞAHİN', 'ÇELİK', 'ÖZTÜRK', 'AYDIN', 'GÜNEŞ', 'ERGENİ']
+SIRKETLER = ['ALİPAPİLA GIDA SANAYİ VE TİCARET A.Ş.', 'KARADENİZ MADENCİLİK LTD. ŞTİ.',
+             'EGE TEKSTİL SANAYİ A.Ş.', 'ÇAĞDAŞ İNŞAAT TAAHHÜT LTD. ŞTİ.', 'ÖZGÜR LOJİSTİK A.Ş.']
+KONULAR = ['ücret alacağı', 'kıdem tazminatı', 'ihbar tazminatı', 'fazla mesai ücret alacağı',
+           'yıllık izin ücreti', 'UGBT alacağı', 'kira alacağı', 'tapu iptali ve tescil']
+KELIMELER = (
+    'davacı davalı müvekkil işveren işçi iş sözleşmesi fesih haklı neden tanık beyan '
+    'bilirkişi rapor mahkemenize dosya esas karar duruşma talep delil hesap bordro '
+    'sigorta prim gün ödeme tahsil faiz yasal hüküm itiraz süre tebliğ icra takip '
+    'şirket yönetim kurulu görev çalışma dönem aylık net brüt yevmiye ikamet adres '
+    'gereğinin yapılması saygılarımızla arz ederiz ilişkin olarak kaydıyla şimdilik'
+).split()
+BOLD = ' bold="true"'
+SUTUNLAR = ['BORCLU_MARS', 'BORCLU_SUBE', 'BORCLU_HESAP', 'BORCLU_VKN_TCKN', 'ALACAKLI_UNVAN',
+            'ISLEM_TARIHI', 'TUTAR', 'ACIKLAMA']
+
+
+def kisi(rng):
+    return f"{rng.choice(ADLAR)} {rng.choice(SOYADLAR)}"
+
+
+def tl(amount):
+    """Tutarı '12.500,00 TL' biçiminde yaz"""
+    return f"{amount:,}".replace(',', '.') + ',00 TL'
+
+
+def cumle(rng, min_words=8, max_words=30):
+    words = [rng.choice(KELIMELER) for _ in range(rng.randint(min_words, max_words))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def dilekce_metni(rng, target_chars):
+    """Başlık alanları ve gövde paragraflarından oluşan dilekçe metni"""
+    tutar = rng.randint(1, 500) * 100
+    tarih = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2019, 2025)}"
+    lines = [
+        f"{rng.choice(ILLER)} NÖBETÇİ {rng.choice(MAHKEMELER)}'NE",
+        '',
+        f"DAVACI\t\t: {kisi(rng)} -{rng.randint(10**10, 10**11 - 1)}- {rng.choice(ILLER)}",
+        '',
+        f"VEKİLİ\t\t: Av. {kisi(rng)}",
+        '',
+        f"DAVALI\t\t: {rng.choice(SIRKETLER)} VK No: {rng.randint(10**9, 10**10 - 1)}",
+        '',
+        "KONU\t\t: Fazlaya ilişkin talep ve dava hakkımız saklı kalmak kaydıyla şimdilik; "
+        + ', '.join(f"{tl(rng.randint(1, 50) * 100)} {k}" for k in rng.sample(KONULAR, 3)),
+        '',
+        f"H.ESAS DEĞER\t: {tl(tutar)}",
+        '',
+        f"DAVA TARİHİ\t: {tarih}",
+        '',
+        'AÇIKLAMALAR',
+        '',
+    ]
+    size = sum(len(line) + 1 for line in lines)
+    number = 1
+    while size < target_chars:
+        paragraph = f"{number}. " + ' '.join(cumle(rng) for _ in range(rng.randint(2, 6)))
+        lines += [paragraph, '']
+        size += len(paragraph) + 2
+        number += 1
+    lines += ['SONUÇ VE İSTEM : Yukarıda açıklanan nedenlerle davamızın kabulüne karar verilmesini '
+              'saygılarımızla arz ederiz.', '', f"Davacı Vekili Av. {kisi(rng)}"]
+    return '\n'.join(lines)
+
+
+XML_HEAD = '<?xml version="1.0" encoding="UTF-8" ?> \n\n<template format_id="1.8" >\n<content><![CDATA['
+XML_MIDDLE = (
+    ']]></content><properties><pageFormat mediaSizeName="1" leftMargin="42.525" rightMargin="42.525" '
+    'topMargin="42.525" bottomMargin="42.525" paperOrientation="1" headerFOffset="20.0" '
+    'footerFOffset="20.0" /></properties>\n<elements resolver="hvl-default" >\n'
+)
+XML_TAIL = (
+    '\n</elements>\n<styles><style name="hvl-default" family="Times New Roman" size="12" '
+    'description="Gövde" /></styles>\n</template>\n'
+)
+
+
+def paragraph_xml(line, offset):
+    """Satırın <paragraph> öğesi (satır sonu dahil ``offset``ten başlar)"""
+    length = len(line) + 1
+    label, sep, _ = line.partition(':')
+    if sep and len(label) < 20 and label.strip().isupper():
+        # Etiket kalın, değeri düz
+        runs = [(offset, len(label) + 1, True), (offset + len(label) + 1, length - len(label) - 1, False)]
+    else:
+        runs = [(offset, length, line.isupper() and bool(line))]
+    contents = ''.join(
+        f'<content{BOLD if bold else ""} startOffset="{start}" length="{size}" />'
+        for start, size, bold in runs if size
+    )
+    alignment = ' Alignment="1"' if offset == 0 else ' Alignment="3" FirstLineIndent="0.0"'
+    return f'<paragraph{alignment}>{contents}</paragraph>'
+
+
+def udf_content_xml(text):
+    """Metni CDATA olarak, paragraf ofsetlerini <elements> altında yazan content.xml"""
+    parts = []
+    offset = 0
+    for line in text.split('\n'):
+        parts.append(paragraph_xml(line, offset))
+        offset += len(line) + 1
+    return XML_HEAD + text + XML_MIDDLE + ''.join(parts) + XML_TAIL
+
+
+def _random_bytes(rng, n):
+    """``Random.randbytes`` ile aynı baytlar (o Python 3.9'da geldi)"""
+    return rng.getrandbits(n * 8).to_bytes(n, 'little')
+
+
+def write_udf(path, text, rng):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('content.xml', udf_content_xml(text))
+        zf.writestr('sign.sgn', _random_bytes(rng, SIGN_SIZE))
+
+
+def long_lines(seed, target_chars):
+    """Yaklaşık ``target_chars`` karakterlik uzun dilekçenin satırları (tohuma göre sabit)"""
+    rng = random.Random(seed)
+    size = 0
+    number = 1
+    for line in dilekce_metni(rng, 0).split('\n')[:-3]:
+        size += len(line) + 1
+        yield line
+    while size < target_chars:
+        paragraph = f"{number}. " + ' '.join(cumle(rng) for _ in range(rng.randint(2, 6)))
+        yield paragraph
+        yield ''
+        size += len(paragraph) + 2
+        number += 1
+
+
+def write_long_udf(path, pages, seed=1):
+    """Hızlı çizicide yaklaşık ``pages`` sayfa tutan tek bir UDF yaz
+
+    Metin ve <elements> bölümü aynı tohumla iki kez üretilerek akış
+    halinde yazılır; yüz MB'lık content.xml bile belleğe alınmaz.
+    """
+    target = pages * CHARS_PER_PAGE
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        with zf.open('content.xml', 'w', force_zip64=True) as f:
+            f.write(XML_HEAD.encode())
+            batch = []
+            for line in long_lines(seed, target):
+                batch.append(line + '\n')
+                if len(batch) >= 1000:
+                    f.write(''.join(batch).encode())
+                    batch = []
+            f.write(''.join(batch).encode())
+            f.write(XML_MIDDLE.encode())
+            batch = []
+            offset = 0
+            for line in long_lines(seed, target):
+                batch.append(paragraph_xml(line, offset))
+                offset += len(line) + 1
+                if len(batch) >= 1000:
+                    f.write(''.join(batch).encode())
+                    batch = []
+            f.write(''.join(batch).encode())
+            f.write(XML_TAIL.encode())
+        zf.writestr('sign.sgn', _random_bytes(random.Random(seed), SIGN_SIZE))
+
+
+def column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def write_xlsx(path, rows, rng):
+    """.udf uzantılı, tek sayfalık Excel çalışma kitabı (UYAP'tan gelen tablo ekleri gibi)"""
+    strings = SUTUNLAR + SIRKETLER + ILLER
+    ns = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    rel_ns = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '</Types>'))
+        zf.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'))
+        zf.writestr('xl/workbook.xml', (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<workbook xmlns="{ns}" xmlns:r="{rel_ns}">'
+            '<sheets><sheet name="gelen detay" sheetId="1" r:id="rId1"/></sheets></workbook>'))
+        zf.writestr('xl/_rels/workbook.xml.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+            '</Relationships>'))
+        zf.writestr('xl/sharedStrings.xml', (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<sst xmlns="{ns}" uniqueCount="{len(strings)}">'
+            + ''.join(f'<si><t>{escape(s)}</t></si>' for s in strings) + '</sst>'))
+
+        # Büyük sayfalar belleğe alınmadan akış halinde yazılır
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as f:
+            cols = ''.join(f'<col min="{i + 1}" max="{i + 1}" width="{rng.uniform(10, 20):.2f}" customWidth="1"/>'
+                           for i in range(len(SUTUNLAR)))
+            f.write((f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{ns}">'
+                     f'<cols>{cols}</cols><sheetData>').encode())
+            header = ''.join(f'<c r="{column_letter(i)}1" t="s"><v>{i}</v></c>' for i in range(len(SUTUNLAR)))
+            f.write(f'<row r="1">{header}</row>'.encode())
+            batch = []
+            for r in range(2, rows + 2):
+                cells = [
+                    f'<c r="A{r}"><v>{rng.randint(1000, 9999)}</v></c>',
+                    f'<c r="B{r}"><v>{rng.randint(100, 999)}</v></c>',
+                    f'<c r="C{r}"><v>{rng.randint(10**7, 10**8)}</v></c>',
+                    f'<c r="D{r}"><v>{rng.randint(10**9, 10**10)}</v></c>',
+                    f'<c r="E{r}" t="s"><v>{len(SUTUNLAR) + rng.randrange(len(SIRKETLER))}</v></c>',
+                    f'<c r="F{r}" t="inlineStr"><is><t>{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2025</t></is></c>',
+                    f'<c r="G{r}"><v>{rng.randint(100, 10**6) / 100}</v></c>',
+                    f'<c r="H{r}" t="inlineStr"><is><t>{escape(cumle(rng, 3, 8))}</t></is></c>',
+                ]
+                batch.append(f'<row r="{r}">{"".join(cells)}</row>')
+                if len(batch) >= 1000:
+                    f.write(''.join(batch).encode())
+                    batch = []
+            f.write(''.join(batch).encode())
+            f.write(b'</sheetData></worksheet>')
+
+
+def generate_corpus(out_dir, count=200, size_kb=6.0, outlier_rate=0.02, outlier_scale=50,
+                    sheet_rate=0.02, sheet_rows=5000, seed=1):
+    """Sentetik UDF derlemi üret, üretilen dosyaların listesini döndür
+
+    Metin boyutları ``size_kb`` ortancalı log-normal dağılır; evrakların
+    ``outlier_rate`` kadarı ``outlier_scale`` kat büyük, ``sheet_rate``
+    kadarı ise ``sheet_rows`` satırlık Excel tablosudur. Aynı tohum aynı
+    derlemi üretir.
+    """
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for i in range(count):
+        path = out_dir / f"evrak_{90000000000 + i}.udf"
+        roll = rng.random()
+        if roll < sheet_rate:
+            write_xlsx(path, sheet_rows, rng)
+        else:
+            target = size_kb * 1024 * math.exp(rng.gauss(0, 0.5))
+            if roll < sheet_rate + outlier_rate:
+                target *= outlier_scale
+            write_udf(path, dilekce_metni(rng, int(target)), rng)
+        files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentetik UDF derlemi üret')
+    parser.add_argument('--out', default='bench_corpus', help='Çıktı klasörü')
+    parser.add_argument('--count', type=int, default=200, help='Evrak sayısı')
+    parser.add_argument('--size-kb', type=float, default=6.0, help='Ortanca metin boyutu (KB)')
+    parser.add_argument('--outlier-rate', type=float, default=0.02, help='Büyük evrak oranı')
+    parser.add_argument('--outlier-scale', type=float, default=50, help='Büyük evrakların boyut katı')
+    parser.add_argument('--sheet-rate', type=float, default=0.02, help='Excel tablosu oranı')
+    parser.add_argument('--sheet-rows', type=int, default=5000, help='Tablo başına satır sayısı')
+    parser.add_argument('--seed', type=int, default=1, help='Rastgele tohum')
+    args = parser.parse_args()
+
+    files = generate_corpus(args.out, args.count, args.size_kb, args.outlier_rate,
+                            args.outlier_scale, args.sheet_rate, args.sheet_rows, args.seed)
+    total = sum(f.stat().st_size for f in files)
+    print(f"✓ {len(files)} evrak üretildi ({total / 1024 / 1024:.1f} MB) → {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
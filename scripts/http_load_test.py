@@ -0,0 +1,122 @@
+from pathlib import Path
+import argparse
+import http.client
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def percentile(values, p):
+    """Sıralı listeden yüzdelik değer"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def start_local_server(root=ROOT):
+    """Verilen kökü (varsayılan: depo kökü) sunan sunucuyu boş bir portta arka planda başlat"""
+    os.chdir(root)
+    from start_server import EvrakHTTPServer, MyHTTPRequestHandler
+
+    class QuietHandler(MyHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    httpd = EvrakHTTPServer(('127.0.0.1', 0), QuietHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{httpd.server_address[1]}', httpd
+
+
+def client(base, paths, count, range_every, results, errors, start_event):
+    """Tek kalıcı bağlantı üzerinden ``count`` istek gönder"""
+    parts = urlsplit(base)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    latencies = []
+    received = 0
+    start_event.wait()
+    for i in range(count):
+        path = paths[i % len(paths)]
+        headers = {}
+        # PDF görüntüleyicinin parça parça okumasını taklit et
+        if range_every and i % range_every == 0:
+            headers['Range'] = 'bytes=0-65535'
+        t0 = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            if response.status not in (200, 206):
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+            continue
+        latencies.append(time.perf_counter() - t0)
+        received += len(body)
+    conn.close()
+    results.append((latencies, received))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evrak sunucusu yük testi')
+    parser.add_argument('--url', help='Test edilecek sunucu (verilmezse yerel sunucu başlatılır)')
+    parser.add_argument('--clients', type=int, default=100, help='Eşzamanlı istemci sayısı')
+    parser.add_argument('--requests', type=int, default=50, help='İstemci başına istek sayısı')
+    parser.add_argument('--range-every', type=int, default=2,
+                        help='Her N istekten biri Range isteği olsun (0: hiç)')
+    parser.add_argument('paths', nargs='*', help='İstenecek yollar (varsayılan: evraklar_pdf/*.pdf)')
+    args = parser.parse_args()
+
+    httpd = None
+    base = args.url
+    if not base:
+        base, httpd = start_local_server()
+
+    paths = args.paths or [f'/evraklar_pdf/{p.name}' for p in sorted((ROOT / 'evraklar_pdf').glob('*.pdf'))]
+    if not paths:
+        print("✗ İstenecek dosya bulunamadı!")
+        return 1
+
+    results, errors = [], []
+    start_event = threading.Event()
+    threads = [
+        threading.Thread(target=client, args=(base, paths, args.requests, args.range_every,
+                                              results, errors, start_event))
+        for _ in range(args.clients)
+    ]
+    for t in threads:
+        t.start()
+    t0 = time.perf_counter()
+    start_event.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    latencies = sorted(l for client_latencies, _ in results for l in client_latencies)
+    received = sum(r for _, r in results)
+
+    print("=" * 60)
+    print(f"Sunucu          : {base}")
+    print(f"İstemci         : {args.clients} x {args.requests} istek")
+    print(f"Başarılı        : {len(latencies)}  Hatalı: {len(errors)}")
+    print(f"İstek/sn        : {len(latencies) / elapsed:.1f}")
+    print(f"Aktarım         : {received / elapsed / 1024 / 1024:.1f} MB/sn")
+    print(f"Gecikme p50     : {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"Gecikme p99     : {percentile(latencies, 99) * 1000:.1f} ms")
+    print("=" * 60)
+
+    if httpd is not None:
+        httpd.shutdown()
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
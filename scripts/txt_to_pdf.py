@@ -1,9 +1,8 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from pathlib import Path
-import textwrap
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fast_canvas import FastTextRenderer
 
 def create_pdf_from_txt(txt_file):
     """Text dosyasını PDF'e dönüştür"""
@@ -11,59 +10,12 @@ def create_pdf_from_txt(txt_file):
     pdf_file = str(txt_file).replace('.txt', '.pdf')
     
     try:
-        # PDF oluştur
-        c = canvas.Canvas(pdf_file, pagesize=A4)
-        width, height = A4
-        
-        # Türkçe karakter desteği için font (sistem fontunu kullan)
-        try:
-            # Windows için
-            pdfmetrics.registerFont(TTFont('Turkish', 'C:/Windows/Fonts/arial.ttf'))
-            c.setFont('Turkish', 10)
-        except:
-            # Font bulunamazsa varsayılan
-            c.setFont('Helvetica', 10)
-        
         # Text dosyasını oku
         with open(txt_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Satırlara böl
-        lines = content.split('\n')
-        
-        # Sayfa ayarları
-        margin = 50
-        y_position = height - margin
-        line_height = 14
-        
-        for line in lines:
-            # Satır çok uzunsa kes
-            if len(line) > 80:
-                wrapped_lines = textwrap.wrap(line, width=80)
-            else:
-                wrapped_lines = [line]
-            
-            for wrapped_line in wrapped_lines:
-                # Sayfa sonu kontrolü
-                if y_position < margin:
-                    c.showPage()
-                    try:
-                        c.setFont('Turkish', 10)
-                    except:
-                        c.setFont('Helvetica', 10)
-                    y_position = height - margin
-                
-                # Satırı yaz
-                try:
-                    c.drawString(margin, y_position, wrapped_line)
-                except:
-                    # Türkçe karakter sorunu varsa ASCII'ye çevir
-                    c.drawString(margin, y_position, wrapped_line.encode('ascii', 'ignore').decode())
-                
-                y_position -= line_height
-        
-        # PDF'i kaydet
-        c.save()
+        # Satırlar gerçek font genişliğine göre kırılarak doğrudan canvas'a yazılır
+        FastTextRenderer().render(content.split('\n'), pdf_file)
         print(f"✓ PDF oluşturuldu: {pdf_file}")
         return True
         
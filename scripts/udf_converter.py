@@ -2,6 +2,12 @@ import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from evrak_dispatch import publish_file, sniff_type
+
+# Olduğu gibi (kaynağa dokunmadan) yayımlanan türler ve uzantıları
+PASSTHROUGH_EXTENSIONS = {'pdf': '.pdf', 'jpeg': '.jpg', 'tiff': '.tif', 'png': '.png'}
+
 def analyze_udf_file(filepath):
     """UDF dosyasını analiz et ve içeriğini çözmeye çalış"""
     
@@ -21,38 +27,33 @@ def analyze_udf_file(filepath):
         except:
             print(header[:200].decode('latin-1', errors='ignore'))
         
-        # PDF kontrolü
-        if header.startswith(b'%PDF'):
-            print("\n✓ Bu bir PDF dosyası!")
-            return 'pdf'
-        
-        # ZIP/DOCX kontrolü
-        if header.startswith(b'PK\x03\x04'):
-            print("\n✓ Bu bir ZIP arşivi (DOCX/XLSX olabilir)!")
-            return 'zip'
-        
-        # XML kontrolü
-        if header.startswith(b'<?xml') or b'<' in header[:10]:
-            print("\n✓ Bu bir XML dosyası olabilir!")
-            return 'xml'
-        
-        # RTF kontrolü
-        if header.startswith(b'{\\rtf'):
-            print("\n✓ Bu bir RTF dosyası!")
-            return 'rtf'
-        
-        print("\n? Bilinmeyen format")
-        return 'unknown'
+    # İmza tespiti toplu dönüştürücüyle (evrak_dispatch) ortaktır
+    file_type = sniff_type(filepath)
+    if file_type == 'unknown' and b'<' in header[:10]:
+        file_type = 'xml'
+    
+    messages = {
+        'pdf': "✓ Bu bir PDF dosyası!",
+        'zip': "✓ Bu bir ZIP arşivi (UDF/DOCX/XLSX olabilir)!",
+        'jpeg': "✓ Bu bir JPEG görüntüsü!",
+        'tiff': "✓ Bu bir TIFF görüntüsü!",
+        'png': "✓ Bu bir PNG görüntüsü!",
+        'xml': "✓ Bu bir XML dosyası olabilir!",
+        'rtf': "✓ Bu bir RTF dosyası!",
+    }
+    print("\n" + messages.get(file_type, "? Bilinmeyen format"))
+    return file_type
 
 def convert_to_text(filepath, output_path):
     """Dosyayı text formatına dönüştürmeye çalış"""
     
     file_type = analyze_udf_file(filepath)
     
-    if file_type == 'pdf':
-        new_name = output_path.replace('.txt', '.pdf')
-        os.rename(filepath, new_name)
-        print(f"\n✓ PDF olarak kaydedildi: {new_name}")
+    if file_type in PASSTHROUGH_EXTENSIONS:
+        # Kaynak taşınmaz; hardlink veya çekirdek içi kopya ile yayımlanır
+        new_name = output_path.replace('.txt', PASSTHROUGH_EXTENSIONS[file_type])
+        method = publish_file(filepath, new_name)
+        print(f"\n✓ {file_type.upper()} olarak kaydedildi ({method}): {new_name}")
         
     elif file_type == 'zip':
         new_name = output_path.replace('.txt', '.zip')
@@ -1,168 +1,50 @@
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.lib import colors
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import xml.etree.ElementTree as ET
 from pathlib import Path
+import argparse
+import sys
 import zipfile
-import re
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from evrak_budget import BudgetExceeded
+from render_profile import get_render_profile
+from udf_reader import extract_document_text
 
 class ODTParser:
-    """ODT dosyasını parse et ve yapılandırılmış veri çıkar"""
+    """UDF dosyasından paragraf listesi çıkar (``udf_reader`` ile ortak çıkarıcı)"""
     
     def __init__(self, udf_file):
         self.udf_file = udf_file
         self.content = {}
         
     def extract_content(self):
-        """ODT içeriğini çıkar"""
+        """Boş olmayan satırları paragraf olarak döndür; okunamazsa None"""
         try:
-            with zipfile.ZipFile(self.udf_file, 'r') as zip_ref:
-                # content.xml'i oku
-                with zip_ref.open('content.xml') as xml_file:
-                    tree = ET.parse(xml_file)
-                    root = tree.getroot()
-                    
-                    # Namespace tanımları
-                    namespaces = {
-                        'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
-                        'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
-                        'table': 'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
-                    }
-                    
-                    # Body içeriğini bul
-                    body = root.find('.//office:body/office:text', namespaces)
-                    
-                    if body is not None:
-                        self.parse_body(body, namespaces)
-                        
-            return self.content
-            
-        except Exception as e:
+            text = extract_document_text(self.udf_file)
+        except (zipfile.BadZipFile, KeyError, OSError, ValueError, BudgetExceeded) as e:
             print(f"Parse hatası: {e}")
             return None
-    
-    def parse_body(self, body, ns):
-        """Body içeriğini parse et"""
-        paragraphs = []
-        tables = []
-        
-        for elem in body:
-            tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-            
-            if tag == 'p':
-                # Paragraf
-                text = self.get_text_recursive(elem)
-                if text.strip():
-                    paragraphs.append(text.strip())
-                    
-            elif tag == 'table':
-                # Tablo
-                table_data = self.parse_table(elem, ns)
-                if table_data:
-                    tables.append(table_data)
-        
-        self.content = {
-            'paragraphs': paragraphs,
-            'tables': tables
-        }
-    
-    def get_text_recursive(self, element):
-        """Element ve alt elementlerden text topla"""
-        texts = []
-        if element.text:
-            texts.append(element.text)
-        for child in element:
-            texts.append(self.get_text_recursive(child))
-            if child.tail:
-                texts.append(child.tail)
-        return ''.join(texts)
-    
-    def parse_table(self, table_elem, ns):
-        """Tablo parse et"""
-        rows = []
-        for row in table_elem.findall('.//table:table-row', ns):
-            cells = []
-            for cell in row.findall('.//table:table-cell', ns):
-                cell_text = self.get_text_recursive(cell)
-                cells.append(cell_text.strip())
-            if any(cells):  # Boş satırları atla
-                rows.append(cells)
-        return rows if rows else None
+        paragraphs = [line.strip() for line in text.split('\n') if line.strip()]
+        self.content = {'paragraphs': paragraphs, 'tables': []}
+        return self.content if paragraphs else None
 
 
 class ProfessionalPDFCreator:
     """Profesyonel PDF oluşturucu"""
     
-    def __init__(self):
-        # Türkçe font desteği
-        try:
-            pdfmetrics.registerFont(TTFont('Turkish', 'C:/Windows/Fonts/arial.ttf'))
-            pdfmetrics.registerFont(TTFont('TurkishBold', 'C:/Windows/Fonts/arialbd.ttf'))
-            self.font_name = 'Turkish'
-            self.font_bold = 'TurkishBold'
-        except:
-            self.font_name = 'Helvetica'
-            self.font_bold = 'Helvetica-Bold'
+    def __init__(self, compact=False):
+        # Türkçe font ve stiller süreç başına bir kez yüklenir; ``compact``
+        # küçük çıktı profilidir (ipuçsuz font alt kümeleri, yalnızca Flate)
+        profile = self.profile = get_render_profile(compact)
+        self.font_name = profile.font_name
+        self.font_bold = profile.font_bold
+        self.styles = profile.styles
     
     def create_styles(self):
-        """PDF stilleri oluştur"""
-        styles = getSampleStyleSheet()
-        
-        # Başlık stili
-        styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=styles['Heading1'],
-            fontName=self.font_bold,
-            fontSize=16,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            borderWidth=2,
-            borderColor=colors.HexColor('#333333'),
-            borderPadding=10
-        ))
-        
-        # Alt başlık
-        styles.add(ParagraphStyle(
-            name='CustomHeading',
-            parent=styles['Heading2'],
-            fontName=self.font_bold,
-            fontSize=12,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=12,
-            spaceBefore=12,
-            alignment=TA_LEFT
-        ))
-        
-        # Normal metin
-        styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=styles['Normal'],
-            fontName=self.font_name,
-            fontSize=10,
-            textColor=colors.HexColor('#333333'),
-            spaceAfter=8,
-            alignment=TA_LEFT,
-            leading=14
-        ))
-        
-        # Vurgu metni
-        styles.add(ParagraphStyle(
-            name='CustomHighlight',
-            parent=styles['Normal'],
-            fontName=self.font_bold,
-            fontSize=11,
-            textColor=colors.HexColor('#c0392b'),
-            spaceAfter=10,
-            alignment=TA_CENTER
-        ))
-        
-        return styles
+        """PDF stilleri (süreç genelinde paylaşılan profil)"""
+        return self.styles
     
     def create_pdf(self, udf_file, content):
         """PDF oluştur"""
@@ -175,7 +57,8 @@ class ProfessionalPDFCreator:
             rightMargin=2*cm,
             leftMargin=2*cm,
             topMargin=2*cm,
-            bottomMargin=2*cm
+            bottomMargin=2*cm,
+            **self.profile.canvas_options()
         )
         
         # Stiller
@@ -246,11 +129,12 @@ class ProfessionalPDFCreator:
                     story.append(Spacer(1, 0.5*cm))
         
         # PDF'i oluştur
-        doc.build(story)
+        with self.profile.writing():
+            doc.build(story)
         return pdf_file
 
 
-def convert_all_udf_to_professional_pdf():
+def convert_all_udf_to_professional_pdf(compact=False):
     """Tüm UDF dosyalarını profesyonel PDF'e dönüştür"""
     udf_files = list(Path('.').glob('*.udf'))
     
@@ -264,7 +148,7 @@ def convert_all_udf_to_professional_pdf():
     print(f"{len(udf_files)} adet UDF dosyası bulundu\n")
     
     parser = ODTParser(None)
-    pdf_creator = ProfessionalPDFCreator()
+    pdf_creator = ProfessionalPDFCreator(compact)
     
     success_count = 0
     for udf_file in udf_files:
@@ -294,4 +178,7 @@ def convert_all_udf_to_professional_pdf():
 
 
 if __name__ == "__main__":
-    convert_all_udf_to_professional_pdf()
+    parser = argparse.ArgumentParser(description="Klasördeki UDF dosyalarını profesyonel PDF'e dönüştür")
+    parser.add_argument('--compact', action='store_true',
+                        help="küçük çıktı profili: font alt kümeleri ipuçsuz gömülür, sayfa akışları yalnızca Flate ile sıkıştırılır")
+    convert_all_udf_to_professional_pdf(compact=parser.parse_args().compact)
@@ -0,0 +1,640 @@
+import heapq
+import html
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import unicodedata
+import zipfile
+import zlib
+from array import array
+from pathlib import Path
+
+from evrak_budget import BudgetExceeded
+from udf_document import UDFDocument
+
+# Belirteçleme veya dosya biçimi değişirse artırılır (dizin yeniden kurulur)
+INDEX_VERSION = 1
+MANIFEST_NAME = 'index.json'
+# Dizin, PDF klasörünün altında bu adla tutulur
+INDEX_DIR_NAME = '.search'
+SEGMENT_MAGIC = b'EVIDX001'
+# Başlık: sihirli sözcük, evrak/terim sayısı, ortalama uzunluk, bölüm ofsetleri
+HEADER = struct.Struct('<8sIId9Q')
+
+# Bu kadar bölüt birikince tek bölütte birleştirilir
+MAX_SEGMENTS = 8
+# Bellekte bekleyen (sıkıştırılmış) belgeler bu boyutu aşınca bölüt diske yazılır
+FLUSH_BYTES = 32 * 1024 * 1024
+
+# BM25 parametreleri; terim ağırlıkları yazarken 1-255 arasına ölçeklenir
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r'\w+')
+MAX_TOKEN_LENGTH = 64
+# Önek aramasında genişletilecek en fazla terim
+MAX_PREFIX_TERMS = 64
+
+
+class _FoldTable(dict):
+    """Karakter başına tek karakterlik katlama tablosu (str.translate için)
+
+    Türkçe büyük/küçük harf ayrımı (İ/i, I/ı) ve aksanlar kaldırılır:
+    'İSTANBUL', 'istanbul' ve 'Istanbul' aynı terime düşer. Her karakter
+    tam bir karaktere eşlendiğinden katlanmış metindeki konumlar özgün
+    metindekilerle aynıdır (özet çıkarırken kullanılır).
+    """
+
+    def __missing__(self, code):
+        ch = chr(code)
+        lowered = ch.lower()
+        base = ''.join(c for c in unicodedata.normalize('NFKD', lowered) if not unicodedata.combining(c))
+        if len(base) == 1:
+            result = base
+        elif len(lowered) == 1:
+            result = lowered
+        else:
+            result = ch
+        self[code] = result
+        return result
+
+
+_FOLD = _FoldTable({ord('I'): 'i', ord('İ'): 'i', ord('ı'): 'i'})
+
+
+def fold(text):
+    """Metni arama için katla (Türkçe harfler ve aksanlar)"""
+    return text.translate(_FOLD)
+
+
+def tokenize(text):
+    """Katlanmış metinden terimler"""
+    return [t for t in _TOKEN.findall(fold(text))
+            if (len(t) > 1 or t.isdigit()) and len(t) <= MAX_TOKEN_LENGTH]
+
+
+def document_stamp(path):
+    """Kaynak dosyanın değişip değişmediğini anlamak için kısa damga"""
+    st = os.stat(path)
+    return f'{st.st_size}:{st.st_mtime_ns}'
+
+
+class Segment:
+    """Diskteki değişmez dizin bölütü (mmap ile okunur)
+
+    Evrak tablosu açılışta belleğe alınır; terim sözlüğü, eşleşme
+    listeleri ve evrak metinleri yalnızca gerektiğinde mmap üzerinden
+    okunur. Eşleşme listeleri ağırlığa göre azalan sıradadır, böylece tek
+    terimli sorgular ilk k kayıtta durabilir.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.n_docs, self.n_terms, self.avgdl, docs_off, term_off_off, post_off_off,
+         df_off, max_off, terms_off, postings_off, texts_off, end) = HEADER.unpack_from(self._mm, 0)
+        if magic != SEGMENT_MAGIC:
+            raise ValueError(f'geçersiz dizin bölütü: {path}')
+        self.docs = json.loads(zlib.decompress(self._mm[docs_off:term_off_off]))
+        self._term_off = term_off_off
+        self._post_off = post_off_off
+        self._df_off = df_off
+        self._max_off = max_off
+        self._terms_off = terms_off
+        self._postings_off = postings_off
+        self._texts_off = texts_off
+
+    def close(self):
+        self._mm.close()
+
+    def term(self, i):
+        start, end = struct.unpack_from('<II', self._mm, self._term_off + 4 * i)
+        return self._mm[self._terms_off + start:self._terms_off + end]
+
+    def find(self, term):
+        """Terimin sözlükteki sırası (yoksa -1)"""
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.n_terms and self.term(lo) == term else -1
+
+    def prefix_range(self, prefix):
+        """Öneki paylaşan terimlerin sıra aralığı"""
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        end = lo
+        while end < self.n_terms and end - lo < MAX_PREFIX_TERMS and self.term(end).startswith(prefix):
+            end += 1
+        return range(lo, end)
+
+    def df(self, i):
+        return struct.unpack_from('<I', self._mm, self._df_off + 4 * i)[0]
+
+    def max_impact(self, i):
+        return self._mm[self._max_off + i]
+
+    def postings(self, i):
+        """(evrak sırası dizisi, ağırlık dizisi) - ağırlığa göre azalan"""
+        start, end = struct.unpack_from('<QQ', self._mm, self._post_off + 8 * i)
+        raw = zlib.decompress(self._mm[self._postings_off + start:self._postings_off + end])
+        count = len(raw) // 5
+        docs = array('I')
+        docs.frombytes(raw[:4 * count])
+        impacts = array('B')
+        impacts.frombytes(raw[4 * count:])
+        return docs, impacts
+
+    def text(self, local):
+        """Evrakın saklanan özgün metni"""
+        _, _, length, start, size = self.docs[local]
+        if length < 0:
+            return ''
+        return zlib.decompress(self._mm[self._texts_off + start:self._texts_off + start + size]).decode('utf-8')
+
+
+def write_segment(path, docs):
+    """(evrak id, damga, metin veya None) kayıtlarından bölüt dosyası yaz
+
+    Metni None olan kayıt silme işaretidir; daha eski bölütlerdeki aynı
+    evrakı gizler.
+    """
+    postings = {}
+    doc_table = []
+    texts = bytearray()
+    lengths = []
+
+    for local, (doc_id, stamp, text) in enumerate(docs):
+        if text is None:
+            doc_table.append([doc_id, stamp, -1, 0, 0])
+            lengths.append(0)
+            continue
+        counts = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        length = sum(counts.values())
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append((local, tf))
+        blob = zlib.compress(text.encode('utf-8'))
+        doc_table.append([doc_id, stamp, length, len(texts), len(blob)])
+        texts += blob
+        lengths.append(length)
+
+    live_lengths = [l for l, d in zip(lengths, doc_table) if d[2] >= 0]
+    avgdl = (sum(live_lengths) / len(live_lengths)) if live_lengths else 1.0
+
+    terms = sorted(postings)
+    term_offsets = array('I', [0])
+    terms_blob = bytearray()
+    post_offsets = array('Q', [0])
+    postings_blob = bytearray()
+    dfs = array('I')
+    max_impacts = bytearray()
+
+    for term in terms:
+        encoded = term.encode('utf-8')
+        terms_blob += encoded
+        term_offsets.append(len(terms_blob))
+
+        weighted = []
+        for local, tf in postings[term]:
+            norm = K1 * (1 - B + B * lengths[local] / avgdl)
+            impact = max(1, min(255, round(tf * (K1 + 1) / (tf + norm) / (K1 + 1) * 255)))
+            weighted.append((impact, local))
+        weighted.sort(key=lambda p: (-p[0], p[1]))
+        docs_array = array('I', [local for _, local in weighted])
+        impacts = bytes(impact for impact, _ in weighted)
+        postings_blob += zlib.compress(docs_array.tobytes() + impacts)
+        post_offsets.append(len(postings_blob))
+        dfs.append(len(weighted))
+        max_impacts.append(weighted[0][0])
+
+    docs_blob = zlib.compress(json.dumps(doc_table, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    sections = [docs_blob, term_offsets.tobytes(), post_offsets.tobytes(), dfs.tobytes(),
+                bytes(max_impacts), bytes(terms_blob), bytes(postings_blob), bytes(texts)]
+
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    offsets.append(position)
+
+    tmp = str(path) + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(SEGMENT_MAGIC, len(doc_table), len(terms), avgdl, *offsets))
+        for section in sections:
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _read_manifest(directory):
+    try:
+        with open(Path(directory) / MANIFEST_NAME, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'version': INDEX_VERSION, 'segments': [], 'next': 1}
+    if manifest.get('version') != INDEX_VERSION:
+        # Eski biçimdeki dizin yok sayılır ve baştan kurulur
+        return {'version': INDEX_VERSION, 'segments': [], 'next': manifest.get('next', 1)}
+    return manifest
+
+
+def _write_manifest(directory, manifest):
+    path = Path(directory) / MANIFEST_NAME
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
+
+
+def _live_map(segments):
+    """evrak id -> (bölüt sırası, yerel sıra); yeni bölütler eskileri ezer"""
+    live = {}
+    for seg_index, segment in enumerate(segments):
+        for local, doc in enumerate(segment.docs):
+            live[doc[0]] = (seg_index, local)
+    return live
+
+
+class IndexWriter:
+    """Dizine evrak ekleyen/çıkaran yazıcı
+
+    Eklenen evraklar ``commit``'e kadar sıkıştırılmış ``UDFDocument``
+    olarak bekletilir. Her ``commit`` bekleyen değişiklikleri yeni bir bölüt olarak yazar;
+    bölüt sayısı ``MAX_SEGMENTS``'i aşınca veya eskimiş kopyalar
+    çoğalınca canlı evraklar saklanan metinlerinden tek bölütte yeniden
+    dizinlenir. Aynı anda tek yazıcı
+    çalışmalıdır (toplu dönüştürücü); okuyucular etkilenmez.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest = _read_manifest(self.directory)
+        self.segments = [Segment(self.directory / name) for name in self.manifest['segments']]
+        self._stamps = {}
+        for seg_index, local in _live_map(self.segments).values():
+            doc = self.segments[seg_index].docs[local]
+            if doc[2] >= 0:
+                self._stamps[doc[0]] = doc[1]
+        self._pending = {}
+        self._pending_bytes = 0
+
+    def ids(self):
+        return set(self._stamps) | {k for k, v in self._pending.items() if v is not None}
+
+    def needs_update(self, doc_id, stamp):
+        if doc_id in self._pending:
+            return False
+        return self._stamps.get(doc_id) != stamp
+
+    def add(self, doc_id, document, stamp=''):
+        self._pending[doc_id] = (stamp, document)
+        self._pending_bytes += document.nbytes()
+        if self._pending_bytes > FLUSH_BYTES:
+            self.commit()
+
+    def remove(self, doc_id):
+        if doc_id in self._stamps or doc_id in self._pending:
+            self._pending[doc_id] = None
+
+    def commit(self):
+        """Bekleyen değişiklikleri yeni bölüt olarak yaz"""
+        if not self._pending:
+            return 0
+        # Metinler bölüt yazılırken birer birer çözülür
+        name = self._new_segment(
+            (doc_id, entry[0], entry[1].text()) if entry else (doc_id, '', None)
+            for doc_id, entry in self._pending.items()
+        )
+        for doc_id, entry in self._pending.items():
+            if entry is None:
+                self._stamps.pop(doc_id, None)
+            else:
+                self._stamps[doc_id] = entry[0]
+        self.segments.append(Segment(self.directory / name))
+        self.manifest['segments'].append(name)
+        count = len(self._pending)
+        self._pending = {}
+        self._pending_bytes = 0
+
+        # Güncellenen/silinen evrakların eski kopyaları sorguları da yavaşlatır
+        stored = sum(len(segment.docs) for segment in self.segments)
+        if len(self.segments) > MAX_SEGMENTS or stored > 1.5 * len(self._stamps) + 100:
+            self.merge()
+        else:
+            _write_manifest(self.directory, self.manifest)
+        return count
+
+    def merge(self):
+        """Tüm bölütleri yalnızca canlı evrakları içeren tek bölütte birleştir"""
+        docs = []
+        for seg_index, local in _live_map(self.segments).values():
+            segment = self.segments[seg_index]
+            doc = segment.docs[local]
+            if doc[2] >= 0:
+                docs.append((doc[0], doc[1], segment.text(local)))
+        name = self._new_segment(docs)
+        self.manifest['segments'] = [name]
+        _write_manifest(self.directory, self.manifest)
+
+        for segment in self.segments:
+            segment.close()
+        self.segments = [Segment(self.directory / name)]
+        # Manifestte olmayan bölütler (yarım kalmış yazımlar dahil) silinir
+        for path in self.directory.glob('seg-*.idx'):
+            if path.name != name:
+                try:
+                    path.unlink()
+                except OSError:
+                    # Windows'ta okuyucu hâlâ eşlemiş olabilir; sonraki birleştirmede silinir
+                    pass
+
+    def _new_segment(self, docs):
+        name = f"seg-{self.manifest['next']:06d}.idx"
+        self.manifest['next'] += 1
+        write_segment(self.directory / name, docs)
+        return name
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+
+
+class IndexReader:
+    """mmap ile açılan, sorgu başına milisaniyeler süren dizin okuyucu
+
+    Manifest değiştiğinde (en fazla saniyede bir denetlenir) bölütler
+    yeniden açılır; böylece dönüştürücünün eklediği evraklar sunucu
+    yeniden başlatılmadan aranabilir.
+    """
+
+    def __init__(self, directory, refresh_interval=1.0):
+        self.directory = Path(directory)
+        self.refresh_interval = refresh_interval
+        self._state = ([], [], 0)
+        self._manifest_mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked < self.refresh_interval:
+            return
+        with self._lock:
+            self._checked = now
+            try:
+                mtime = os.stat(self.directory / MANIFEST_NAME).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self._manifest_mtime:
+                return
+            manifest = _read_manifest(self.directory)
+            try:
+                segments = [Segment(self.directory / name) for name in manifest['segments']]
+            except FileNotFoundError:
+                # Yazıcı tam o anda birleştiriyor; bir sonraki denemede açılır
+                return
+            live = _live_map(segments)
+            dead = [set() for _ in segments]
+            count = 0
+            for seg_index, segment in enumerate(segments):
+                for local, doc in enumerate(segment.docs):
+                    if doc[2] < 0 or live[doc[0]] != (seg_index, local):
+                        dead[seg_index].add(local)
+                    else:
+                        count += 1
+            # Eski bölütler kapatılmaz: süren sorgular onları kullanıyor
+            # olabilir, eşlemeler çöp toplayıcıyla bırakılır
+            self._state = (segments, dead, count)
+            self._manifest_mtime = mtime
+
+    def __len__(self):
+        self.refresh()
+        return self._state[2]
+
+    def search(self, query, limit=20):
+        """Sorguya uyan evrakları puana göre sıralı döndür
+
+        Tüm terimler geçmelidir (VE); son terim sorgu boşlukla bitmiyorsa
+        önek olarak eşleşir. Sonuçlar (id, puan, özet HTML) sözlükleridir.
+        """
+        self.refresh()
+        segments, dead, total = self._state
+        terms = tokenize(query)
+        if not terms or not total:
+            return []
+        prefix_last = not query[-1:].isspace() and len(terms[-1]) >= 3
+        encoded = [t.encode('utf-8') for t in terms]
+
+        # Terim grupları: her bölütte (terim sıraları) ve toplam belge sıklığı
+        lookups = []
+        for gi, term in enumerate(encoded):
+            is_prefix = prefix_last and gi == len(encoded) - 1
+            per_segment = []
+            df = 0
+            for segment in segments:
+                ids = list(segment.prefix_range(term)) if is_prefix else [i for i in [segment.find(term)] if i >= 0]
+                per_segment.append(ids)
+                if ids:
+                    df += max(segment.df(i) for i in ids)
+            if df == 0:
+                return []
+            # Eskimiş kopyalar da sayıldığından üstten sınırlanır
+            df = min(df, total)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            lookups.append((idf, per_segment))
+
+        candidates = []
+        for seg_index, segment in enumerate(segments):
+            groups = []
+            for idf, per_segment in lookups:
+                ids = per_segment[seg_index]
+                if not ids:
+                    break
+                groups.append((idf, ids))
+            else:
+                candidates.extend(self._top_k(segment, seg_index, groups, dead[seg_index], limit))
+
+        candidates.sort(key=lambda c: -c[0])
+        results = []
+        for score, seg_index, local in candidates[:limit]:
+            segment = segments[seg_index]
+            results.append({
+                'id': segment.docs[local][0],
+                'score': round(score, 3),
+                'snippet': snippet(segment.text(local), terms, prefix_last),
+            })
+        return results
+
+    @staticmethod
+    def _top_k(segment, seg_index, groups, dead, limit):
+        """Eşik algoritmasıyla bölütteki en iyi ``limit`` evrak
+
+        En seyrek terim grubunun listesi ağırlık sırasıyla gezilir (önek
+        grubunda listeler tembel olarak birleştirilir); diğer gruplar için
+        yalnızca sözlükten okuma yapılır. Kalan kayıtların alabileceği en
+        yüksek puan mevcut k. puanın altına düşünce durulur.
+        """
+        groups = sorted(groups, key=lambda g: sum(segment.df(i) for i in g[1]))
+        idf, ids = groups[0]
+        lists = [segment.postings(i) for i in ids]
+        if len(lists) == 1:
+            stream = zip(lists[0][1], lists[0][0])
+        else:
+            stream = heapq.merge(*(zip(impacts, docs) for docs, impacts in lists), reverse=True)
+
+        others = []
+        bound_rest = 0.0
+        for g_idf, g_ids in groups[1:]:
+            weights = []
+            for i in g_ids:
+                docs, impacts = segment.postings(i)
+                weights.append(dict(zip(docs, impacts)))
+            others.append((g_idf, weights))
+            bound_rest += g_idf * max(segment.max_impact(i) for i in g_ids)
+
+        heap = []
+        seen = set()
+        for impact, doc in stream:
+            score = idf * impact
+            if len(heap) >= limit and score + bound_rest <= heap[0][0]:
+                break
+            # Önek grubunda aynı evrak birden çok terimden gelebilir
+            if doc in dead or doc in seen:
+                continue
+            seen.add(doc)
+            for g_idf, weights in others:
+                w = max(d.get(doc, 0) for d in weights)
+                if not w:
+                    break
+                score += g_idf * w
+            else:
+                if len(heap) < limit:
+                    heapq.heappush(heap, (score, seg_index, doc))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, seg_index, doc))
+        return heap
+
+
+def snippet(text, terms, prefix_last=False, width=160):
+    """Terimlerin ilk geçtiği yer çevresinden vurgulu kısa özet (HTML)"""
+    folded = fold(text)
+    patterns = []
+    for i, term in enumerate(terms):
+        suffix = r'\w*' if prefix_last and i == len(terms) - 1 else r'(?!\w)'
+        patterns.append(r'(?<!\w)' + re.escape(term) + suffix)
+    matcher = re.compile('|'.join(patterns))
+
+    first = matcher.search(folded)
+    center = first.start() if first else 0
+    start = max(0, center - width // 3)
+    end = min(len(text), start + width)
+    # Kelime ortasından başlamasın
+    if start > 0:
+        space = text.find(' ', start, center)
+        start = space + 1 if space >= 0 else start
+    window = folded[start:end]
+
+    parts = []
+    pos = 0
+    for match in matcher.finditer(window):
+        parts.append(html.escape(text[start + pos:start + match.start()]))
+        parts.append('<mark>' + html.escape(text[start + match.start():start + match.end()]) + '</mark>')
+        pos = match.end()
+    parts.append(html.escape(text[start + pos:end]))
+    result = ' '.join(''.join(parts).split())
+    return ('…' if start > 0 else '') + result + ('…' if end < len(text) else '')
+
+
+def sync_documents(udf_files, sinks, removed_ids=None, documents=None):
+    """Kaynak evrakları metin tüketicilerine (dizin, alan deposu) aktar
+
+    Her evrak, en az bir tüketici için yeni veya değişmişse bir kez
+    okunup ``UDFDocument`` olarak tüketicilere verilir; ``documents``
+    (evrak kimliği -> belge) dönüşüm sırasında çıkarılmış belgeleri
+    taşır, bunlar yeniden okunmaz. Tüketiciler ``IndexWriter`` arayüzünü
+    izler (needs_update/add/remove/ids/commit). ``removed_ids`` verilirse
+    ``udf_files`` tüm dizin değil yalnızca değişen evraklar sayılır ve
+    yalnızca bu kimlikler silinir. (işlenen, silinen) döndürür.
+    """
+    names = set()
+    processed = 0
+    for udf_file in udf_files:
+        names.add(udf_file.stem)
+        stamp = document_stamp(udf_file)
+        document = documents.pop(udf_file.stem, None) if documents else None
+        stale = [sink for sink in sinks if sink.needs_update(udf_file.stem, stamp)]
+        if not stale:
+            continue
+        try:
+            if document is None:
+                # Arşiv olmayan içerikler boş metinle dizinlenir; her çalışmada yeniden denenmez
+                document = UDFDocument.from_file(udf_file)
+        except (zipfile.BadZipFile, OSError, ValueError, BudgetExceeded) as e:
+            print(f"⚠️  {udf_file.name} metni çıkarılamadı: {e}")
+            continue
+        for sink in stale:
+            sink.add(udf_file.stem, document, stamp)
+        processed += 1
+
+    removed = set()
+    for sink in sinks:
+        stale_ids = sink.ids() - names if removed_ids is None else set(removed_ids)
+        for doc_id in stale_ids:
+            sink.remove(doc_id)
+            removed.add(doc_id)
+    for sink in sinks:
+        sink.commit()
+    return processed, len(removed)
+
+
+def update_index(directory, udf_files):
+    """Dizini kaynak evraklara göre güncelle: (eklenen, silinen)"""
+    writer = IndexWriter(directory)
+    try:
+        return sync_documents(udf_files, [writer])
+    finally:
+        writer.close()
+
+
+def main(argv=None, prog=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Evrak tam metin arama dizini')
+    parser.add_argument('query', nargs='?', help='Aranacak metin (verilmezse dizin güncellenir)')
+    parser.add_argument('--dir', default=f'evraklar_pdf/{INDEX_DIR_NAME}', help='Dizin klasörü')
+    parser.add_argument('--source', default='evraklar_kaynak', help='UDF klasörü')
+    args = parser.parse_args(argv)
+
+    if args.query:
+        started = time.perf_counter()
+        results = IndexReader(args.dir).search(args.query)
+        print(f"{len(results)} sonuç ({(time.perf_counter() - started) * 1000:.1f} ms)")
+        for r in results:
+            print(f"  {r['id']}  {r['score']:.2f}  {re.sub(r'</?mark>', '', html.unescape(r['snippet']))}")
+    else:
+        added, removed = update_index(args.dir, sorted(Path(args.source).glob('*.udf')))
+        print(f"✓ Arama dizini güncellendi: {added} eklendi, {removed} silindi")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,320 @@
 import http.server
-import socketserver
+import json
 import webbrowser
 import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import metrics
+from evrak_budget import Quarantine
+from evrak_catalog import EvrakCatalog
+from evrak_dispatch import engine_for, publish_file, sniff_type
+from pdf_cache import PDFCache, SingleFlight, source_fingerprint
+from search_index import INDEX_DIR_NAME, IndexReader
+from static_assets import CACHE_IMMUTABLE, CACHE_REVALIDATE, NotAcceptable, asset_version, is_compressible, negotiate
 
 PORT = 8000
 
+SOURCE_DIR = Path('evraklar_kaynak')
+PDF_DIR = Path('evraklar_pdf')
+CACHE_DIR = Path(os.environ.get('EVRAK_CACHE_DIR', '.evrak_cache'))
+CACHE_MAX_BYTES = int(os.environ.get('EVRAK_CACHE_MB', '512')) * 1024 * 1024
+# EVRAK_LINEARIZE=1: istek üzerine dönüştürülen PDF'ler doğrusallaştırılır
+LINEARIZE = os.environ.get('EVRAK_LINEARIZE', '0') == '1'
+# EVRAK_COMPACT=1: küçük çıktı profili (ipuçsuz font alt kümeleri, yalnızca Flate)
+COMPACT = os.environ.get('EVRAK_COMPACT', '0') == '1'
+
+# /evrak/<id>.pdf - kimlik yalnızca güvenli karakterlerden oluşabilir
+LAZY_PDF_PATH = re.compile(r'^/evrak/([A-Za-z0-9_-]+)\.pdf$')
+# Ölçümlerde ayrı rota etiketi alan uç noktalar
+API_ROUTES = frozenset(['/api/evraklar', '/api/search', '/api/bundle', '/metrics'])
+EVRAK_ID = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# /api/bundle: bir istekte birleştirilebilecek en çok evrak ve yanıt parça boyu
+BUNDLE_MAX_IDS = 200
+BUNDLE_CHUNK_SIZE = 64 * 1024
+
+_cache = None
+_catalog = None
+_search = None
+_flight = SingleFlight()
+_pool = None
+_pool_lock = threading.Lock()
+# Karantina kaydı toplu dönüştürücüyle ortaktır; sunucu her yazımda
+# kaydı yeniden okur, aradaki girdileri ezmez
+_quarantine_lock = threading.Lock()
+# Tembel kurulan önbellek, katalog ve dizin: aynı anda gelen ilk istekler
+# iki ayrı örnek (ve iki ayrı bayt sayacı) kurmasın
+_init_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _init_lock:
+        if _cache is None:
+            _cache = PDFCache(CACHE_DIR, CACHE_MAX_BYTES)
+        return _cache
+
+
+def get_catalog():
+    global _catalog
+    with _init_lock:
+        if _catalog is None:
+            _catalog = EvrakCatalog(PDF_DIR, SOURCE_DIR)
+        return _catalog
+
+
+def get_search_index():
+    global _search
+    with _init_lock:
+        if _search is None:
+            _search = IndexReader(PDF_DIR / INDEX_DIR_NAME)
+        return _search
+
+
+def _get_pool():
+    """Dönüşümler için süreç havuzu (ilk istekte başlatılır)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from render_profile import get_render_profile
+            _pool = ProcessPoolExecutor(initializer=get_render_profile, initargs=(COMPACT,))
+        return _pool
+
+
+class Quarantined(RuntimeError):
+    """Evrak kaynak sınırını aştığı için (değişene kadar) dönüştürülmüyor"""
+
+
+def quarantine_reason(udf_file):
+    """Kaynak karantinada ve değişmemişse nedeni, değilse None"""
+    with _quarantine_lock:
+        quarantine = Quarantine(PDF_DIR)
+    if not quarantine.holds(udf_file):
+        return None
+    return quarantine.entries[udf_file.name]['reason']
+
+
+def quarantine_source(udf_file, exceeded):
+    """Sınırı aşan kaynağı karantina kaydına ekle"""
+    with _quarantine_lock:
+        quarantine = Quarantine(PDF_DIR)
+        quarantine.add(udf_file, exceeded)
+        try:
+            quarantine.save()
+        except OSError as e:
+            print(f"⚠️  Karantina kaydı yazılamadı: {e}")
+
+
+def convert_to_cache(evrak_id, udf_file, key):
+    """UDF'i ayrı süreçte dönüştür ve sonucu önbelleğe koy
+
+    Karantinadaki (sınırı aşmış, o zamandan beri değişmemiş) evrak yeniden
+    dönüştürülmez, işçi tutmadan ``Quarantined`` atılır.
+    """
+    from create_professional_pdf import _convert_in_worker
+
+    reason = quarantine_reason(udf_file)
+    if reason is not None:
+        raise Quarantined(reason)
+    cache = get_cache()
+    # Kaynağı değişmiş evrakın eski çıktıları yer kaplamasın
+    cache.discard_document(evrak_id)
+    work_dir = tempfile.mkdtemp(prefix='.tmp-', dir=cache.cache_dir)
+    try:
+        pdf_path = Path(work_dir) / (udf_file.stem + '.pdf')
+        # Zaten PDF olan evrak işçi süreç beklemeden önbelleğe bağlanır
+        if engine_for(sniff_type(udf_file)) == 'passthrough':
+            publish_file(udf_file, pdf_path)
+            return cache.put(key, pdf_path)
+        ok, output, record, exceeded, _ = _get_pool().submit(_convert_in_worker, str(udf_file), work_dir,
+                                                             linearize=LINEARIZE, compact=COMPACT).result()
+        metrics.record_document(record)
+        if exceeded is not None:
+            quarantine_source(udf_file, exceeded)
+            raise Quarantined(exceeded.reason)
+        if not ok or not pdf_path.exists():
+            raise RuntimeError(output.strip() or 'dönüştürme başarısız')
+        return cache.put(key, pdf_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def lazy_key(evrak_id, udf_file):
+    """Kaynağın parmak izi (ETag) ve önbellek anahtarı"""
+    from create_professional_pdf import manifest_version
+    etag_value = source_fingerprint(udf_file, manifest_version(linearize=LINEARIZE, compact=COMPACT))
+    return etag_value, f'{evrak_id}-{etag_value}'
+
+
+def bundle_source(evrak_id):
+    """Birleştirilecek evrakın PDF yolu; yoksa None
+
+    Hazır çıktı yoksa kaynak UDF önbellekten (gerekirse dönüştürülerek)
+    kullanılır.
+    """
+    pdf_path = PDF_DIR / f'{evrak_id}.pdf'
+    if pdf_path.is_file():
+        return pdf_path
+    udf_file = SOURCE_DIR / f'{evrak_id}.udf'
+    if not udf_file.is_file():
+        return None
+    _, key = lazy_key(evrak_id, udf_file)
+    pdf_path = get_cache().get(key)
+    if pdf_path is None:
+        pdf_path, _ = _flight.do(key, lambda: convert_to_cache(evrak_id, udf_file, key))
+    return pdf_path
+
+
+class ChunkedWriter:
+    """Yanıt gövdesini HTTP/1.1 parçalı aktarımla (chunked) yazar"""
+
+    def __init__(self, wfile, size=BUNDLE_CHUNK_SIZE):
+        self.wfile = wfile
+        self.size = size
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(self.buffer), self.buffer))
+            self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+
+def etag_matches(header, etag):
+    """If-None-Match başlığı verilen ETag ile (zayıf karşılaştırma) eşleşiyor mu?"""
+    if header.strip() == '*':
+        return True
+    tags = [t.strip() for t in header.split(',')]
+    return etag in [t[2:] if t.startswith('W/') else t for t in tags]
+
+
+def parse_range(header, size):
+    """Tek aralıklı 'bytes=' başlığını (başlangıç, bitiş) çiftine çevir
+
+    Başlık yoksa veya desteklenmiyorsa (çoklu aralık) None, karşılanamayan
+    aralıkta ValueError döner.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    first, _, last = header[6:].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # 'bytes=-500': son 500 bayt
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, min(end, size - 1)
+
+
+class EvrakHTTPServer(http.server.ThreadingHTTPServer):
+    """Her bağlantıyı ayrı iş parçacığında işleyen sunucu"""
+
+    # Çok sayıda eşzamanlı istemcide bağlantılar kuyrukta düşmesin
+    request_queue_size = 128
+
+
+def _watch_status():
+    try:
+        with open(PDF_DIR / '.watch.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def metrics_text():
+    """/metrics yanıtı: sunucu ölçümleri, son dönüşüm çalışması ve anlık göstergeler"""
+    registry = metrics.REGISTRY
+    registry.set('evrak_pdf_cache_bytes', get_cache().total_bytes)
+    registry.set('evrak_catalog_documents', len(get_catalog()))
+
+    # İsabet oranları sayaçlardan türetilir
+    requests = {}
+    for name, labels, value in registry.snapshot()['counters']:
+        if name == 'evrak_cache_requests_total':
+            requests.setdefault(labels['cache'], {})[labels['result']] = value
+    for cache, counts in requests.items():
+        total = sum(counts.values())
+        if total:
+            registry.set('evrak_cache_hit_ratio', round(counts.get('hit', 0) / total, 4), cache=cache)
+
+    watch = _watch_status()
+    if watch:
+        registry.set('evrak_watch_queue_depth', watch.get('queued', 0) + watch.get('running', 0))
+        registry.set('evrak_watch_oldest_wait_seconds', watch.get('oldest_wait_s', 0.0))
+        if watch.get('last_lag_s') is not None:
+            registry.set('evrak_watch_last_lag_seconds', watch['last_lag_s'])
+
+    sources = [(registry.snapshot(), {'source': 'server'})]
+    last_run = metrics.last_run(PDF_DIR)
+    if last_run:
+        sources.append((metrics.last_run_snapshot(last_run), {'source': 'batch'}))
+    return metrics.render_prometheus(sources)
+
+
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Kalıcı (keep-alive) bağlantılar; boşta bekleyen bağlantı kapatılır
+    protocol_version = 'HTTP/1.1'
+    timeout = 30
+    status = None
+
+    def send_response(self, code, message=None):
+        self.status = code
+        super().send_response(code, message)
+
+    def route(self, path):
+        """Ölçüm etiketi olarak kullanılan kaba rota adı
+
+        Etiket değerleri sabit bir kümeden gelir; bilinmeyen adresler tek
+        ``other`` serisine düşer, istemci yeni zaman serisi açamaz.
+        """
+        if path in API_ROUTES:
+            return path
+        if path.startswith('/api/'):
+            return 'other'
+        if LAZY_PDF_PATH.match(path):
+            return '/evrak/{id}.pdf'
+        if path.startswith('/evraklar_pdf/'):
+            return '/evraklar_pdf/'
+        return 'static'
+
+    def timed(self, handler):
+        """İsteği işle ve süresini rota, yöntem ve durum koduna göre kaydet"""
+        if not metrics.ENABLED:
+            handler()
+            return
+        self.status = None
+        started = time.perf_counter()
+        try:
+            handler()
+        finally:
+            metrics.REGISTRY.observe(
+                'evrak_http_request_seconds', time.perf_counter() - started,
+                route=self.route(urlsplit(self.path).path), method=self.command,
+                status=str(self.status or 0),
+            )
+
     def end_headers(self):
         # CORS ve PDF görüntüleme için gerekli header'lar
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -14,7 +322,347 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         super().end_headers()
 
-def start_server():
+    def do_GET(self):
+        self.timed(self.handle_get)
+
+    def do_HEAD(self):
+        self.timed(self.handle_head)
+
+    def handle_get(self):
+        if (not self.send_api(include_body=True) and not self.send_lazy_pdf(include_body=True)
+                and not self.send_static(include_body=True)):
+            super().do_GET()
+
+    def handle_head(self):
+        if (not self.send_api(include_body=False) and not self.send_lazy_pdf(include_body=False)
+                and not self.send_static(include_body=False)):
+            super().do_HEAD()
+
+    def send_api(self, include_body):
+        """API uç noktalarını yanıtla; adres bir uç nokta değilse False
+
+        HEAD istekleri aynı işleyicilerden geçer, yalnızca gövde yazılmaz.
+        """
+        handler = {
+            '/api/evraklar': self.send_catalog,
+            '/api/search': self.send_search,
+            '/api/bundle': self.send_bundle,
+            '/metrics': self.send_metrics,
+        }.get(urlsplit(self.path).path)
+        if handler is None:
+            return False
+        handler(include_body)
+        return True
+
+    def cache_control(self, version):
+        """Adresteki ?v= değeri güncel sürümse kalıcı, değilse doğrulamalı önbellek"""
+        requested = parse_qs(urlsplit(self.path).query).get('v')
+        return CACHE_IMMUTABLE if requested and requested[0] == version else CACHE_REVALIDATE
+
+    def not_modified(self, etag, mtime=None, headers=None):
+        """İstemcinin kopyası güncelse 304 gönder ve True döndür"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            fresh = etag_matches(if_none_match, etag)
+        elif mtime is not None and self.headers.get('If-Modified-Since'):
+            try:
+                since = parsedate_to_datetime(self.headers['If-Modified-Since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+            fresh = int(mtime) <= since
+        else:
+            return False
+        if metrics.ENABLED:
+            metrics.REGISTRY.inc('evrak_cache_requests_total', cache='client', result='hit' if fresh else 'miss')
+        if not fresh:
+            return False
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        return True
+
+    def send_static(self, include_body):
+        """Normal dosyaları gönder; dizinleri üst sınıfa bırak
+
+        Metin dosyaları istemcinin kabul ettiği önceden sıkıştırılmış
+        kopyadan gönderilir. Her yanıtta dosya sürümünden ETag ve
+        Last-Modified bulunur.
+        """
+        url_path = urlsplit(self.path).path
+        if url_path.endswith('/'):
+            return False
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return False
+        try:
+            content_type = self.guess_type(path)
+            version = asset_version(path, content_type)
+            mtime = os.stat(path).st_mtime
+            body_path, encoding = negotiate(path, content_type, self.headers.get('Accept-Encoding'),
+                                            self.directory, CACHE_DIR)
+            # Her kodlama ayrı bir temsil olduğundan ETag'i de ayrıdır
+            etag = f'"{version}-{encoding}"' if encoding else f'"{version}"'
+            headers = {
+                'Cache-Control': self.cache_control(version),
+                'Last-Modified': formatdate(mtime, usegmt=True),
+            }
+            if is_compressible(content_type):
+                headers['Vary'] = 'Accept-Encoding'
+            if self.not_modified(etag, mtime, headers):
+                return True
+            if encoding:
+                headers['Content-Encoding'] = encoding
+            self.send_file(body_path, content_type, include_body, etag=etag, headers=headers)
+        except NotAcceptable:
+            self.send_error(406, explain='Kabul edilen kodlamada kopya yok')
+        except OSError:
+            self.send_error(404, explain='Dosya bulunamadı')
+        return True
+
+    def send_file(self, path, content_type, include_body, etag=None, headers=None):
+        """Dosyayı 'Range' isteklerini karşılayarak gönder
+
+        Tek aralıklı isteklere 206, karşılanamayan aralığa 416 döner.
+        Gövde mümkünse ``sendfile`` ile çekirdek içinde kopyalanır.
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            byte_range = None
+            # If-Range eşleşmezse dosya değişmiştir, tamamı gönderilir
+            if_range = self.headers.get('If-Range')
+            if not if_range or if_range == etag:
+                try:
+                    byte_range = parse_range(self.headers.get('Range'), size)
+                except ValueError:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{size}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+            if byte_range is None:
+                start, length = 0, size
+                self.send_response(200)
+            else:
+                start, length = byte_range[0], byte_range[1] - byte_range[0] + 1
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {byte_range[0]}-{byte_range[1]}/{size}')
+
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(length))
+            self.send_header('Accept-Ranges', 'bytes')
+            if etag:
+                self.send_header('ETag', etag)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+
+            if include_body and length:
+                try:
+                    self.copy_range(f, start, length)
+                except OSError:
+                    # İstemci (ör. PDF görüntüleyici) isteği yarıda kesti ya da
+                    # zaman aşımına uğradı. Başlıklar gittiği için hata yanıtı
+                    # gönderilemez; eksik gövdeli bağlantı kapatılır.
+                    self.close_connection = True
+
+    def copy_range(self, f, offset, length):
+        """Dosya aralığını sokete yaz
+
+        ``socket.sendfile`` zaman aşımlı (bloklamayan) sokette dolan gönderme
+        tamponunu bekler; sendfile olmayan platformlarda (Windows) parça
+        parça ``send`` ile yazar.
+        """
+        sent = self.connection.sendfile(f, offset, length)
+        if sent < length:
+            # Dosya bu arada kısaldı; Content-Length tutmayacak
+            raise ConnectionAbortedError('dosya beklenenden kısa')
+
+    def send_json(self, status, data, include_body=True):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def send_metrics(self, include_body):
+        """/metrics - Prometheus metin biçiminde ölçümler"""
+        if not metrics.ENABLED:
+            self.send_error(404, explain='Ölçümler kapalı (EVRAK_METRICS=0)')
+            return
+        body = metrics_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def send_catalog(self, include_body):
+        """/api/evraklar?q=&sort=id|mtime&order=asc|desc&cursor=&limit="""
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        try:
+            page = get_catalog().page(
+                q=params.get('q', ''),
+                sort=params.get('sort', 'id'),
+                order=params.get('order', 'asc'),
+                cursor=params.get('cursor'),
+                limit=params.get('limit', 100),
+            )
+        except (ValueError, TypeError) as e:
+            self.send_json(400, {'error': str(e)}, include_body)
+            return
+        self.send_json(200, page, include_body)
+
+    def send_search(self, include_body):
+        """/api/search?q=&limit= - evrak metinlerinde tam metin arama"""
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        query = params.get('q', '')
+        try:
+            limit = max(1, min(int(params.get('limit', 20)), 100))
+        except ValueError:
+            self.send_json(400, {'error': 'geçersiz limit'}, include_body)
+            return
+        started = time.perf_counter()
+        results = get_search_index().search(query, limit)
+        catalog = get_catalog()
+        catalog.refresh()
+        for result in results:
+            result['dosya'] = catalog.item(result['id'])['dosya']
+        self.send_json(200, {
+            'query': query,
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 2),
+        }, include_body)
+
+    def send_bundle(self, include_body):
+        """/api/bundle?ids=a,b,c&title= - seçilen evrakları tek PDF'te birleştir
+
+        Her evrak bir yer imidir. Kimlikler başlıklardan önce yalnızca
+        varlık ve karantina için denetlenir; hazır PDF'i olmayan evraklar
+        sırası gelince dönüştürülür ve gövde evraklar kopyalandıkça parçalı
+        aktarımla gönderilir. Başlıklardan sonra dönüştürülemeyen evrak
+        atlanır; yanıt yarıda kalırsa bağlantı kapatılır (istemci eksik
+        gövdeyi beklemez).
+        """
+        from pdf_bundle import bundle_files
+
+        params = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        ids = [i for i in params.get('ids', '').split(',') if i]
+        if not ids or len(ids) > BUNDLE_MAX_IDS or not all(EVRAK_ID.match(i) for i in ids):
+            self.send_json(400, {'error': f'ids 1-{BUNDLE_MAX_IDS} evrak kimliği olmalı'}, include_body)
+            return
+        with _quarantine_lock:
+            quarantine = Quarantine(PDF_DIR)
+        for evrak_id in ids:
+            if (PDF_DIR / f'{evrak_id}.pdf').is_file():
+                continue
+            udf_file = SOURCE_DIR / f'{evrak_id}.udf'
+            if not udf_file.is_file():
+                self.send_json(404, {'error': f'evrak bulunamadı: {evrak_id}'}, include_body)
+                return
+            if quarantine.holds(udf_file):
+                reason = quarantine.entries[udf_file.name]['reason']
+                self.send_json(422, {'error': f'evrak karantinada: {evrak_id} ({reason})'}, include_body)
+                return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Content-Disposition', 'inline; filename="dava_dosyasi.pdf"')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not include_body:
+            # HEAD: evraklar dönüştürülmez
+            return
+        writer = ChunkedWriter(self.wfile)
+
+        def sources():
+            for evrak_id in ids:
+                # Önceki evrakın baytları dönüşüm beklenmeden istemciye gitsin
+                writer.flush()
+                try:
+                    pdf_path = bundle_source(evrak_id)
+                except Exception as e:
+                    print(f"⚠️  Birleştirmede atlandı {evrak_id}: {e}")
+                    continue
+                if pdf_path is not None:
+                    yield pdf_path, evrak_id
+
+        completed = False
+        try:
+            _, _, errors = bundle_files(sources(), writer, params.get('title'))
+            writer.close()
+            completed = True
+        except ConnectionError:
+            # İstemci indirmeyi yarıda kesti
+            return
+        except Exception as e:
+            # Başlıklar gitti; hata yanıtı gönderilemez
+            print(f"✗ Birleştirme yarıda kaldı: {e}")
+            return
+        finally:
+            if not completed:
+                self.close_connection = True
+        for path, error in errors:
+            print(f"⚠️  Birleştirmede atlandı {path}: {error}")
+
+    def send_lazy_pdf(self, include_body):
+        """/evrak/<id>.pdf isteğini önbellekten (gerekirse dönüştürerek) yanıtla
+
+        İstek bu rotaya ait değilse False döndürür.
+        """
+        match = LAZY_PDF_PATH.match(urlsplit(self.path).path)
+        if not match:
+            return False
+
+        evrak_id = match.group(1)
+        udf_file = SOURCE_DIR / f'{evrak_id}.udf'
+        if not udf_file.is_file():
+            self.send_error(404, explain='Evrak bulunamadı')
+            return True
+
+        etag_value, key = lazy_key(evrak_id, udf_file)
+        etag = f'"{etag_value}"'
+
+        headers = {'Cache-Control': self.cache_control(etag_value)}
+
+        # Kaynak değişmediyse istemcideki kopya hâlâ geçerli
+        if self.not_modified(etag, headers=headers):
+            return True
+
+        cache = get_cache()
+        pdf_path = cache.get(key)
+        result = 'hit'
+        if pdf_path is None:
+            try:
+                # Aynı evrak için eşzamanlı ilk istekler tek dönüşümü bekler
+                pdf_path, shared = _flight.do(key, lambda: convert_to_cache(evrak_id, udf_file, key))
+                result = 'shared' if shared else 'miss'
+            except Quarantined as e:
+                self.send_error(422, explain=f'Evrak karantinada: {e}')
+                return True
+            except Exception as e:
+                print(f"✗ {evrak_id}: {e}")
+                self.send_error(500, explain='Dönüştürme başarısız')
+                return True
+        if metrics.ENABLED:
+            metrics.REGISTRY.inc('evrak_cache_requests_total', cache='pdf', result=result)
+
+        try:
+            self.send_file(pdf_path, 'application/pdf', include_body, etag=etag, headers=headers)
+        except FileNotFoundError:
+            # Bu arada önbellekten atılmış olabilir
+            self.send_error(503, explain='Tekrar deneyin')
+        return True
+
+def start_server(port=PORT, open_browser=True):
     """Web sunucusunu başlat"""
     
     # Mevcut dizini kontrol et
@@ -26,24 +674,30 @@ def start_server():
         print("✗ evraklar_pdf klasörü bulunamadı!")
         return
     
+    # Katalog ilk istekten önce hazır olsun
+    get_catalog().refresh()
+
     # Sunucuyu başlat
     Handler = MyHTTPRequestHandler
     
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
-            url = f"http://localhost:{PORT}/evrak_viewer.html"
+        # Uzun süren bir dönüşüm diğer istekleri bekletmesin
+        with EvrakHTTPServer(("", port), Handler) as httpd:
+            url = f"http://localhost:{port}/evrak_viewer.html"
             
             print("="*60)
             print(f"🚀 Evrak Görüntüleyici Başlatıldı!")
             print("="*60)
             print(f"\n📍 Adres: {url}")
             print(f"📁 Dizin: {os.getcwd()}")
-            print(f"\n✅ Tarayıcı otomatik açılacak...")
+            if open_browser:
+                print(f"\n✅ Tarayıcı otomatik açılacak...")
             print(f"\n⚠️  Durdurmak için: CTRL+C\n")
             print("="*60)
             
             # Tarayıcıyı aç
-            webbrowser.open(url)
+            if open_browser:
+                webbrowser.open(url)
             
             # Sunucuyu çalıştır
             httpd.serve_forever()
@@ -52,8 +706,8 @@ def start_server():
         print("\n\n✓ Sunucu durduruldu.")
     except OSError as e:
         if "address already in use" in str(e).lower():
-            print(f"\n✗ Port {PORT} zaten kullanımda!")
-            print(f"Alternatif: http://localhost:{PORT}/evrak_viewer.html adresini tarayıcıda açın")
+            print(f"\n✗ Port {port} zaten kullanımda!")
+            print(f"Alternatif: http://localhost:{port}/evrak_viewer.html adresini tarayıcıda açın")
         else:
             print(f"\n✗ Hata: {e}")
 
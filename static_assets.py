@@ -0,0 +1,206 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from pdf_cache import source_fingerprint
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Sıkıştırmaya değen metin türleri
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+COMPRESSIBLE_SUFFIXES = ('.html', '.htm', '.css', '.js', '.json', '.svg', '.txt')
+
+# Sürüm parametresi (?v=<özet>) içeren adresler hiç değişmez
+CACHE_IMMUTABLE = 'public, max-age=31536000, immutable'
+# Diğerleri her kullanımda ETag ile doğrulanır (değişmediyse 304)
+CACHE_REVALIDATE = 'no-cache'
+
+_versions = {}
+_versions_lock = threading.Lock()
+# Sıkıştırması kazanç sağlamayan kopyalar: {hedef yol: (boyut, mtime_ns)}
+_no_gain = {}
+
+
+class NotAcceptable(ValueError):
+    """İstemci kimlik kodlamasını reddetti ve kabul ettiği bir kopya yok"""
+
+
+def content_version(path):
+    """Dosya içeriğinin kısa özeti; dosya değişmedikçe yeniden hesaplanmaz"""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _versions.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    version = digest.hexdigest()[:16]
+    with _versions_lock:
+        _versions[path] = (stamp, version)
+    return version
+
+
+def asset_version(path, content_type):
+    """Adresteki ?v= değeri ve ETag için dosya sürümü
+
+    Metin varlıkları içerik özetinden (``content_version``); PDF gibi
+    büyük ikili dosyalar okunmadan, boyut ve mtime değerinden
+    (``pdf_cache.source_fingerprint``) sürümlenir.
+    """
+    if is_compressible(content_type):
+        return content_version(path)
+    return source_fingerprint(path, 'static')
+
+
+def is_compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def available_encodings():
+    """(kodlama, uzantı) çiftleri, tercih sırasıyla"""
+    if brotli is not None:
+        return [('br', '.br'), ('gzip', '.gz')]
+    return [('gzip', '.gz')]
+
+
+def accepted_encodings(header):
+    """Accept-Encoding başlığındaki kodlamalar: {kodlama: q}
+
+    Reddedilen (q=0) kodlamalar da döner; ``*`` ve ``identity`` ayrıca
+    değerlendirilir (bkz. ``encoding_quality``).
+    """
+    accepted = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        name = name.strip().lower()
+        if name:
+            accepted[name] = q
+    return accepted
+
+
+def encoding_quality(accepted, encoding):
+    """Kodlamanın q değeri; adı geçmiyorsa ``*`` girdisi geçerlidir
+
+    Adı geçmeyen ``identity`` ``*;q=0`` ile reddedilmedikçe kabul edilir.
+    """
+    if encoding in accepted:
+        return accepted[encoding]
+    if '*' in accepted:
+        return accepted['*'] if encoding != 'identity' or accepted['*'] > 0 else 0.0
+    return 1.0 if encoding == 'identity' else 0.0
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def variant_path(path, root, cache_dir, suffix):
+    """Sıkıştırılmış kopyanın önbellekteki yolu"""
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+    return Path(cache_dir) / 'static' / (relative + suffix)
+
+
+def precompress(path, root, cache_dir):
+    """Dosyanın eskimiş veya eksik sıkıştırılmış kopyalarını üret
+
+    Kopyanın mtime değeri kaynağınkiyle aynı tutulur; böylece güncellik
+    yalnızca ``stat`` ile denetlenir. Kazanç sağlamayan kodlamalar için
+    kopya yazılmaz; bu sonuç kaynağın (boyut, mtime) değerine göre
+    hatırlanır, dosya değişmedikçe her istekte yeniden sıkıştırılmaz.
+    {kodlama: yol} döndürür.
+    """
+    st = os.stat(path)
+    variants = {}
+    data = None
+    for encoding, suffix in available_encodings():
+        target = variant_path(path, root, cache_dir, suffix)
+        try:
+            if os.stat(target).st_mtime_ns == st.st_mtime_ns:
+                variants[encoding] = target
+                continue
+        except FileNotFoundError:
+            pass
+        stamp = (st.st_size, st.st_mtime_ns)
+        if _no_gain.get(target) == stamp:
+            continue
+
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        compressed = _compress(data, encoding)
+        if len(compressed) >= len(data):
+            _no_gain[target] = stamp
+            continue
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(compressed)
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, target)
+        variants[encoding] = target
+    return variants
+
+
+def negotiate(path, content_type, accept_encoding, root, cache_dir):
+    """İstemcinin kabul ettiği en iyi kopyayı seç: (yol, kodlama veya None)
+
+    Kodlamalar q değerine, eşitlikte sunucu tercihine göre sıralanır.
+    Kimlik kodlaması reddedilmiş (``identity;q=0`` veya ``*;q=0``) ve
+    uygun sıkıştırılmış kopya yoksa ``NotAcceptable`` atılır.
+    """
+    if not is_compressible(content_type):
+        return path, None
+    accepted = accepted_encodings(accept_encoding)
+    if not accepted:
+        return path, None
+    candidates = [(encoding_quality(accepted, encoding), -rank, encoding)
+                  for rank, (encoding, _) in enumerate(available_encodings())]
+    candidates = sorted((c for c in candidates if c[0] > 0), reverse=True)
+    if candidates:
+        variants = precompress(path, root, cache_dir)
+        for _, _, encoding in candidates:
+            if encoding in variants:
+                return variants[encoding], encoding
+    if encoding_quality(accepted, 'identity') <= 0:
+        raise NotAcceptable(accept_encoding)
+    return path, None
+
+
+def precompress_tree(root, cache_dir):
+    """Kök dizindeki metin varlıklarını önceden sıkıştır (derleme adımı)"""
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Gizli dizinler (.git, önbellek) atlanır
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != '__pycache__']
+        for name in filenames:
+            if name.endswith(COMPRESSIBLE_SUFFIXES):
+                if precompress(os.path.join(dirpath, name), root, cache_dir):
+                    count += 1
+    return count
+
+
+if __name__ == "__main__":
+    cache_dir = os.environ.get('EVRAK_CACHE_DIR', '.evrak_cache')
+    count = precompress_tree('.', cache_dir)
+    encodings = ', '.join(name for name, _ in available_encodings())
+    print(f"✓ {count} dosya sıkıştırıldı ({encodings}) → {cache_dir}/static")
+    if brotli is None:
+        print("⚠️  brotli modülü yok, yalnızca gzip üretildi (pip install brotli)")
@@ -0,0 +1,77 @@
+import os
+
+from conversion_manifest import JOURNAL_NAME, MANIFEST_NAME, ConversionManifest
+
+
+def convert(tmp_path, name, data=b'icerik'):
+    source = tmp_path / 'kaynak' / f'{name}.udf'
+    source.parent.mkdir(exist_ok=True)
+    source.write_bytes(data)
+    output = tmp_path / 'pdf' / f'{name}.pdf'
+    output.parent.mkdir(exist_ok=True)
+    output.write_bytes(b'%PDF')
+    return source, output
+
+
+def test_unchanged_source_is_up_to_date(tmp_path):
+    source, output = convert(tmp_path, 'evrak_1')
+    manifest = ConversionManifest(output.parent, '1')
+    assert not manifest.is_up_to_date(source, output)
+    manifest.record(source, output)
+    manifest.save()
+
+    reloaded = ConversionManifest(output.parent, '1')
+    assert reloaded.is_up_to_date(source, output)
+    # Dönüştürücü sürümü değişince yeniden üretilir
+    assert not ConversionManifest(output.parent, '2').is_up_to_date(source, output)
+    output.unlink()
+    assert not reloaded.is_up_to_date(source, output)
+
+
+def test_touched_source_is_rehashed_not_reconverted(tmp_path):
+    source, output = convert(tmp_path, 'evrak_1')
+    manifest = ConversionManifest(output.parent, '1')
+    manifest.record(source, output)
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert manifest.is_up_to_date(source, output)
+    assert manifest.entries['evrak_1.pdf']['mtime_ns'] == st.st_mtime_ns + 10 ** 9
+
+    # Aynı boyutta farklı içerik
+    source.write_bytes(b'ICERIK')
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10 ** 9))
+    assert not manifest.is_up_to_date(source, output)
+
+
+def test_interrupted_run_resumes_from_journal(tmp_path):
+    first, first_out = convert(tmp_path, 'evrak_1')
+    second, second_out = convert(tmp_path, 'evrak_2')
+    manifest = ConversionManifest(first_out.parent, '1')
+    manifest.record(first, first_out)
+    manifest.record(second, second_out)
+    # save() çağrılmadan süreç sonlandı; son satır yarım kaldı
+    manifest._journal.write('{"output": "evrak_3.pdf", "sou')
+    manifest._journal.close()
+
+    resumed = ConversionManifest(first_out.parent, '1')
+    assert set(resumed.entries) == {'evrak_1.pdf', 'evrak_2.pdf'}
+    assert resumed.is_up_to_date(second, second_out)
+    resumed.save()
+    assert (first_out.parent / MANIFEST_NAME).exists()
+    assert not (first_out.parent / JOURNAL_NAME).exists()
+
+
+def test_orphans_are_removed_with_their_outputs(tmp_path):
+    first, first_out = convert(tmp_path, 'evrak_1')
+    second, second_out = convert(tmp_path, 'evrak_2')
+    manifest = ConversionManifest(first_out.parent, '1')
+    manifest.record(first, first_out)
+    manifest.record(second, second_out)
+    manifest.save()
+
+    assert manifest.remove_orphans({'evrak_1.udf'}) == ['evrak_2.pdf']
+    assert not second_out.exists() and first_out.exists()
+    assert manifest.remove_source('evrak_1.udf') == ['evrak_1.pdf']
+    # Silme kaydı günlükten de okunur
+    assert ConversionManifest(first_out.parent, '1').entries == {}
@@ -0,0 +1,44 @@
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('reportlab')
+import create_professional_pdf  # noqa: E402
+
+SAMPLES = Path(__file__).resolve().parent.parent / 'evraklar_kaynak'
+# İsim sırası boyut sırasından farklı olacak şekilde seçildi
+NAMES = ['evrak_12452252045.udf', 'evrak_12452252046.udf', 'evrak_12452252095.udf', 'evrak_12454306934.udf']
+
+
+class RecordingExecutor(ProcessPoolExecutor):
+    submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        RecordingExecutor.submitted.append(Path(args[0]).name)
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_run_parallel_schedules_by_size_and_reports_by_name(tmp_path, monkeypatch, capsys):
+    source, output = tmp_path / 'kaynak', tmp_path / 'pdf'
+    source.mkdir()
+    output.mkdir()
+    files = [Path(shutil.copy(SAMPLES / name, source)) for name in NAMES]
+    by_size = [f.name for f in sorted(files, key=lambda f: f.stat().st_size, reverse=True)]
+    assert by_size != NAMES
+
+    monkeypatch.setattr(create_professional_pdf, 'ProcessPoolExecutor', RecordingExecutor)
+    RecordingExecutor.submitted = []
+    successes = []
+    count = create_professional_pdf.run_parallel(
+        list(reversed(files)), output, 2, lambda f, document: successes.append((f.name, document)), fast=True)
+
+    assert count == len(NAMES)
+    assert RecordingExecutor.submitted == by_size
+    assert [name for name, _ in successes] == NAMES
+    assert all(document is not None for _, document in successes)
+    printed = capsys.readouterr().out
+    positions = [printed.index(Path(name).stem) for name in NAMES]
+    assert positions == sorted(positions)
+    assert sorted(p.name for p in output.glob('*.pdf')) == [Path(name).stem + '.pdf' for name in NAMES]
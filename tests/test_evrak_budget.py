@@ -0,0 +1,122 @@
+import os
+import zipfile
+
+import pytest
+
+import evrak_budget
+from evrak_budget import Budget, BudgetExceeded, Quarantine, document_budget, open_archive
+
+
+def make_zip(path, size):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('content.xml', b'a' * size)
+    return path
+
+
+def test_budget_counts_decompressed_bytes():
+    budget = Budget(max_bytes=100, max_member=0, max_seconds=0, max_rss=0)
+    budget.charge(60)
+    with pytest.raises(BudgetExceeded) as info:
+        budget.charge(60)
+    assert info.value.kind == 'document'
+
+
+def test_declared_member_size_is_checked_before_opening(tmp_path, monkeypatch):
+    path = make_zip(tmp_path / 'bomb.udf', 1024 * 1024)
+    monkeypatch.setattr(evrak_budget, 'MEMBER_MAX_BYTES', 1000)
+    with open_archive(path) as zf:
+        with pytest.raises(BudgetExceeded) as info:
+            zf.read('content.xml')
+    assert info.value.kind == 'member'
+
+
+def test_document_budget_is_shared_by_archives(tmp_path, monkeypatch):
+    first = make_zip(tmp_path / 'a.udf', 600)
+    second = make_zip(tmp_path / 'b.udf', 600)
+    monkeypatch.setattr(evrak_budget, 'DOCUMENT_MAX_BYTES', 1000)
+    with document_budget():
+        with open_archive(first) as zf:
+            zf.read('content.xml')
+        with open_archive(second) as zf, pytest.raises(BudgetExceeded):
+            zf.read('content.xml')
+    # Bütçe dışında her arşiv kendi sayacını kullanır
+    with open_archive(second) as zf:
+        assert len(zf.read('content.xml')) == 600
+
+
+def test_budget_exceeded_is_not_swallowed_by_except_exception():
+    with pytest.raises(BudgetExceeded):
+        try:
+            raise BudgetExceeded('time', 'süre sınırı aşıldı')
+        except Exception:
+            pass
+
+
+def test_quarantine_holds_until_source_changes(tmp_path):
+    source = tmp_path / 'evrak_1.udf'
+    source.write_bytes(b'x')
+    quarantine = Quarantine(tmp_path)
+    quarantine.add(source, BudgetExceeded('memory', 'bellek'))
+    quarantine.save()
+
+    reloaded = Quarantine(tmp_path)
+    assert reloaded.holds(source)
+    assert reloaded.entries['evrak_1.udf']['kind'] == 'memory'
+
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+    assert not reloaded.holds(source)
+
+    reloaded.prune(set())
+    reloaded.save()
+    assert Quarantine(tmp_path).entries == {}
+
+
+def test_save_keeps_entries_written_by_others(tmp_path):
+    first, second, third = (tmp_path / f'evrak_{i}.udf' for i in range(3))
+    for path in (first, second, third):
+        path.write_bytes(b'x')
+    seed = Quarantine(tmp_path)
+    seed.add(third, BudgetExceeded('time', 'süre'))
+    seed.save()
+
+    # Toplu çalışma kaydı başta bir kez okur
+    batch = Quarantine(tmp_path)
+    # Bu arada sunucu kendi kopyasıyla bir girdi ekler
+    server = Quarantine(tmp_path)
+    server.add(second, BudgetExceeded('memory', 'bellek'))
+    server.save()
+
+    batch.add(first, BudgetExceeded('document', 'boyut'))
+    batch.release('evrak_2.udf')
+    batch.save()
+    assert set(Quarantine(tmp_path).entries) == {'evrak_0.udf', 'evrak_1.udf'}
+    assert batch.holds(second)
+
+
+def test_batch_quarantines_loose_images(tmp_path, monkeypatch):
+    pytest.importorskip('reportlab')
+    import create_professional_pdf
+
+    (tmp_path / 'evraklar_kaynak').mkdir()
+    (tmp_path / 'evraklar_kaynak' / 'evrak_1.udf').write_bytes(b'not a zip')
+    output_dir = tmp_path / 'evraklar_pdf'
+    output_dir.mkdir()
+    image = output_dir / 'evrak_2.tif'
+    image.write_bytes(b'II*\x00')
+
+    calls = []
+
+    def over_budget(path, target, kind, title=None):
+        calls.append(path)
+        raise BudgetExceeded('time', 'süre sınırı aşıldı')
+
+    monkeypatch.setattr(create_professional_pdf, 'render_image_pdf', over_budget)
+    monkeypatch.chdir(tmp_path)
+    create_professional_pdf.convert_all_udf_to_professional_pdf()
+    assert Quarantine(output_dir).holds(image)
+
+    # Değişmemiş görüntü sonraki çalışmada yeniden denenmez
+    create_professional_pdf.convert_all_udf_to_professional_pdf()
+    assert len(calls) == 1
+    assert Quarantine(output_dir).holds(image)
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from evrak_catalog import CatalogError, EvrakCatalog
+from pdf_cache import source_fingerprint
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    pdf_dir, source_dir = tmp_path / 'pdf', tmp_path / 'kaynak'
+    pdf_dir.mkdir()
+    source_dir.mkdir()
+    return pdf_dir, source_dir
+
+
+def touch(path, mtime_ns, data=b'x'):
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def ids(page):
+    return [item['id'] for item in page['items']]
+
+
+def test_pages_by_cursor_and_filter(dirs):
+    pdf_dir, source_dir = dirs
+    for i in range(5):
+        touch(source_dir / f'evrak_{i}.udf', 10 ** 18 + i)
+    catalog = EvrakCatalog(pdf_dir, source_dir, refresh_interval=0)
+
+    first = catalog.page(limit=2)
+    assert ids(first) == ['evrak_0', 'evrak_1'] and first['total'] == 5
+    second = catalog.page(limit=2, cursor=first['next_cursor'])
+    assert ids(second) == ['evrak_2', 'evrak_3']
+    assert ids(catalog.page(q='_4')) == ['evrak_4']
+    assert catalog.page(q='_4')['matched'] == 1
+    with pytest.raises(CatalogError):
+        catalog.page(cursor='bozuk')
+
+
+def test_item_version_comes_from_file_stat(dirs):
+    pdf_dir, source_dir = dirs
+    pdf = pdf_dir / 'evrak_1.pdf'
+    touch(pdf, 10 ** 18)
+    catalog = EvrakCatalog(pdf_dir, source_dir)
+    catalog.refresh(force=True)
+    item = catalog.item('evrak_1')
+    assert item['pdf'] and item['dosya'].endswith('?v=' + source_fingerprint(pdf, 'static'))
+    assert catalog.item('evrak_2') == {'id': 'evrak_2', 'dosya': 'evrak/evrak_2.pdf', 'pdf': False}
+
+
+def test_mtime_order_follows_files_replaced_in_place(dirs):
+    pdf_dir, source_dir = dirs
+    for i in range(3):
+        touch(pdf_dir / f'evrak_{i}.pdf', 10 ** 18 + i)
+    catalog = EvrakCatalog(pdf_dir, source_dir, refresh_interval=0)
+    assert ids(catalog.page(sort='mtime', order='desc')) == ['evrak_2', 'evrak_1', 'evrak_0']
+
+    # Dönüştürücü çıktıyı geçici dosyaya yazıp adını değiştirir
+    tmp = pdf_dir / '.tmp-evrak_0'
+    touch(tmp, 10 ** 18 + 10, b'yeni')
+    os.replace(tmp, pdf_dir / 'evrak_0.pdf')
+    assert ids(catalog.page(sort='mtime', order='desc')) == ['evrak_0', 'evrak_2', 'evrak_1']
@@ -0,0 +1,36 @@
+import os
+
+from evrak_dispatch import detach_output, engine_for, publish_file, sniff_type
+
+
+def test_sniff_type_ignores_extension(tmp_path):
+    cases = {
+        'zip': b'PK\x03\x04rest',
+        'pdf': b'%PDF-1.7\n',
+        'jpeg': b'\xff\xd8\xff\xe0',
+        'tiff': b'MM\x00*',
+        'png': b'\x89PNG\r\n\x1a\n',
+        'unknown': b'merhaba',
+    }
+    for kind, data in cases.items():
+        path = tmp_path / f'{kind}.udf'
+        path.write_bytes(data)
+        assert sniff_type(path) == kind
+    # PDF imzası çöp baytlardan sonra da gelebilir
+    path = tmp_path / 'late.udf'
+    path.write_bytes(b'\x00' * 100 + b'%PDF-1.4')
+    assert sniff_type(path) == 'pdf'
+    assert engine_for('pdf') == 'passthrough' and engine_for('rtf') is None
+
+
+def test_publish_and_detach_leave_source_intact(tmp_path):
+    source = tmp_path / 'evrak.udf'
+    source.write_bytes(b'%PDF-1.4 kaynak')
+    target = tmp_path / 'evrak.pdf'
+    assert publish_file(source, target) in ('hardlink', 'copy_file_range', 'copy')
+    assert target.read_bytes() == source.read_bytes()
+    assert not [p for p in os.listdir(tmp_path) if p.endswith('.tmp')]
+
+    detach_output(target)
+    target.write_bytes(b'yeni')
+    assert source.read_bytes() == b'%PDF-1.4 kaynak'
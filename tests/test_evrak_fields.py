@@ -0,0 +1,81 @@
+from evrak_fields import FieldStore, extract_fields, parse_amount, parse_date
+from search_index import sync_documents
+from udf_document import UDFDocument
+from udf_reader import _line_paragraphs, read_paragraphs
+
+from test_udf_reader import TEMPLATE, make_udf
+
+PETITION = """ZONGULDAK NÖBETÇİ İŞ MAHKEMESİ'NE
+DAVACI\t\t: Yeliz PAT
+VEKİLİ\t\t: Av. Atakan ERGENİ
+DAVALI\t\t: ALİPAPİLA GIDA A.Ş.
+VEKİLİ\t\t: Av. Şenol KÖKTÜRK
+KONU\t\t: Alacak talebidir.
+H.ESAS DEĞER\t: 1.250,50 TL (Fazlaya ilişkin haklar saklıdır)
+AÇILIŞ TARİHİ\t: 10.07.2025
+Açıklamalar\t: karışık harfli etiket alınmaz
+"""
+
+
+def test_parsers():
+    assert parse_amount('500,00 TL') == 50000
+    assert parse_amount('1.250,5 ₺') == 125050
+    assert parse_amount('tutar yok') is None
+    assert parse_date('11/11/2025 09:57') == '2025-11-11'
+    assert parse_date('32.13.2025') is None
+
+
+def test_extract_fields_binds_counsel_to_party():
+    fields = {name: (value, amount, date) for name, value, amount, date in extract_fields(PETITION)}
+    assert fields['davaci'][0] == 'Yeliz PAT'
+    assert fields['davaci_vekili'][0] == 'Av. Atakan ERGENİ'
+    assert fields['davali_vekili'][0] == 'Av. Şenol KÖKTÜRK'
+    assert fields['esas_deger'][1] == 125050
+    assert fields['dava_tarihi'][2] == '2025-07-10'
+    assert 'vekili' not in fields
+
+
+def test_counsel_without_party_is_skipped():
+    assert extract_fields('Taraf 1\t:\nVEKİLİ\t: Av. X\n') == []
+
+
+def test_placeholders_are_not_stored():
+    assert extract_fields('DAVACI\t: davaciAdSoyad\n') == []
+
+
+def test_store_filters_by_value_amount_and_date(tmp_path):
+    store = FieldStore(tmp_path / 'fields.sqlite')
+    store.add('a', UDFDocument.from_paragraphs(read_paragraphs(make_udf(tmp_path / 'a.udf', TEMPLATE))), '1')
+    store.add('b', _text_document(PETITION), '1')
+    store.commit()
+
+    assert store.find('davaci', 'yeliz') == ['a', 'b']
+    assert store.find('davali', 'alipapila') == ['b']
+    assert store.find('esas_deger', min_amount=100000) == ['b']
+    assert store.find('esas_deger', max_amount=100000) == []
+    assert store.find('dava_tarihi', date_from='2025-07-01', date_to='2025-07-31') == ['b']
+
+    store.remove('b')
+    store.commit()
+    assert store.ids() == {'a'}
+    store.close()
+
+
+def test_sync_uses_documents_from_conversion(tmp_path):
+    udf = make_udf(tmp_path / 'evrak_1.udf', TEMPLATE)
+    store = FieldStore(tmp_path / 'fields.sqlite')
+    # Dönüşümde çıkarılan belge varsa kaynak yeniden okunmaz
+    documents = {'evrak_1': _text_document(PETITION)}
+    assert sync_documents([udf], [store], documents=documents) == (1, 0)
+    assert documents == {}
+    assert store.fields_of('evrak_1')['davali'] == ['ALİPAPİLA GIDA A.Ş.']
+
+    # Belge verilmezse dosyadan okunur (kayıt değişmişse)
+    store._stamps['evrak_1'] = 'eski'
+    assert sync_documents([udf], [store]) == (1, 0)
+    assert store.fields_of('evrak_1') == {'davaci': ['YELİZ PAT']}
+    store.close()
+
+
+def _text_document(text):
+    return UDFDocument.from_paragraphs(_line_paragraphs(text))
@@ -0,0 +1,85 @@
+import io
+import zipfile
+
+from evrak_watcher import Debouncer, PollingWatcher, _looks_complete
+
+
+def udf_bytes():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('content.xml', '<template><content><![CDATA[' + 'Evrak metni. ' * 200 + ']]></content></template>')
+    return buffer.getvalue()
+
+
+def test_looks_complete_rejects_truncated_zip(tmp_path):
+    data = udf_bytes()
+    complete, truncated = tmp_path / 'tam.udf', tmp_path / 'yarim.udf'
+    complete.write_bytes(data)
+    truncated.write_bytes(data[:len(data) // 2])
+    assert _looks_complete(complete)
+    assert not _looks_complete(truncated)
+    assert not _looks_complete(tmp_path / 'yok.udf')
+
+
+def test_file_is_released_after_quiet_period(tmp_path):
+    (tmp_path / 'a.udf').write_bytes(udf_bytes())
+    debouncer = Debouncer(tmp_path, quiet=1.0)
+    debouncer.touch('a.udf', complete=True, now=10.0)
+    assert debouncer.ready(now=10.5) == []
+    # Yeni olay sessiz süreyi yeniden başlatır
+    debouncer.touch('a.udf', complete=True, now=10.8)
+    assert debouncer.ready(now=11.5) == []
+    assert debouncer.next_deadline() == 11.8
+    assert debouncer.ready(now=11.8) == [('a.udf', 10.0, True)]
+    assert len(debouncer) == 0
+
+
+def test_unfinished_write_waits_for_stable_stat(tmp_path):
+    path = tmp_path / 'a.udf'
+    data = udf_bytes()
+    path.write_bytes(data[:100])
+    debouncer = Debouncer(tmp_path, quiet=1.0)
+    debouncer.touch('a.udf', now=0.0)
+    # İlk denetim yalnızca boyutu kaydeder
+    assert debouncer.ready(now=1.0) == []
+    path.write_bytes(data)
+    assert debouncer.ready(now=2.0) == []
+    assert debouncer.ready(now=2.5) == []
+    assert debouncer.ready(now=3.0) == [('a.udf', 0.0, True)]
+
+
+def test_truncated_zip_waits_until_max_wait(tmp_path):
+    data = udf_bytes()
+    (tmp_path / 'a.udf').write_bytes(data[:len(data) // 2])
+    debouncer = Debouncer(tmp_path, quiet=1.0, max_wait=5.0)
+    debouncer.touch('a.udf', complete=True, now=0.0)
+    assert debouncer.ready(now=1.0) == []
+    assert debouncer.ready(now=4.0) == []
+    assert debouncer.ready(now=5.0) == [('a.udf', 0.0, True)]
+
+
+def test_deleted_file_is_reported_missing(tmp_path):
+    debouncer = Debouncer(tmp_path, quiet=1.0)
+    debouncer.touch('a.udf', complete=True, now=0.0)
+    assert debouncer.ready(now=1.0) == [('a.udf', 0.0, False)]
+    assert len(debouncer) == 0
+
+
+def test_polling_watcher_reports_changed_files(tmp_path):
+    (tmp_path / 'eski.udf').write_bytes(b'x')
+    watcher = PollingWatcher(tmp_path, interval=0.01)
+    assert watcher.poll(1.0) == {}
+
+    (tmp_path / 'yeni.udf').write_bytes(b'x')
+    (tmp_path / '.yeni.udf.tmp').write_bytes(b'x')
+    (tmp_path / 'notlar.txt').write_bytes(b'x')
+    (tmp_path / 'eski.udf').write_bytes(b'xx')
+    assert watcher.poll(1.0) == {'yeni.udf': False, 'eski.udf': False}
+
+    (tmp_path / 'yeni.udf').unlink()
+    watcher.interval = 60.0
+    assert watcher.poll(1.0) == {'yeni.udf': False}
+    # Süre dolmadıysa dizin okunmaz
+    (tmp_path / 'eski.udf').unlink()
+    assert watcher.poll(0) == {}
+    watcher.close()
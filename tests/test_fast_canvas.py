@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip('reportlab')
+from fast_canvas import FontMetrics, wrap_segments  # noqa: E402
+from render_profile import register_fonts  # noqa: E402
+
+SIZE = 10
+TEXT = ('Davacı vekili dilekçesinde, müvekkilinin iş sözleşmesinin haksız olarak '
+        'feshedildiğini ileri sürerek kıdem ve ihbar tazminatlarının tahsilini talep etmiştir.')
+
+
+@pytest.fixture
+def metrics():
+    return FontMetrics('Helvetica'), FontMetrics('Helvetica-Bold')
+
+
+def line_width(line, metrics):
+    return sum(metrics[1 if bold else 0].width(text, SIZE) for text, bold in line)
+
+
+def words(lines):
+    return ' '.join(text for line in lines for text, _ in line).split()
+
+
+@pytest.mark.parametrize('max_width', [100, 150, 400])
+def test_wrapped_lines_fit(metrics, max_width):
+    segments = [('Karar:', True), (' ' + TEXT, False), (' HÜKÜM', True), (' ' + TEXT, False)]
+    segments = [(metrics[1 if bold else 0].sanitize(text), bold) for text, bold in segments]
+    lines = wrap_segments(segments, metrics, SIZE, max_width)
+    assert len(lines) > 1
+    for line in lines:
+        assert line_width(line, metrics) <= max_width + 1e-9
+    assert words(lines) == ' '.join(text for text, _ in segments).split()
+    # Kalınlık parçalarla birlikte taşınır
+    assert lines[0][0] == ('Karar:', True)
+
+
+def test_overlong_word_is_split(metrics):
+    word = 'Ticaretsicilimüdürlüğü' * 5
+    lines = wrap_segments([('Bkz. ' + word + ' sonu', False)], metrics, SIZE, 100)
+    for line in lines:
+        assert line_width(line, metrics) <= 100 + 1e-9
+    parts = words(lines)
+    assert len(parts) > 3
+    assert (parts[0], parts[-1]) == ('Bkz.', 'sonu')
+    assert ''.join(parts[1:-1]) == word
+
+
+def test_missing_characters_are_replaced(metrics):
+    regular = metrics[0]
+    assert regular.covers('ç') and not regular.covers('ş')
+    assert regular.sanitize('Çalışma—özeti “ek” …') == 'Çalisma-özeti "ek" ...'
+    # Karşılığı olmayan aksanlı harf temel harfe iner, hiç olmayan atılır
+    assert regular.sanitize('Āli 中 Ōz') == 'Ali  Oz'
+    assert regular.sanitize('düz metin') == 'düz metin'
+
+
+def test_turkish_font_keeps_turkish_letters():
+    name, _, path = register_fonts()
+    if path is None:
+        pytest.skip('Türkçe destekli TTF font yok')
+    ttf = FontMetrics(name)
+    assert ttf.sanitize('ığüşöçİĞÜŞÖÇ') == 'ığüşöçİĞÜŞÖÇ'
+    assert ttf.sanitize('a中b') == 'ab'
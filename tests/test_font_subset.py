@@ -0,0 +1,84 @@
+import struct
+
+import pytest
+
+pytest.importorskip('reportlab')
+from reportlab.pdfbase import pdfmetrics  # noqa: E402
+from reportlab.pdfbase.ttfonts import TTFontFace  # noqa: E402
+
+from font_subset import (CHECKSUM_MAGIC, DROPPED_TABLES, HEAD_CHECKSUM_ADJUSTMENT,  # noqa: E402
+                         HEAD_INDEX_TO_LOC_FORMAT, _checksum, compact_subset, read_tables)
+from render_profile import register_fonts  # noqa: E402
+
+TEXT = 'Türkiye Cumhuriyeti İSTANBUL ığdır ÇĞÖŞÜ çğöşü 0123456789 (§ 5/2-a)'
+
+
+@pytest.fixture
+def compact_font():
+    name, _, path = register_fonts(compact=True)
+    if path is None:
+        pytest.skip('Türkçe destekli TTF font yok')
+    return pdfmetrics.getFont(name)
+
+
+def loca_offsets(tables):
+    loca = tables[b'loca']
+    if struct.unpack_from('>h', tables[b'head'], HEAD_INDEX_TO_LOC_FORMAT)[0] == 1:
+        return struct.unpack(f'>{len(loca) // 4}I', loca)
+    return [o * 2 for o in struct.unpack(f'>{len(loca) // 2}H', loca)]
+
+
+def test_compact_subset_is_a_valid_sfnt(compact_font):
+    subset = sorted(set(map(ord, TEXT)))
+    original = TTFontFace.makeSubset(compact_font.face, subset)
+    data = compact_font.face.makeSubset(subset)
+    assert data == compact_subset(original)
+    assert len(data) < len(original)
+
+    tables = read_tables(data)
+    assert not DROPPED_TABLES & set(tables)
+    count = struct.unpack_from('>H', data, 4)[0]
+    for i in range(count):
+        tag, checksum, offset, length = struct.unpack_from('>4sIII', data, 12 + 16 * i)
+        assert offset % 4 == 0
+        table = data[offset:offset + length]
+        if tag == b'head':
+            table = table[:HEAD_CHECKSUM_ADJUSTMENT] + b'\x00' * 4 + table[HEAD_CHECKSUM_ADJUSTMENT + 4:]
+        assert _checksum(table) == checksum, tag
+    # checkSumAdjustment ile tüm dosyanın toplamı sabit değere eşit olur
+    assert _checksum(data) == CHECKSUM_MAGIC
+
+    offsets = loca_offsets(tables)
+    old_offsets = loca_offsets(read_tables(original))
+    assert len(offsets) == len(old_offsets)
+    assert offsets[-1] == len(tables[b'glyf'])
+    glyf, old_glyf = tables[b'glyf'], read_tables(original)[b'glyf']
+    for i, (start, end) in enumerate(zip(offsets, offsets[1:])):
+        old_start, old_end = old_offsets[i], old_offsets[i + 1]
+        assert (end > start) == (old_end > old_start)
+        if end == start:
+            continue
+        glyph, old_glyph = glyf[start:end], old_glyf[old_start:old_end]
+        # Başlık (kontur sayısı ve sınır kutusu) aynı kalır
+        assert glyph[:10] == old_glyph[:10]
+        contours = struct.unpack_from('>h', glyph)[0]
+        if contours >= 0:
+            assert struct.unpack_from('>H', glyph, 10 + 2 * contours)[0] == 0
+            assert glyph[:10 + 2 * contours] == old_glyph[:10 + 2 * contours]
+
+
+def test_compact_render_keeps_text(tmp_path, compact_font):
+    pypdf = pytest.importorskip('pypdf')
+    from create_professional_pdf import create_fast_pdf
+
+    lines = ['T.C.', 'ANKARA', 'Dosya'] + [TEXT] * 80
+    normal, compact = tmp_path / 'normal.pdf', tmp_path / 'kucuk.pdf'
+    create_fast_pdf(lines, normal, 'Evrak')
+    create_fast_pdf(lines, compact, 'Evrak', compact=True)
+    assert b'-Compact' in compact.read_bytes()
+    assert compact.stat().st_size < normal.stat().st_size
+
+    def texts(path):
+        return [page.extract_text() for page in pypdf.PdfReader(path).pages]
+    assert texts(compact) == texts(normal)
+    assert TEXT in texts(compact)[0]
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+PIL = pytest.importorskip('PIL')
+from PIL import Image, ImageDraw  # noqa: E402
+
+from image_pdf import _group4_strips, jpeg_info, render_image_pdf  # noqa: E402
+
+
+def scanned_page(size=(400, 300)):
+    image = Image.new('1', size, 1)
+    draw = ImageDraw.Draw(image)
+    for y in range(20, size[1] - 20, 24):
+        draw.rectangle([30, y, size[0] - 30, y + 6], fill=0)
+    return image
+
+
+def test_jpeg_is_embedded_without_reencoding(tmp_path):
+    path = tmp_path / 'scan.jpg'
+    Image.new('RGB', (120, 80), 'red').save(path, 'JPEG', dpi=(200, 200))
+    with open(path, 'rb') as f:
+        width, height, components, dpi, _ = jpeg_info(f)
+    assert (width, height, components) == (120, 80, 3)
+    assert dpi == (200, 200)
+
+    out = io.BytesIO()
+    assert render_image_pdf(path, out, 'jpeg') == 1
+    assert path.read_bytes() in out.getvalue()
+    assert b'/DCTDecode' in out.getvalue()
+
+
+def test_multi_strip_group4_page_becomes_one_image(tmp_path):
+    path = tmp_path / 'scan.tif'
+    page = scanned_page()
+    page.save(path, 'TIFF', compression='group4', tiffinfo={278: 8})
+    with Image.open(path) as image:
+        assert len(_group4_strips(image)) == -(-page.size[1] // 8)
+
+    out = io.BytesIO()
+    assert render_image_pdf(path, out, 'tiff') == 1
+    pdf = out.getvalue()
+    assert pdf.count(b'/Subtype /Image') == 1
+    assert b'/CCITTFaxDecode' in pdf
+    # Şerit başına görüntü yazılmadığından kaynaktan büyümez
+    assert len(pdf) < path.stat().st_size + 2048
+
+
+def test_single_strip_group4_is_copied(tmp_path):
+    path = tmp_path / 'scan.tif'
+    scanned_page().save(path, 'TIFF', compression='group4', tiffinfo={278: 300})
+    with Image.open(path) as image:
+        (offset, length, rows, _), = _group4_strips(image)
+    data = path.read_bytes()[offset:offset + length]
+
+    out = io.BytesIO()
+    render_image_pdf(path, out, 'tiff')
+    assert rows == 300 and data in out.getvalue()
+
+
+def test_multi_strip_group4_is_not_flate_encoded(tmp_path, monkeypatch):
+    import image_pdf
+
+    path = tmp_path / 'scan.tif'
+    scanned_page().save(path, 'TIFF', compression='group4', tiffinfo={278: 8})
+    monkeypatch.setattr(image_pdf, '_encode_frame', lambda frame: pytest.fail('G4 varken Flate denenmemeli'))
+    render_image_pdf(path, io.BytesIO(), 'tiff')
+
+
+def test_non_bilevel_frames_fall_back_to_flate(tmp_path):
+    path = tmp_path / 'scan.png'
+    Image.new('L', (50, 40), 128).save(path)
+    out = io.BytesIO()
+    assert render_image_pdf(path, out, 'png') == 1
+    assert b'/FlateDecode' in out.getvalue() and b'/CCITTFaxDecode' not in out.getvalue()
@@ -0,0 +1,36 @@
+import time
+
+import metrics
+from metrics import Registry, last_run, last_run_snapshot, record_document, render_prometheus, write_run
+
+
+def record(ok=True, cause=None):
+    return {'id': 'evrak_1', 'ok': ok, 'cause': cause, 'seconds': 0.02, 'bytes_in': 100, 'bytes_out': 400,
+            'stages': {'parse': 0.005, 'write': 0.01}}
+
+
+def test_last_run_is_exported_as_gauges(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'ENABLED', True)
+    registry = Registry()
+    for _ in range(3):
+        record_document(record(), registry)
+    record_document(record(False, 'parse'), registry)
+    write_run(tmp_path, 'convert', time.time() - 1, registry)
+    assert registry.snapshot()['counters'] == []
+
+    text = render_prometheus([(last_run_snapshot(last_run(tmp_path)), {'source': 'batch'})])
+    assert 'evrak_documents_total' not in text and '# TYPE evrak_last_run_documents gauge' in text
+    assert 'evrak_last_run_documents{result="ok",source="batch"} 3' in text
+    assert 'evrak_last_run_failures{cause="parse",source="batch"} 1' in text
+    assert 'evrak_last_run_bytes_out{source="batch"} 1600' in text
+    assert '# TYPE evrak_last_run_stage_seconds gauge' in text
+    assert '_bucket' not in text
+    assert 'evrak_last_run_seconds{source="batch"}' in text
+
+
+def test_server_counters_stay_counters():
+    registry = Registry()
+    registry.inc('evrak_cache_requests_total', cache='pdf', result='hit')
+    text = render_prometheus([(registry.snapshot(), {'source': 'server'})])
+    assert '# TYPE evrak_cache_requests_total counter' in text
+    assert 'evrak_cache_requests_total{cache="pdf",result="hit",source="server"} 1' in text
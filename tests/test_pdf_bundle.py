@@ -0,0 +1,95 @@
+import io
+
+import pytest
+
+from pdf_bundle import BundleSource, bundle_files
+from test_pdf_linearize import (check_xref_offsets, image_pdf, reportlab_pdf, streaming_pdf,
+                                xref_stream_pdf)
+
+
+def bundle(paths, title=None):
+    out = io.BytesIO()
+    result = bundle_files(paths, out, title)
+    return result, out.getvalue()
+
+
+def outline_titles(source):
+    outlines = source.resolve(source.resolve(source.trailer['Root'])['Outlines'])
+    titles = []
+    item = outlines.get('First')
+    while item is not None:
+        entry = source.resolve(item)
+        titles.append(entry['Title'])
+        item = entry.get('Next')
+    assert len(titles) == outlines['Count']
+    return titles
+
+
+def count_objects(source, match):
+    return sum(1 for num in source.offsets if match(source.object(num).value))
+
+
+def test_pages_and_outline_of_two_documents(tmp_path):
+    first = reportlab_pdf(tmp_path / 'dilekce.pdf', pages=3)
+    second = reportlab_pdf(tmp_path / 'karar.pdf', pages=2)
+    (added, pages, errors), data = bundle([first, (second, 'Karar')], title='Dava')
+    assert (added, pages, errors) == (2, 5, [])
+
+    source = check_xref_offsets(data)
+    assert len(source.pages()[0]) == 5
+    assert outline_titles(source) == [b'(dilekce)', b'(Karar)']
+
+
+def test_identical_fonts_and_images_are_written_once(tmp_path):
+    text = streaming_pdf(tmp_path / 'metin.pdf')
+    scan = image_pdf(tmp_path / 'tarama.pdf')
+
+    def is_font_file(value):
+        return isinstance(value, dict) and 'Length1' in value
+
+    def is_image(value):
+        return isinstance(value, dict) and value.get('Subtype') == 'Image'
+
+    _, once = bundle([text, scan])
+    (_, pages, _), twice = bundle([text, scan, text, scan])
+    once, twice = BundleSource(once), check_xref_offsets(twice)
+    assert pages == 2 * len(once.pages()[0]) == len(twice.pages()[0])
+    assert count_objects(once, is_font_file) > 0
+    assert count_objects(once, is_image) > 0
+    assert count_objects(twice, is_font_file) == count_objects(once, is_font_file)
+    assert count_objects(twice, is_image) == count_objects(once, is_image)
+
+
+def test_xref_and_object_streams_are_read(tmp_path):
+    path = xref_stream_pdf(tmp_path / 'akis.pdf', text=b'Nesne akisi')
+    (added, pages, errors), data = bundle([path])
+    assert (added, pages, errors) == (1, 1, [])
+
+    source = check_xref_offsets(data)
+    [(page_num, _)], _ = source.pages()
+    page = source.object(page_num).value
+    font = source.resolve(source.resolve(page['Resources'])['Font']['F1'])
+    assert font['BaseFont'] == 'Helvetica'
+    content = source.object(page['Contents'].num)
+    assert b'(Nesne akisi) Tj' in data[content.stream_start:content.stream_start + content.stream_length]
+
+    pypdf = pytest.importorskip('pypdf')
+    assert 'Nesne akisi' in pypdf.PdfReader(io.BytesIO(data)).pages[0].extract_text()
+
+
+def test_unreadable_documents_are_reported_and_skipped(tmp_path):
+    good = reportlab_pdf(tmp_path / 'iyi.pdf', pages=2)
+    garbage = tmp_path / 'bozuk.pdf'
+    garbage.write_bytes(b'%PDF-1.4\nbu bir PDF degil\n')
+    # İkinci sayfanın içerik akışı xref ofsetinde başka bir nesne: kopyalama yarıda kalır
+    broken = reportlab_pdf(tmp_path / 'yarim.pdf', pages=2)
+    broken.write_bytes(broken.read_bytes().replace(b'\n9 0 obj', b'\n1 0 obj'))
+    missing = tmp_path / 'yok.pdf'
+
+    (added, pages, errors), data = bundle([garbage, good, broken, missing])
+    assert (added, pages) == (1, 2)
+    assert [path for path, _ in errors] == [str(garbage), str(broken), str(missing)]
+
+    source = check_xref_offsets(data)
+    assert len(source.pages()[0]) == 2
+    assert outline_titles(source) == [b'(iyi)']
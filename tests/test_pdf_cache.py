@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+
+import pytest
+
+from pdf_cache import PDFCache, SingleFlight, source_fingerprint
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'pdf'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', work)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do('k', work)))
+    follower.start()
+    # İkinci çağrı lideri beklemeye başlasın
+    time.sleep(0.1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert len(calls) == 1
+    assert sorted(results) == [('pdf', False), ('pdf', True)]
+    # Tamamlanan anahtar yeniden çalıştırılır
+    assert flight.do('k', lambda: 'yeni') == ('yeni', False)
+
+
+def test_single_flight_propagates_errors():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('k', lambda: int('x'))
+    assert flight._calls == {}
+
+
+def put(cache, tmp_path, key, size):
+    source = tmp_path / f'{key}.tmp'
+    source.write_bytes(b'x' * size)
+    return cache.put(key, source)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = PDFCache(tmp_path / 'cache', max_bytes=250)
+    put(cache, tmp_path, 'a-1', 100)
+    put(cache, tmp_path, 'b-1', 100)
+    assert cache.get('a-1') is not None
+    put(cache, tmp_path, 'c-1', 100)
+    assert cache.get('b-1') is None
+    assert cache.get('a-1') and cache.get('c-1')
+    assert cache.total_bytes == 200
+
+    # Sınırı tek başına aşan yeni girdi korunur
+    put(cache, tmp_path, 'd-1', 1000)
+    assert cache.get('d-1') and cache.total_bytes == 1000
+
+
+def test_cache_reload_and_discard(tmp_path):
+    cache = PDFCache(tmp_path / 'cache', max_bytes=10 ** 6)
+    put(cache, tmp_path, 'evrak_1-aa', 10)
+    put(cache, tmp_path, 'evrak_1-2-bb', 20)
+    reloaded = PDFCache(tmp_path / 'cache', max_bytes=10 ** 6)
+    assert reloaded.total_bytes == 30
+
+    reloaded.discard_document('evrak_1')
+    assert reloaded.get('evrak_1-aa') is None
+    assert reloaded.get('evrak_1-2-bb') is not None
+    assert reloaded.total_bytes == 20
+
+
+def test_fingerprint_follows_size_mtime_and_version(tmp_path):
+    path = tmp_path / 'a.udf'
+    path.write_bytes(b'x')
+    first = source_fingerprint(path, '1')
+    assert source_fingerprint(path, '1') == first
+    assert source_fingerprint(path, '2') != first
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert source_fingerprint(path, '1') != first
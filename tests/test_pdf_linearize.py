@@ -0,0 +1,175 @@
+import io
+import shutil
+import zlib
+from pathlib import Path
+
+import pytest
+
+from pdf_bundle import BundleSource
+from pdf_linearize import (_OBJ_HEADER, _XREF_ENTRY, LinearizeError, is_linearized,
+                           linearize_file, parse_value)
+
+INCREMENTAL_PDF = Path(__file__).resolve().parent.parent / 'evraklar_pdf' / 'evrak_12474715546.pdf'
+
+
+def check_xref_offsets(data):
+    """Her xref ofseti (Prev zinciri dahil) kendi ``N 0 obj`` başlığında mı?"""
+    source = BundleSource(data)
+    for num, offset in source.offsets.items():
+        if isinstance(offset, tuple):
+            continue
+        m = _OBJ_HEADER.match(data, offset)
+        assert m is not None and int(m.group(1)) == num, f'{num}. nesne ofseti yanlış'
+    return source
+
+
+def page_count(data):
+    return len(BundleSource(data).pages()[0])
+
+
+def reportlab_pdf(path, pages=3):
+    canvas = pytest.importorskip('reportlab.pdfgen.canvas')
+    c = canvas.Canvas(str(path))
+    for number in range(1, pages + 1):
+        c.drawString(72, 720, f'Sayfa {number}')
+        c.showPage()
+    c.save()
+    return path
+
+
+def xref_stream_pdf(path, text=b'Nesne akisi'):
+    """Nesneleri nesne akışında, xref'i PNG öngörücülü xref akışında olan PDF"""
+    members = [
+        (1, b'<< /Type /Catalog /Pages 2 0 R >>'),
+        (2, b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>'),
+        (3, b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 300 200] /Contents 4 0 R '
+            b'/Resources << /Font << /F1 5 0 R >> >> >>'),
+        (5, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'),
+    ]
+    header, body = [], b''
+    for num, value in members:
+        header.append(b'%d %d' % (num, len(body)))
+        body += value + b'\n'
+    header = b' '.join(header) + b'\n'
+    packed = zlib.compress(header + body)
+    content = b'BT /F1 18 Tf 20 100 Td (' + text + b') Tj ET'
+
+    out = bytearray(b'%PDF-1.5\n%\xe2\xe3\xcf\xd3\n')
+    offsets = {}
+    offsets[4] = len(out)
+    out += b'4 0 obj\n<< /Length %d >>\nstream\n%s\nendstream\nendobj\n' % (len(content), content)
+    offsets[6] = len(out)
+    out += b'6 0 obj\n<< /Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d >>\nstream\n' % (
+        len(members), len(header), len(packed))
+    out += packed + b'\nendstream\nendobj\n'
+    offsets[7] = len(out)
+
+    rows = [(0, 0, 65535)]
+    in_stream = {num: i for i, (num, _) in enumerate(members)}
+    for num in range(1, 8):
+        rows.append((2, 6, in_stream[num]) if num in in_stream else (1, offsets[num], 0))
+    raw = b''.join(bytes([kind]) + a.to_bytes(4, 'big') + b.to_bytes(2, 'big') for kind, a, b in rows)
+    # PNG "yukarı" öngörücüsü: her satır bir öncekinden farkı olarak yazılır
+    predicted, previous = b'', bytes(7)
+    for i in range(0, len(raw), 7):
+        row = raw[i:i + 7]
+        predicted += b'\x02' + bytes((x - y) & 0xFF for x, y in zip(row, previous))
+        previous = row
+    xref = zlib.compress(predicted)
+    out += (b'7 0 obj\n<< /Type /XRef /Size 8 /W [1 4 2] /Root 1 0 R /Filter /FlateDecode '
+            b'/DecodeParms << /Predictor 12 /Columns 7 >> /Length %d >>\nstream\n' % len(xref))
+    out += xref + b'\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n' % offsets[7]
+    path.write_bytes(bytes(out))
+    return path
+
+
+def streaming_pdf(path):
+    pytest.importorskip('reportlab')
+    from create_professional_pdf import create_fast_pdf
+
+    lines = ['T.C.', 'ANKARA', 'Dosya'] + [f'{i}. satır: çığ, öşü, İstanbul ' * 3 for i in range(150)]
+    create_fast_pdf(lines, path, 'Akış', stream=True)
+    return path
+
+
+def image_pdf(path):
+    pytest.importorskip('PIL')
+    from PIL import Image
+
+    from image_pdf import render_image_pdf
+
+    scan = path.with_suffix('.tif')
+    frames = [Image.new('1', (200, 100), color) for color in (0, 1, 0)]
+    frames[0].save(scan, 'TIFF', compression='group4', save_all=True, append_images=frames[1:])
+    with open(path, 'wb') as f:
+        render_image_pdf(scan, f, 'tiff')
+    return path
+
+
+@pytest.mark.parametrize('build', [reportlab_pdf, streaming_pdf, image_pdf])
+def test_linearized_layout(tmp_path, build):
+    path = build(tmp_path / 'evrak.pdf')
+    pages = page_count(path.read_bytes())
+    assert linearize_file(path) is True
+    data = path.read_bytes()
+    assert is_linearized(path)
+
+    m = _OBJ_HEADER.search(data)
+    lin, _ = parse_value(data, m.end())
+    assert lin['Linearized'] == 1
+    assert lin['L'] == len(data)
+    assert lin['N'] == pages
+
+    source = check_xref_offsets(data)
+    assert set(source.offsets) == set(range(1, source.trailer['Size']))
+    page_numbers = [num for num, _ in source.pages()[0]]
+    assert len(page_numbers) == pages
+    assert lin['O'] == page_numbers[0]
+
+    hint_offset, hint_length = lin['H']
+    m = _OBJ_HEADER.match(data, hint_offset)
+    assert m is not None
+    hint = source.object(int(m.group(1)))
+    assert 'S' in hint.value
+    assert data[:hint_offset + hint_length].endswith(b'endobj\n')
+    # İlk sayfa ipucu akışından sonra başlar ve /E'de biter
+    assert hint_offset + hint_length <= source.offsets[lin['O']] < lin['E']
+    assert data[:lin['E']].endswith(b'endobj\n')
+    # /T ana xref tablosunun ilk girdisinden önceki boşluk
+    assert data[lin['T']:lin['T'] + 1].isspace()
+    assert _XREF_ENTRY.match(data, lin['T']).group(3) == b'f'
+
+
+def test_already_linearized_file_is_left_alone(tmp_path):
+    path = reportlab_pdf(tmp_path / 'evrak.pdf')
+    assert linearize_file(path) is True
+    data = path.read_bytes()
+    assert linearize_file(path) is False
+    assert path.read_bytes() == data
+
+
+def test_xref_stream_is_rejected(tmp_path):
+    path = xref_stream_pdf(tmp_path / 'evrak.pdf')
+    data = path.read_bytes()
+    with pytest.raises(LinearizeError, match='akışı'):
+        linearize_file(path)
+    assert path.read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir()] == ['evrak.pdf']
+
+
+def test_incremental_update_is_rejected(tmp_path):
+    path = tmp_path / 'evrak.pdf'
+    shutil.copyfile(INCREMENTAL_PDF, path)
+    with pytest.raises(LinearizeError, match='Artımlı'):
+        linearize_file(path)
+    assert path.read_bytes() == INCREMENTAL_PDF.read_bytes()
+    assert [p.name for p in tmp_path.iterdir()] == ['evrak.pdf']
+
+
+def test_reparsed_text_is_unchanged(tmp_path):
+    pypdf = pytest.importorskip('pypdf')
+    path = reportlab_pdf(tmp_path / 'evrak.pdf')
+    before = [page.extract_text() for page in pypdf.PdfReader(io.BytesIO(path.read_bytes())).pages]
+    linearize_file(path)
+    after = [page.extract_text() for page in pypdf.PdfReader(path).pages]
+    assert after == before
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip('reportlab')
+pypdf = pytest.importorskip('pypdf')
+
+from create_professional_pdf import create_fast_pdf  # noqa: E402
+from render_profile import register_fonts  # noqa: E402
+from test_pdf_linearize import check_xref_offsets  # noqa: E402
+
+LINES = ['T.C.', 'İSTANBUL 3. İŞ MAHKEMESİ', 'Esas: 2024/17'] + [
+    f'{i}. satır: Çağrı, Şükrü ve Gülşen ığdır öğleden sonra İzmir\'e gitti. ' * 3 for i in range(200)
+]
+
+
+def page_texts(path):
+    return [page.extract_text() for page in pypdf.PdfReader(path).pages]
+
+
+def test_streaming_output_matches_canvas_output(tmp_path):
+    if register_fonts()[2] is None:
+        pytest.skip('Türkçe destekli TTF font yok')
+    streamed, buffered = tmp_path / 'akis.pdf', tmp_path / 'tuval.pdf'
+    pages = create_fast_pdf(iter(LINES), streamed, 'Akış', stream=True)
+    assert pages > 1
+    assert create_fast_pdf(LINES, buffered, 'Akış') == pages
+
+    data = streamed.read_bytes()
+    source = check_xref_offsets(data)
+    assert set(source.offsets) == set(range(1, source.trailer['Size']))
+    assert len(source.pages()[0]) == pages
+    assert b'/FontFile2' in data
+
+    texts = page_texts(streamed)
+    assert len(texts) == pages
+    assert texts == page_texts(buffered)
+    assert 'Şükrü ve Gülşen ığdır' in texts[0]
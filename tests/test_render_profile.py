@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip('reportlab')
+from reportlab.pdfbase import pdfmetrics  # noqa: E402
+
+from font_subset import CompactTTFont  # noqa: E402
+from render_profile import register_fonts  # noqa: E402
+
+
+def test_compact_fonts_are_not_aliased_to_normal_ones():
+    regular, bold, path = register_fonts(compact=False)
+    if path is None:
+        pytest.skip('Türkçe destekli TTF font yok')
+    compact, compact_bold, _ = register_fonts(compact=True)
+    assert compact != regular
+    assert {regular, bold, compact, compact_bold} <= set(pdfmetrics.getRegisteredFontNames())
+    assert isinstance(pdfmetrics.getFont(compact), CompactTTFont)
+    assert not isinstance(pdfmetrics.getFont(regular), CompactTTFont)
+
+    # Yeniden kayıt mevcut fontu değiştirmez
+    font = pdfmetrics.getFont(compact)
+    register_fonts(compact=True)
+    assert pdfmetrics.getFont(compact) is font
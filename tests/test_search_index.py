@@ -0,0 +1,84 @@
+import search_index
+from search_index import IndexReader, IndexWriter, fold, snippet, tokenize
+from udf_document import UDFDocument
+from udf_reader import _line_paragraphs
+
+DOCS = {
+    'evrak_1': 'DAVACI: Yeliz PAT\nKONU: Kıdem tazminatı ve İHBAR tazminatı alacağı',
+    'evrak_2': 'DAVACI: Ali ISIK\nKONU: Fazla mesai ücreti alacağı',
+    'evrak_3': 'İstanbul Anadolu İş Mahkemesi\nKONU: kıdem tazminatı',
+}
+
+
+def document(text):
+    return UDFDocument.from_paragraphs(_line_paragraphs(text))
+
+
+def build(directory, docs=DOCS):
+    writer = IndexWriter(directory)
+    for doc_id, text in docs.items():
+        writer.add(doc_id, document(text), '1')
+    writer.commit()
+    return writer
+
+
+def ids(results):
+    return [r['id'] for r in results]
+
+
+def test_turkish_folding():
+    assert fold('İSTANBUL') == fold('istanbul') == fold('Istanbul') == 'istanbul'
+    assert fold('IŞIK') == fold('ışık') == 'isik'
+    assert len(fold('İçerik')) == len('İçerik')
+    assert tokenize('Kıdem ve 5 a') == ['kidem', 've', '5']
+
+
+def test_search_requires_all_terms_and_ranks(tmp_path):
+    build(tmp_path).close()
+    reader = IndexReader(tmp_path)
+    assert len(reader) == 3
+    assert sorted(ids(reader.search('kıdem tazminatı '))) == ['evrak_1', 'evrak_3']
+    assert ids(reader.search('ihbar KIDEM ')) == ['evrak_1']
+    assert ids(reader.search('isik')) == ['evrak_2']
+    assert reader.search('yok ') == []
+    # Son terim önek olarak eşleşir
+    assert ids(reader.search('mes')) == ['evrak_2']
+    assert reader.search('mes ') == []
+
+
+def test_snippet_marks_original_text():
+    text = 'KONU: İhbar tazminatı <ve> diğer'
+    assert snippet(text, tokenize('ihbar')) == 'KONU: <mark>İhbar</mark> tazminatı &lt;ve&gt; diğer'
+
+
+def test_updates_and_removals_are_visible_after_commit(tmp_path):
+    writer = build(tmp_path)
+    reader = IndexReader(tmp_path, refresh_interval=0)
+    assert not writer.needs_update('evrak_1', '1')
+    assert writer.needs_update('evrak_1', '2')
+
+    writer.add('evrak_1', document('Boşanma davası'), '2')
+    writer.remove('evrak_3')
+    writer.commit()
+    assert writer.ids() == {'evrak_1', 'evrak_2'}
+    assert ids(reader.search('kıdem ')) == []
+    assert ids(reader.search('boşanma ')) == ['evrak_1']
+    assert len(reader) == 2
+    writer.close()
+
+
+def test_merge_keeps_only_live_documents(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index, 'MAX_SEGMENTS', 2)
+    writer = IndexWriter(tmp_path)
+    for i in range(4):
+        writer.add(f'evrak_{i}', document(f'belge {i} tazminat'), '1')
+        writer.commit()
+    writer.remove('evrak_0')
+    writer.commit()
+    assert len(writer.segments) <= 2
+    writer.close()
+
+    reopened = IndexWriter(tmp_path)
+    assert reopened.ids() == {'evrak_1', 'evrak_2', 'evrak_3'}
+    reopened.close()
+    assert sorted(ids(IndexReader(tmp_path).search('tazminat'))) == ['evrak_1', 'evrak_2', 'evrak_3']
@@ -0,0 +1,162 @@
+import http.client
+import io
+import threading
+
+import pytest
+
+import pdf_bundle
+import start_server
+from start_server import ChunkedWriter, etag_matches, parse_range
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    (tmp_path / 'evraklar_pdf').mkdir()
+    (tmp_path / 'evraklar_kaynak').mkdir()
+    monkeypatch.chdir(tmp_path)
+    httpd = start_server.EvrakHTTPServer(('127.0.0.1', 0), start_server.MyHTTPRequestHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_pdf(path):
+    canvas = pytest.importorskip('reportlab.pdfgen.canvas')
+    c = canvas.Canvas(str(path))
+    c.drawString(72, 720, path.stem)
+    c.showPage()
+    c.save()
+    return path
+
+
+def get(port, path, method='GET'):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    conn.request(method, path)
+    return conn, conn.getresponse()
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range('bytes=0-9', 100) == (0, 9)
+    assert parse_range('bytes=90-', 100) == (90, 99)
+    assert parse_range('bytes=95-500', 100) == (95, 99)
+    assert parse_range('bytes=-10', 100) == (90, 99)
+    assert parse_range('bytes=-500', 100) == (0, 99)
+    # Çoklu veya bozuk aralık desteklenmez: tüm dosya gönderilir
+    assert parse_range('bytes=0-1,5-6', 100) is None
+    assert parse_range('bytes=a-b', 100) is None
+    assert parse_range('items=0-1', 100) is None
+    for header in ('bytes=100-', 'bytes=5-2', 'bytes=-0'):
+        with pytest.raises(ValueError):
+            parse_range(header, 100)
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches(' * ', '"x"')
+    assert not etag_matches('"a"', '"b"')
+
+
+def test_range_requests_on_keep_alive_connection(server, tmp_path):
+    data = bytes(range(256)) * 40
+    (tmp_path / 'evraklar_pdf' / 'a.pdf').write_bytes(data)
+    conn = http.client.HTTPConnection('127.0.0.1', server, timeout=5)
+
+    conn.request('GET', '/evraklar_pdf/a.pdf', headers={'Range': 'bytes=100-199'})
+    response = conn.getresponse()
+    assert response.status == 206
+    assert response.getheader('Content-Range') == f'bytes 100-199/{len(data)}'
+    assert response.read() == data[100:200]
+    etag = response.getheader('ETag')
+
+    # Aynı bağlantı üzerinden devam edilir
+    conn.request('GET', '/evraklar_pdf/a.pdf', headers={'Range': 'bytes=-10', 'If-Range': etag})
+    response = conn.getresponse()
+    assert response.status == 206 and response.read() == data[-10:]
+
+    conn.request('GET', '/evraklar_pdf/a.pdf', headers={'Range': 'bytes=0-9', 'If-Range': '"eski"'})
+    response = conn.getresponse()
+    assert response.status == 200 and response.read() == data
+
+    conn.request('GET', '/evraklar_pdf/a.pdf', headers={'Range': f'bytes={len(data)}-'})
+    response = conn.getresponse()
+    assert response.status == 416 and response.getheader('Content-Range') == f'bytes */{len(data)}'
+    response.read()
+
+    conn.request('GET', '/evraklar_pdf/a.pdf', headers={'If-None-Match': etag})
+    response = conn.getresponse()
+    assert response.status == 304 and response.read() == b''
+    conn.close()
+
+
+def test_chunked_writer_frames_and_terminates():
+    out = io.BytesIO()
+    writer = ChunkedWriter(out, size=4)
+    writer.write(b'ab')
+    assert out.getvalue() == b''
+    writer.write(b'cdef')
+    writer.write(b'g')
+    writer.close()
+    assert out.getvalue() == b'6\r\nabcdef\r\n1\r\ng\r\n0\r\n\r\n'
+
+
+def test_bundle_validates_ids_before_headers(server):
+    _, response = get(server, '/api/bundle?ids=yok')
+    assert response.status == 404
+    _, response = get(server, '/api/bundle?ids=../x')
+    assert response.status == 400
+
+
+def test_bundle_streams_and_skips_failed_documents(server, tmp_path, monkeypatch):
+    for name in ('a', 'c'):
+        make_pdf(tmp_path / 'evraklar_pdf' / f'{name}.pdf')
+    (tmp_path / 'evraklar_kaynak' / 'b.udf').write_bytes(b'x')
+    converted = []
+
+    def source(evrak_id):
+        converted.append(evrak_id)
+        if evrak_id == 'b':
+            raise RuntimeError('dönüştürme başarısız')
+        return tmp_path / 'evraklar_pdf' / f'{evrak_id}.pdf'
+
+    monkeypatch.setattr(start_server, 'bundle_source', source)
+    _, response = get(server, '/api/bundle?ids=a,b,c')
+    assert response.status == 200
+    body = response.read()
+    assert converted == ['a', 'b', 'c']
+    assert body.startswith(b'%PDF') and body.rstrip().endswith(b'%%EOF')
+    assert b'/Title (a)' in body and b'/Title (c)' in body
+
+
+def test_bundle_failure_after_headers_closes_connection(server, tmp_path, monkeypatch):
+    make_pdf(tmp_path / 'evraklar_pdf' / 'a.pdf')
+
+    def broken(paths, target, title=None):
+        target.write(b'%PDF-1.4\n')
+        raise RuntimeError('beklenmeyen hata')
+
+    monkeypatch.setattr(pdf_bundle, 'bundle_files', broken)
+    conn, response = get(server, '/api/bundle?ids=a')
+    assert response.status == 200
+    # Gövde tamamlanmadan bağlantı kapanır; istemci zaman aşımına kadar beklemez
+    with pytest.raises(http.client.IncompleteRead):
+        response.read()
+
+
+def test_head_on_api_routes_sends_headers_without_body(server, tmp_path, monkeypatch):
+    make_pdf(tmp_path / 'evraklar_pdf' / 'a.pdf')
+    _, get_response = get(server, '/api/evraklar?limit=5')
+    body = get_response.read()
+
+    conn, response = get(server, '/api/evraklar?limit=5', 'HEAD')
+    assert response.status == 200
+    assert response.getheader('Content-Length') == str(len(body))
+    assert response.read() == b''
+
+    monkeypatch.setattr(start_server, 'bundle_source', lambda evrak_id: pytest.fail('HEAD dönüştürmemeli'))
+    _, response = get(server, '/api/bundle?ids=a', 'HEAD')
+    assert response.status == 200 and response.getheader('Content-Type') == 'application/pdf'
+    _, response = get(server, '/api/bundle?ids=yok', 'HEAD')
+    assert response.status == 404 and response.read() == b''
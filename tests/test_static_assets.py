@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import static_assets
+from static_assets import NotAcceptable, accepted_encodings, encoding_quality, negotiate, precompress
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(static_assets, 'brotli', None)
+
+
+def test_quality_handles_wildcard_and_identity():
+    accepted = accepted_encodings('gzip;q=0.5, *;q=0.1, br;q=0')
+    assert encoding_quality(accepted, 'gzip') == 0.5
+    assert encoding_quality(accepted, 'br') == 0
+    assert encoding_quality(accepted, 'zstd') == 0.1
+    assert encoding_quality(accepted, 'identity') == 0.1
+    assert encoding_quality(accepted_encodings('gzip'), 'identity') == 1.0
+    assert encoding_quality(accepted_encodings('*;q=0'), 'identity') == 0
+    assert encoding_quality(accepted_encodings('identity;q=0, *'), 'identity') == 0
+
+
+def test_wildcard_selects_compressed_copy(tmp_path, gzip_only):
+    path = tmp_path / 'app.js'
+    path.write_text('var x = 1;\n' * 200)
+    body, encoding = negotiate(str(path), 'application/javascript', '*', tmp_path, tmp_path / 'cache')
+    assert encoding == 'gzip' and str(body).endswith('app.js.gz')
+    assert negotiate(str(path), 'application/javascript', 'gzip;q=0', tmp_path, tmp_path / 'cache') == \
+        (str(path), None)
+
+
+def test_identity_refused_without_variant(tmp_path, gzip_only):
+    path = tmp_path / 'a.txt'
+    path.write_bytes(os.urandom(64))
+    with pytest.raises(NotAcceptable):
+        negotiate(str(path), 'text/plain', 'identity;q=0', tmp_path, tmp_path / 'cache')
+    with pytest.raises(NotAcceptable):
+        negotiate(str(path), 'text/plain', 'gzip, *;q=0', tmp_path, tmp_path / 'cache')
+
+
+def test_no_gain_result_is_remembered_until_source_changes(tmp_path, gzip_only, monkeypatch):
+    path = tmp_path / 'a.txt'
+    path.write_bytes(os.urandom(64))
+    calls = []
+    compress = static_assets._compress
+    monkeypatch.setattr(static_assets, '_compress', lambda data, enc: calls.append(enc) or compress(data, enc))
+
+    assert precompress(str(path), tmp_path, tmp_path / 'cache') == {}
+    assert precompress(str(path), tmp_path, tmp_path / 'cache') == {}
+    assert calls == ['gzip']
+
+    path.write_text('a' * 1000)
+    variants = precompress(str(path), tmp_path, tmp_path / 'cache')
+    assert list(variants) == ['gzip'] and calls == ['gzip', 'gzip']
@@ -0,0 +1,47 @@
+import pickle
+from pathlib import Path
+
+from udf_document import BOLD, FIELD, UNDERLINE, UDFDocument, lines_nbytes
+from udf_reader import extract_document_text, read_paragraphs
+
+from test_udf_reader import TEMPLATE, make_udf
+
+SOURCES = Path(__file__).resolve().parent.parent / 'evraklar_kaynak'
+
+
+def test_round_trip_keeps_formatting_flags(tmp_path):
+    udf = make_udf(tmp_path / 'a.udf', TEMPLATE)
+    document = UDFDocument.from_paragraphs(read_paragraphs(udf))
+    paragraphs = list(document.paragraphs())
+    assert len(document) == len(paragraphs) == 6
+
+    alignment, section, runs = paragraphs[0]
+    assert alignment == 2 and section == 'body'
+    assert runs[0] == ('10/07/2025 16:22', BOLD | FIELD)
+
+    _, _, runs = paragraphs[1]
+    assert runs == [('DAVACI\t: ', BOLD), ('YELİZ PAT', FIELD), ('\n', 0)]
+    assert paragraphs[2][1] == 'table'
+    assert paragraphs[4][2][0] == ('DEĞER\t: ', UNDERLINE)
+
+
+def test_text_matches_extractor_and_survives_pickling(tmp_path):
+    udf = make_udf(tmp_path / 'a.udf', TEMPLATE)
+    document = pickle.loads(pickle.dumps(UDFDocument.from_file(udf)))
+    assert document.name == 'a'
+    assert document.text() == extract_document_text(udf)
+
+
+def test_empty_document():
+    document = UDFDocument.from_paragraphs([])
+    assert len(document) == 0 and document.text() == ''
+
+
+def test_sample_corpus_is_several_times_smaller_than_lines():
+    lines_total = compact_total = 0
+    for path in sorted(SOURCES.glob('*.udf')):
+        document = UDFDocument.from_file(path)
+        assert document.text() == extract_document_text(path)
+        lines_total += lines_nbytes(list(document.lines()))
+        compact_total += document.nbytes()
+    assert lines_total > 3 * compact_total
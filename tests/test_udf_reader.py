@@ -0,0 +1,117 @@
+import zipfile
+
+from udf_reader import (detect_container, extract_document_text, iter_lines, iter_paragraphs, read_paragraphs,
+                        stream_lines)
+
+TEMPLATE = """<?xml version="1.0" encoding="UTF-8" ?>
+<template format_id="1.7">
+<content><![CDATA[Tarih
+DAVACI\t: davaciAdSoyad
+taraf : tarafAdiSoyadi
+DEĞER\t: davaEsasDegeri
+icraMudurlugu
+]]></content>
+<elements>
+<paragraph Alignment="2"><field bold="true" fieldName="Tarih" startOffset="0" length="5" /><content startOffset="5" length="1" /></paragraph>
+<paragraph><content bold="true" startOffset="6" length="9" /><field fieldName="davaciAdSoyad" startOffset="15" length="13" /><content startOffset="28" length="1" /></paragraph>
+<table tableName="Tablo1"><row rowName="row1"><cell><paragraph><field fieldName="taraf" startOffset="29" length="5" /><content startOffset="34" length="3" /><field fieldName="tarafAdiSoyadi" startOffset="37" length="14" /><content startOffset="51" length="1" /></paragraph></cell></row></table>
+<paragraph><content underline="true" startOffset="52" length="8" /><field fieldName="davaEsasDegeri" startOffset="60" length="14" /><content startOffset="74" length="1" /></paragraph>
+<paragraph><field fieldName="icraMudurlugu" startOffset="75" length="13" /><content startOffset="88" length="1" /></paragraph>
+</elements>
+<data><tarih>10/07/2025  16:22</tarih><davaciAdSoyad>YELİZ PAT</davaciAdSoyad><davaEsasDegeri>500,00 TL</davaEsasDegeri><TabloXb><rowXb><taraf>Davacı</taraf><tarafAdiSoyadi>YELİZ PAT</tarafAdiSoyadi></rowXb><rowXb><taraf>Davalı</taraf><tarafAdiSoyadi>ALİPAPİLA A.Ş.</tarafAdiSoyadi></rowXb></TabloXb><imza>&lt;td&gt;Ön Büro
+ Memuru&lt;/td&gt;</imza></data>
+</template>
+"""
+
+PLAIN = """<?xml version="1.0" encoding="UTF-8" ?>
+<template>
+<content><![CDATA[BAŞLIK
+ gövde satırı
+]]></content>
+</template>
+"""
+
+
+def make_udf(path, content):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('content.xml', content)
+    return path
+
+
+def test_paragraphs_follow_element_offsets(tmp_path):
+    udf = make_udf(tmp_path / 'a.udf', TEMPLATE)
+    paragraphs = list(iter_paragraphs(udf))
+    assert [p.text for p in paragraphs][:2] == ['Tarih\n', 'DAVACI\t: davaciAdSoyad\n']
+    assert paragraphs[0].alignment == 2
+    assert paragraphs[0].runs[0].bold and paragraphs[0].runs[0].name == 'Tarih'
+    assert paragraphs[2].section == 'table' and paragraphs[2].row == 1
+    assert paragraphs[3].row is None and paragraphs[3].runs[0].underline
+
+
+def test_template_fields_are_filled_from_data(tmp_path):
+    udf = make_udf(tmp_path / 'a.udf', TEMPLATE)
+    assert list(iter_lines(udf)) == [
+        '10/07/2025 16:22',
+        'DAVACI\t: YELİZ PAT',
+        'Davacı : YELİZ PAT',
+        'Davalı : ALİPAPİLA A.Ş.',
+        'DEĞER\t: 500,00 TL',
+        # Değeri olmayan alan olduğu gibi kalır
+        'icraMudurlugu',
+    ]
+
+
+def test_filled_runs_point_into_filled_text(tmp_path):
+    udf = make_udf(tmp_path / 'a.udf', TEMPLATE)
+    paragraph = read_paragraphs(udf)[1]
+    assert [paragraph.run_text(run) for run in paragraph.runs] == ['DAVACI\t: ', 'YELİZ PAT', '\n']
+    assert paragraph.runs[0].bold
+
+
+def test_plain_document_without_elements(tmp_path):
+    udf = make_udf(tmp_path / 'b.udf', PLAIN)
+    assert list(iter_lines(udf)) == ['BAŞLIK', 'gövde satırı']
+    assert list(stream_lines(udf, chunk_size=8)) == ['BAŞLIK', 'gövde satırı']
+
+
+def test_extract_document_text_of_non_archive_is_empty(tmp_path):
+    path = tmp_path / 'c.udf'
+    path.write_bytes(b'%PDF-1.4\n%%EOF\n')
+    assert extract_document_text(path) == ''
+
+
+def test_utf16_offsets_around_astral_characters(tmp_path):
+    # UYAP ofsetleri UTF-16 kod birimidir: emoji iki birim sayılır
+    content = """<?xml version="1.0" encoding="UTF-8" ?>
+<template><content><![CDATA[a\U0001F600b\nson\n]]></content><elements>
+<paragraph><content startOffset="0" length="1" /><content bold="true" startOffset="1" length="2" />\
+<content startOffset="3" length="2" /></paragraph>
+<paragraph><content startOffset="5" length="4" /></paragraph>
+</elements></template>"""
+    udf = make_udf(tmp_path / 'e.udf', content)
+    first, second = read_paragraphs(udf)
+    assert [first.run_text(run) for run in first.runs] == ['a', '\U0001F600', 'b\n']
+    assert second.text == 'son\n'
+
+
+def test_stream_lines_across_chunk_boundaries(tmp_path):
+    udf = make_udf(tmp_path / 'a.udf', TEMPLATE)
+    expected = [line.strip() for line in TEMPLATE.split('CDATA[')[1].split(']]>')[0].split('\n') if line.strip()]
+    for chunk_size in (1, 7, 4096):
+        assert list(stream_lines(udf, chunk_size=chunk_size)) == expected
+
+
+def test_detect_container(tmp_path):
+    def kinds(*members):
+        path = tmp_path / 'x.zip'
+        with zipfile.ZipFile(path, 'w') as zf:
+            for name, data in members:
+                zf.writestr(name, data)
+        with zipfile.ZipFile(path) as zf:
+            return detect_container(zf)
+
+    assert kinds(('content.xml', '')) == 'udf'
+    assert kinds(('mimetype', 'application/vnd.oasis.opendocument.text'), ('content.xml', '')) == 'odt'
+    assert kinds(('xl/workbook.xml', '')) == 'xlsx'
+    assert kinds(('word/document.xml', '')) == 'docx'
+    assert kinds(('a.txt', '')) == 'unknown'
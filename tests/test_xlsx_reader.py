@@ -0,0 +1,46 @@
+import zipfile
+
+from xlsx_reader import MAX_COLUMNS, SheetReader, column_index
+
+NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+
+
+def make_xlsx(path, sheet_body):
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('xl/sharedStrings.xml', f'<sst xmlns="{NS}"><si><t>Ad</t></si><si><r><t>Ye</t></r>'
+                                            f'<r><t>liz</t></r></si></sst>')
+        zf.writestr('xl/worksheets/sheet1.xml', f'<worksheet xmlns="{NS}">{sheet_body}</worksheet>')
+    return zipfile.ZipFile(path)
+
+
+def test_column_index():
+    assert column_index('A1') == 0
+    assert column_index('AB7') == 27
+    assert column_index('XFD1') == MAX_COLUMNS - 1
+    assert column_index('') is None
+
+
+def test_rows_resolve_shared_strings_and_implicit_columns(tmp_path):
+    zf = make_xlsx(tmp_path / 'a.xlsx', '<sheetData>'
+                   '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="C1" t="s"><v>1</v></c></row>'
+                   '<row r="3"><c><v>1.50</v></c><c t="inlineStr"><is><t>x</t></is></c></row>'
+                   '<row r="4"/></sheetData>')
+    rows = list(SheetReader(zf).iter_rows())
+    assert rows[0] == (1, ['Ad', '', 'Yeliz'])
+    assert rows[1] == (3, ['1.5', 'x'])
+    assert len(rows) == 2
+
+
+def test_cells_beyond_last_column_are_skipped(tmp_path):
+    zf = make_xlsx(tmp_path / 'a.xlsx', '<sheetData><row r="1"><c r="A1" t="inlineStr"><is><t>a</t></is></c>'
+                   '<c r="ZZZZZZ1" t="inlineStr"><is><t>b</t></is></c></row></sheetData>')
+    assert list(SheetReader(zf).iter_rows()) == [(1, ['a'])]
+
+
+def test_column_widths_clamp_min(tmp_path):
+    zf = make_xlsx(tmp_path / 'a.xlsx', '<cols><col min="0" max="2" width="20"/>'
+                   '<col min="3" max="16384" width="5"/></cols><sheetData/>')
+    reader = SheetReader(zf)
+    list(reader.iter_rows())
+    assert reader.column_widths[:3] == [20.0, 20.0, 5.0]
+    assert len(reader.column_widths) == 2 + 64
@@ -0,0 +1,39 @@
+import json
+import os
+import sys
+import zipfile
+
+from evrak_budget import BudgetExceeded
+from evrak_fields import extract_fields
+from udf_reader import extract_document_text
+
+# Satır başına bir evrak: {"id", "text", "fields"}. Arşiv üyeleri bellekte
+# okunur; diske geçici dosya yazılmaz, çıktı evrak evrak akar.
+
+
+def document_record(path):
+    """Evrakın JSONL kaydı: kimlik, düz metin ve başlık alanları"""
+    text = extract_document_text(path)
+    fields = [{'name': name, 'value': value, 'amount_kurus': amount, 'date': date}
+              for name, value, amount, date in extract_fields(text)]
+    return {'id': os.path.splitext(os.path.basename(path))[0], 'text': text, 'fields': fields}
+
+
+def export_jsonl(paths, out):
+    """Evrakları sırayla ``out`` akışına JSONL olarak yaz
+
+    Okunamayan evraklar atlanır ve standart hataya yazılır; (yazılan,
+    hatalı) döndürür.
+    """
+    written = failed = 0
+    for path in paths:
+        try:
+            record = document_record(path)
+        except (zipfile.BadZipFile, KeyError, OSError, ValueError, BudgetExceeded) as e:
+            print(f"✗ {path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write('\n')
+        written += 1
+    return written, failed
@@ -0,0 +1,183 @@
+import sys
+import zlib
+
+from udf_reader import document_paragraphs
+
+# Parça bayrakları
+BOLD = 0x01
+UNDERLINE = 0x02
+ITALIC = 0x04
+FIELD = 0x08
+
+# Paragraf bayrakları: alt 2 bit hizalama, üstünde bölüm
+ALIGN_MASK = 0x03
+HEADER = 0x04
+FOOTER = 0x08
+TABLE = 0x10
+
+_SECTION_FLAGS = {'body': 0, 'header': HEADER, 'footer': FOOTER, 'table': TABLE}
+
+# Dizin için bekletilen belgeler kısa ömürlüdür; hız/oran dengesi
+COMPRESS_LEVEL = 6
+
+
+def _put_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _run_flags(run):
+    flags = FIELD if run.kind == 'field' else 0
+    if run.bold:
+        flags |= BOLD
+    if run.underline:
+        flags |= UNDERLINE
+    if run.italic:
+        flags |= ITALIC
+    return flags
+
+
+def _segments(paragraph):
+    """Paragraf metnini boşluksuz örten (metin, bayrak) parçaları
+
+    Parçalar arasındaki (biçimsiz) boşluklar bayraksız parça olur; aynı
+    bayraklı komşu parçalar birleştirilir.
+    """
+    source = paragraph.source
+    segments = []
+
+    def add(start, end, flags):
+        if end <= start:
+            return
+        if segments and segments[-1][1] == flags:
+            segments[-1][0] += source[start:end]
+        else:
+            segments.append([source[start:end], flags])
+
+    pos = paragraph.start
+    for run in paragraph.runs:
+        add(pos, run.start, 0)
+        start = max(pos, run.start)
+        end = min(run.end, paragraph.end)
+        add(start, end, _run_flags(run))
+        pos = max(pos, end)
+    add(pos, paragraph.end, 0)
+    return segments
+
+
+class UDFDocument:
+    """Ayrıştırılmış UDF belgesinin sıkıştırılmış bellek içi modeli
+
+    Belge tek bir zlib bloğunda tutulur: önce paragraf tablosu (UTF-8
+    bayt uzunlukları varint, hizalama/bölüm ve kalın/altı çizili/italik/
+    alan bilgisi bayrak baytı olarak), ardından tüm metin. Paragraf veya
+    parça başına Python nesnesi yoktur; metin yalnızca istendiğinde
+    çözülür. Toplu dönüşümde dizinlenmeyi bekleyen on binlerce evrak
+    için satır listesinin yaklaşık dörtte biri kadar yer tutar.
+    """
+
+    __slots__ = ('name', 'blob', 'paragraph_count')
+
+    def __init__(self, name='', blob=None, paragraph_count=0):
+        self.name = name
+        self.blob = blob
+        self.paragraph_count = paragraph_count
+
+    @classmethod
+    def from_file(cls, path):
+        """Evrak dosyasını okuyup belge oluştur (bkz. ``document_paragraphs``)"""
+        name = getattr(path, 'stem', str(path))
+        return cls.from_paragraphs(document_paragraphs(path), name)
+
+    @classmethod
+    def from_paragraphs(cls, paragraphs, name=''):
+        """``udf_reader`` paragraflarından belge oluştur"""
+        table = bytearray()
+        texts = []
+        count = 0
+        for paragraph in paragraphs:
+            segments = _segments(paragraph)
+            encoded = [text.encode('utf-8') for text, _ in segments]
+            table.append((paragraph.alignment & ALIGN_MASK) | _SECTION_FLAGS.get(paragraph.section, 0))
+            _put_varint(table, len(segments))
+            for data, (_, flags) in zip(encoded, segments):
+                _put_varint(table, len(data))
+                table.append(flags)
+            texts.extend(encoded)
+            count += 1
+        if not count:
+            return cls(name)
+        blob = zlib.compress(bytes(table) + b''.join(texts), COMPRESS_LEVEL)
+        return cls(name, blob, count)
+
+    def __len__(self):
+        return self.paragraph_count
+
+    def paragraphs(self):
+        """Paragrafları (hizalama, bölüm, [(metin, bayrak), ...]) olarak üret"""
+        if not self.blob:
+            return
+        data = zlib.decompress(self.blob)
+        entries = []
+        pos = 0
+        for _ in range(self.paragraph_count):
+            para_flags = data[pos]
+            count, pos = _get_varint(data, pos + 1)
+            runs = []
+            for _ in range(count):
+                length, pos = _get_varint(data, pos)
+                runs.append((length, data[pos]))
+                pos += 1
+            entries.append((para_flags, runs))
+
+        offset = pos
+        for para_flags, runs in entries:
+            decoded = []
+            for length, flags in runs:
+                decoded.append((data[offset:offset + length].decode('utf-8'), flags))
+                offset += length
+            yield para_flags & ALIGN_MASK, _section(para_flags), decoded
+
+    def lines(self):
+        """``udf_reader.iter_lines`` ile aynı boş olmayan, kırpılmış satırlar"""
+        for _, _, runs in self.paragraphs():
+            for line in ''.join(text for text, _ in runs).split('\n'):
+                line = line.strip()
+                if line:
+                    yield line
+
+    def text(self):
+        """``udf_reader.extract_document_text`` ile aynı düz metin"""
+        return '\n'.join(self.lines())
+
+    def nbytes(self):
+        """Belgenin yaklaşık bellek kullanımı (bayt)"""
+        total = sys.getsizeof(self) + sys.getsizeof(self.name)
+        if self.blob:
+            total += sys.getsizeof(self.blob)
+        return total
+
+
+def _section(para_flags):
+    for name, bit in _SECTION_FLAGS.items():
+        if bit and para_flags & bit:
+            return name
+    return 'body'
+
+
+def lines_nbytes(lines):
+    """Satır listesi gösteriminin yaklaşık bellek kullanımı (karşılaştırma için)"""
+    return sys.getsizeof(lines) + sum(sys.getsizeof(line) for line in lines)
@@ -0,0 +1,443 @@
+import re
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+
+from evrak_budget import open_archive
+from evrak_dispatch import sniff_type
+
+# <elements> altında metin parçası taşıyan etiketler
+RUN_TAGS = ('content', 'field', 'space', 'tab')
+
+# <elements> altındaki bölüm etiketleri
+SECTION_TAGS = ('header', 'footer', 'table')
+
+# stream_lines'ın content.xml'i okuduğu parça boyutu
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_MARKUP = re.compile(r'<[^>]*>')
+
+
+class TextRun:
+    """Paragraf içindeki biçimli metin parçası (CDATA'ya göre ofset)"""
+
+    __slots__ = ('kind', 'start', 'length', 'bold', 'underline', 'italic', 'name')
+
+    def __init__(self, kind, start, length, bold=False, underline=False, italic=False, name=None):
+        self.kind = kind
+        self.start = start
+        self.length = length
+        self.bold = bold
+        self.underline = underline
+        self.italic = italic
+        # Şablon alanının adı (yalnızca 'field' parçalarında)
+        self.name = name
+
+    @property
+    def end(self):
+        return self.start + self.length
+
+
+class UDFParagraph:
+    """CDATA metni içinde bir ofset aralığı olarak paragraf
+
+    Metin kopyalanmaz; ``text`` yalnızca istendiğinde paylaşılan CDATA
+    metninden dilimlenir. Tablo hücresindeki paragrafların ``row`` değeri
+    belgedeki tablo satırının sırasıdır.
+    """
+
+    __slots__ = ('source', 'start', 'end', 'alignment', 'section', 'runs', 'row')
+
+    def __init__(self, source, start, end, alignment=0, section='body', runs=(), row=None):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.alignment = alignment
+        self.section = section
+        self.runs = runs
+        self.row = row
+
+    @property
+    def text(self):
+        return self.source[self.start:self.end]
+
+    def run_text(self, run):
+        """Parçanın metnini döndür"""
+        return self.source[run.start:run.end]
+
+
+def _is_true(value):
+    return value == 'true'
+
+
+def _utf16_index(text):
+    """UTF-16 ofsetlerini Python karakter indislerine çeviren tablo
+
+    UYAP editörü ofsetleri UTF-16 kod birimi olarak yazar. Metin yalnızca
+    BMP karakterleri içeriyorsa (neredeyse her zaman) tabloya gerek yoktur.
+    """
+    if not text or max(text) <= '\uffff':
+        return None
+    index = []
+    for i, ch in enumerate(text):
+        index.append(i)
+        if ord(ch) > 0xFFFF:
+            index.append(i)
+    index.append(len(text))
+    return index
+
+
+def _line_paragraphs(text):
+    """<elements> bölümü olmayan belgeler için satır aralıkları üret"""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start)
+        end = length if end < 0 else end + 1
+        yield UDFParagraph(text, start, end, runs=(TextRun('content', start, end - start),))
+        start = end
+
+
+def detect_container(zip_ref):
+    """Arşiv üye listesinden içerik türünü belirle
+
+    ``udf`` (UYAP metin belgesi), ``odt``, ``xlsx``, ``docx`` veya
+    ``unknown`` döndürür. Bazı .udf dosyaları aslında Excel çalışma
+    kitabıdır.
+    """
+    names = set(zip_ref.namelist())
+    if 'xl/workbook.xml' in names:
+        return 'xlsx'
+    if 'word/document.xml' in names:
+        return 'docx'
+    if 'content.xml' in names:
+        if 'mimetype' in names and b'opendocument' in zip_ref.read('mimetype'):
+            return 'odt'
+        return 'udf'
+    return 'unknown'
+
+
+def iter_paragraphs(udf_file):
+    """UDF dosyasını tek geçişte akış halinde oku, paragrafları sırayla üret
+
+    ``content.xml`` ``iterparse`` ile okunur; işlenen öğeler hemen
+    temizlendiği için bellek kullanımı belge boyutundan bağımsız kalır.
+    """
+    with open_archive(udf_file) as zip_ref:
+        with zip_ref.open('content.xml') as xml_file:
+            yield from iter_paragraphs_from_xml(xml_file)
+
+
+def iter_paragraphs_from_xml(xml_file, data=None):
+    """Açık bir ``content.xml`` akışından paragrafları üret
+
+    ``data`` sözlüğü verilirse şablonun ``<data>`` bloğu (doldurulmuş alan
+    değerleri, bkz. ``read_template_data``) akış bitince içine yazılır.
+    """
+    text = None
+    index = None
+    pending = []
+    elements = None
+    saw_elements = False
+    sections = []
+    runs = []
+    depth = 0
+    rows = 0
+    row = None
+
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        tag = elem.tag
+
+        if event == 'start':
+            depth += 1
+            if tag == 'elements' and depth == 2:
+                elements = elem
+                saw_elements = True
+            elif tag in SECTION_TAGS and elements is not None:
+                sections.append(tag)
+            elif tag == 'row' and elements is not None:
+                rows += 1
+                row = rows
+            continue
+
+        depth -= 1
+
+        if depth == 1 and tag == 'content':
+            # Belge metni: CDATA bloğu
+            text = elem.text or ''
+            index = _utf16_index(text)
+            elem.clear()
+            # Metinden önce gelen paragraflar (standart dışı sıra)
+            for paragraph in pending:
+                paragraph.source = text
+                yield paragraph
+            pending = []
+
+        elif tag in RUN_TAGS and elements is not None:
+            attrib = elem.attrib
+            try:
+                start = int(attrib['startOffset'])
+                length = int(attrib['length'])
+            except (KeyError, ValueError):
+                continue
+            if index is not None:
+                end = index[min(start + length, len(index) - 1)]
+                start = index[min(start, len(index) - 1)]
+                length = end - start
+            runs.append(TextRun(
+                tag, start, length,
+                bold=_is_true(attrib.get('bold')),
+                underline=_is_true(attrib.get('underline')),
+                italic=_is_true(attrib.get('italic')),
+                name=attrib.get('fieldName') if tag == 'field' else None,
+            ))
+
+        elif tag == 'paragraph' and elements is not None:
+            if runs:
+                try:
+                    alignment = int(elem.get('Alignment', 0))
+                except ValueError:
+                    alignment = 0
+                paragraph = UDFParagraph(
+                    text,
+                    runs[0].start,
+                    max(run.end for run in runs),
+                    alignment=alignment,
+                    section=sections[-1] if sections else 'body',
+                    runs=tuple(runs),
+                    row=row,
+                )
+                if text is None:
+                    pending.append(paragraph)
+                else:
+                    yield paragraph
+            runs = []
+            elem.clear()
+
+        elif tag in SECTION_TAGS and sections and sections[-1] == tag:
+            sections.pop()
+
+        elif tag == 'row' and elements is not None:
+            row = None
+
+        elif tag == 'elements' and depth == 1:
+            elements = None
+
+        elif tag == 'data' and depth == 1 and data is not None:
+            data.update(read_template_data(elem))
+
+        if depth == 1:
+            # Kök altındaki tamamlanmış öğeleri bırak
+            elem.clear()
+        elif elements is not None and depth == 2:
+            # <elements> altındaki üst düzey öğe bitti; ağacı boşalt
+            elements.clear()
+
+    if not saw_elements and text:
+        yield from _line_paragraphs(text)
+
+
+def _data_value(elem):
+    """Şablon değerini tek satırlık düz metne çevir
+
+    Bazı değerler (ör. ``imza``) kaçışlı HTML parçası taşır; etiketler
+    atılır, boşluklar teke indirilir.
+    """
+    return ' '.join(_MARKUP.sub(' ', ''.join(elem.itertext())).split())
+
+
+def read_template_data(elem):
+    """``<data>`` öğesinden alan değerleri
+
+    Anahtarlar küçük harfe katlanmış alan adlarıdır (editör 'Tarih'
+    alanını 'tarih' olarak kaydeder). Tekrarlanan tablo satırları
+    (``<TabloXb><rowXb>...``) tablo adı altında satır sözlüklerinin
+    listesi olarak tutulur.
+    """
+    data = {}
+    for child in elem:
+        rows = [row for row in child if len(row)]
+        if rows:
+            data[child.tag.casefold()] = [
+                {cell.tag.casefold(): _data_value(cell) for cell in row} for row in rows
+            ]
+        else:
+            data[child.tag.casefold()] = _data_value(child)
+    return data
+
+
+def _row_groups(paragraphs):
+    """Paragrafları tablo satırlarına göre ardışık gruplara ayır"""
+    group = []
+    for paragraph in paragraphs:
+        if group and (paragraph.row is None or paragraph.row != group[0].row):
+            yield group
+            group = []
+        group.append(paragraph)
+    if group:
+        yield group
+
+
+def _row_values(group, data):
+    """Tablo satırı şablondaki tekrarlanan bir tabloya bağlıysa değer kümeleri"""
+    if group[0].row is None:
+        return [data]
+    names = {run.name.casefold() for paragraph in group for run in paragraph.runs if run.name}
+    for value in data.values():
+        if isinstance(value, list) and names & set().union(*value):
+            return [{**data, **row} for row in value]
+    return [data]
+
+
+def fill_template(paragraphs, data):
+    """Şablon alanlarını ``<data>`` değerleriyle doldurulmuş paragraflar
+
+    UYAP şablonlarında CDATA metni alan adlarını ('davaciAdSoyad') taşır,
+    gerçek değerler belge sonundaki ``<data>`` bloğundadır. Değeri olan
+    alan parçaları değerle değiştirilir; tekrarlanan tablo satırları
+    (taraflar, masraflar) her veri satırı için bir kez yazılır. Sonuç tek
+    bir yeni metne işaret eden paragraflardır; değeri olmayan alanlar
+    olduğu gibi kalır.
+    """
+    if not data:
+        return paragraphs
+    pieces = []
+    length = 0
+    filled = []
+    for group in _row_groups(paragraphs):
+        for values in _row_values(group, data):
+            for paragraph in group:
+                source = paragraph.source
+                start = length
+                runs = []
+                pos = paragraph.start
+                for run in paragraph.runs:
+                    if run.start > pos:
+                        pieces.append(source[pos:run.start])
+                        length += run.start - pos
+                    value = values.get(run.name.casefold()) if run.name else None
+                    if not isinstance(value, str):
+                        value = source[run.start:run.end]
+                    pieces.append(value)
+                    runs.append(TextRun(run.kind, length, len(value), run.bold, run.underline, run.italic,
+                                        run.name))
+                    length += len(value)
+                    pos = max(pos, run.end)
+                if paragraph.end > pos:
+                    pieces.append(source[pos:paragraph.end])
+                    length += paragraph.end - pos
+                filled.append(UDFParagraph(None, start, length, paragraph.alignment, paragraph.section,
+                                           tuple(runs), paragraph.row))
+    text = ''.join(pieces)
+    for paragraph in filled:
+        paragraph.source = text
+    return filled
+
+
+def read_paragraphs(udf_file):
+    """UDF paragraflarını şablon değerleri doldurulmuş olarak döndür
+
+    ``<data>`` bloğu belgenin sonunda geldiğinden paragraflar akış
+    bitene kadar listede tutulur (CDATA metni zaten bütün olarak
+    bellektedir).
+    """
+    data = {}
+    with open_archive(udf_file) as zip_ref:
+        with zip_ref.open('content.xml') as xml_file:
+            paragraphs = list(iter_paragraphs_from_xml(xml_file, data))
+    return fill_template(paragraphs, data)
+
+
+def paragraph_lines(paragraphs):
+    """Paragraf metinlerini boş olmayan, kırpılmış satırlar olarak üret"""
+    for paragraph in paragraphs:
+        for line in paragraph.text.split('\n'):
+            line = line.strip()
+            if line:
+                yield line
+
+
+def iter_lines(udf_file):
+    """UDF metnini boş olmayan, kırpılmış satırlar olarak üret
+
+    Şablon evraklarında alan adları yerine ``<data>`` değerleri yazılır.
+    """
+    return paragraph_lines(read_paragraphs(udf_file))
+
+
+def document_paragraphs(path):
+    """UDF (veya içinde XLSX taşıyan .udf) dosyasının paragrafları
+
+    Excel çalışma kitaplarında her satır hücreleri boşlukla birleştirilmiş
+    bir paragraftır. Arşiv olmayan içerikler (hazır PDF, tarama) için boş
+    liste döner.
+    """
+    if sniff_type(path) != 'zip':
+        return []
+    with open_archive(path) as zip_ref:
+        if detect_container(zip_ref) == 'xlsx':
+            # Excel okuyucusu yalnızca gerekince yüklenir (metin çıkarma açılışı hızlı kalır)
+            from xlsx_reader import SheetReader
+            text = '\n'.join(' '.join(cells) for _, cells in SheetReader(zip_ref).iter_rows())
+            return list(_line_paragraphs(text))
+    return read_paragraphs(path)
+
+
+def extract_document_text(path):
+    """Evrakın düz metni (bkz. ``document_paragraphs``)"""
+    return '\n'.join(paragraph_lines(document_paragraphs(path)))
+
+
+def stream_lines(udf_file, chunk_size=STREAM_CHUNK_SIZE):
+    """Belge metnini boş olmayan, kırpılmış satırlar olarak sabit bellekle üret
+
+    ``iter_lines`` paragraf ofsetleri için CDATA metninin tamamını bellekte
+    tutar. Burada metin expat'e parça parça verilir ve satırlar satır
+    sonlarından ayrılır; bellekte yalnızca o anki parça ve yarım kalan
+    satır bulunur. ``<content>`` bitince dosyanın kalanı okunmaz.
+    """
+    parser = expat.ParserCreate()
+    lines = []
+    partial = []
+    state = {'depth': 0, 'in_content': False, 'done': False}
+
+    def start(name, attrs):
+        state['depth'] += 1
+        if state['depth'] == 2 and name == 'content':
+            state['in_content'] = True
+
+    def end(name):
+        if state['in_content'] and state['depth'] == 2:
+            state['in_content'] = False
+            state['done'] = True
+            flush()
+        state['depth'] -= 1
+
+    def flush():
+        line = ''.join(partial).strip()
+        partial.clear()
+        if line:
+            lines.append(line)
+
+    def data(text):
+        if not state['in_content']:
+            return
+        head, newline, rest = text.partition('\n')
+        partial.append(head)
+        while newline:
+            flush()
+            head, newline, rest = rest.partition('\n')
+            partial.append(head)
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = data
+
+    with open_archive(udf_file) as zip_ref:
+        with zip_ref.open('content.xml') as xml_file:
+            while not state['done']:
+                chunk = xml_file.read(chunk_size)
+                parser.Parse(chunk, not chunk)
+                yield from lines
+                lines.clear()
+                if not chunk:
+                    break
@@ -0,0 +1,212 @@
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Yerleşik tarih biçimi kimlikleri (ECMA-376, 18.8.30)
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# Excel'in sütun sınırı (XFD); ötesindeki hücreler bozuk veya kötü niyetlidir
+MAX_COLUMNS = 16384
+
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+
+
+def column_index(ref):
+    """'C12' gibi bir hücre adresinden sıfır tabanlı sütun indisi"""
+    match = _CELL_REF.match(ref or '')
+    if not match:
+        return None
+    index = 0
+    for ch in match.group(1):
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+
+def load_shared_strings(zip_ref):
+    """sharedStrings.xml'i akış halinde okuyup indisle erişilen listeye çevir"""
+    strings = []
+    if 'xl/sharedStrings.xml' not in zip_ref.namelist():
+        return strings
+    with zip_ref.open('xl/sharedStrings.xml') as f:
+        for event, elem in ET.iterparse(f):
+            if elem.tag == NS_MAIN + 'si':
+                # Zengin metin parçaları (<r><t>) dahil tüm <t> öğeleri
+                strings.append(''.join(t.text or '' for t in elem.iter(NS_MAIN + 't')))
+                elem.clear()
+    return strings
+
+
+def load_date_styles(zip_ref):
+    """Tarih biçimli hücre stillerinin (cellXfs indisleri) kümesi"""
+    if 'xl/styles.xml' not in zip_ref.namelist():
+        return set()
+    root = ET.fromstring(zip_ref.read('xl/styles.xml'))
+
+    date_formats = set(BUILTIN_DATE_FORMATS)
+    num_fmts = root.find(NS_MAIN + 'numFmts')
+    if num_fmts is not None:
+        for fmt in num_fmts:
+            code = re.sub(r'"[^"]*"|\[[^\]]*\]', '', fmt.get('formatCode', '')).lower()
+            if any(ch in code for ch in 'dy') or ('m' in code and 'h' not in code):
+                date_formats.add(int(fmt.get('numFmtId')))
+
+    styles = set()
+    cell_xfs = root.find(NS_MAIN + 'cellXfs')
+    if cell_xfs is not None:
+        for index, xf in enumerate(cell_xfs):
+            if int(xf.get('numFmtId', 0)) in date_formats:
+                styles.add(index)
+    return styles
+
+
+def first_sheet_path(zip_ref):
+    """Çalışma kitabındaki ilk sayfanın arşiv içi yolu"""
+    names = zip_ref.namelist()
+    try:
+        workbook = ET.fromstring(zip_ref.read('xl/workbook.xml'))
+        rels = ET.fromstring(zip_ref.read('xl/_rels/workbook.xml.rels'))
+        sheet = workbook.find(f'{NS_MAIN}sheets/{NS_MAIN}sheet')
+        rel_id = sheet.get(NS_REL + 'id')
+        for rel in rels.iter(NS_PKG_REL + 'Relationship'):
+            if rel.get('Id') == rel_id:
+                target = rel.get('Target')
+                path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+                if path in names:
+                    return path
+    except (KeyError, AttributeError, ET.ParseError):
+        pass
+    return 'xl/worksheets/sheet1.xml'
+
+
+def sheet_title(zip_ref):
+    """İlk sayfanın adı"""
+    try:
+        workbook = ET.fromstring(zip_ref.read('xl/workbook.xml'))
+        return workbook.find(f'{NS_MAIN}sheets/{NS_MAIN}sheet').get('name', '').strip()
+    except (KeyError, AttributeError, ET.ParseError):
+        return ''
+
+
+def _format_number(value):
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    if number.is_integer():
+        return str(int(number))
+    return f"{number:.10g}"
+
+
+def _cell_value(cell, shared_strings, date_styles):
+    """Hücre değerini metne çevir"""
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(NS_MAIN + 't'))
+
+    v = cell.find(NS_MAIN + 'v')
+    if v is None or v.text is None:
+        return ''
+    value = v.text
+
+    if cell_type == 's':
+        try:
+            return shared_strings[int(value)]
+        except (IndexError, ValueError):
+            return ''
+    if cell_type == 'b':
+        return 'DOĞRU' if value == '1' else 'YANLIŞ'
+    if cell_type == 'n' and int(cell.get('s', 0)) in date_styles:
+        try:
+            return (EXCEL_EPOCH + timedelta(days=float(value))).strftime('%d.%m.%Y')
+        except (ValueError, OverflowError):
+            return value
+    if cell_type == 'n':
+        return _format_number(value)
+    return value
+
+
+class SheetReader:
+    """XLSX sayfasını sabit bellekle satır satır okuyan okuyucu
+
+    Sayfa XML'i ``iterparse`` ile akış halinde işlenir; tamamlanan her
+    satır öğesi hemen bırakılır. Paylaşılan metinler bir kez listeye
+    yüklenir ve hücrelerdeki indislerle çözülür.
+    """
+
+    def __init__(self, zip_ref):
+        self.zip_ref = zip_ref
+        self.sheet_path = first_sheet_path(zip_ref)
+        self.title = sheet_title(zip_ref)
+        self.shared_strings = load_shared_strings(zip_ref)
+        self.date_styles = load_date_styles(zip_ref)
+        self.column_widths = []
+
+    def iter_rows(self):
+        """Boş olmayan satırları (satır no, hücre listesi) olarak üret"""
+        with self.zip_ref.open(self.sheet_path) as f:
+            context = ET.iterparse(f, events=('start', 'end'))
+            _, root = next(context)
+            sheet_data = None
+            depth = 1
+            row_number = 0
+
+            for event, elem in context:
+                tag = elem.tag
+                if event == 'start':
+                    depth += 1
+                    if tag == NS_MAIN + 'sheetData':
+                        sheet_data = elem
+                    continue
+                depth -= 1
+
+                if tag == NS_MAIN + 'col':
+                    self._add_column_width(elem)
+
+                elif tag == NS_MAIN + 'row':
+                    values = {}
+                    # r özniteliği isteğe bağlıdır; yoksa hücre bir öncekinin yanındadır
+                    column = -1
+                    for cell in elem.iter(NS_MAIN + 'c'):
+                        index = column_index(cell.get('r'))
+                        column = column + 1 if index is None else index
+                        # 'ZZZZZZ1' gibi adresler dev bir satır listesi açmasın
+                        if column >= MAX_COLUMNS:
+                            continue
+                        value = ' '.join(_cell_value(cell, self.shared_strings, self.date_styles).split())
+                        if value:
+                            values[column] = value
+                    row_number = int(elem.get('r', row_number + 1))
+                    # Boş satırlar dahil milyonlarca öğe birikmesin
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    if values:
+                        width = max(values) + 1
+                        yield row_number, [values.get(i, '') for i in range(width)]
+
+                if depth == 1:
+                    # Kök altındaki tamamlanmış öğeleri bırak
+                    sheet_data = None
+                    root.clear()
+
+    def _add_column_width(self, col):
+        """<cols> tanımından sütun genişliklerini kaydet"""
+        try:
+            first = max(int(col.get('min')) - 1, 0)
+            last = min(int(col.get('max')), MAX_COLUMNS)
+            width = float(col.get('width', 8.43))
+        except (TypeError, ValueError):
+            return
+        # Tüm sütunlara uygulanan tanımlar (max=16384) yok sayılır
+        last = min(last, first + 64)
+        while len(self.column_widths) < last:
+            self.column_widths.append(None)
+        for i in range(first, last):
+            self.column_widths[i] = width
+